@@ -0,0 +1,134 @@
+"""Benchmark export: rows/s dan peak memory, path lama vs gcs_export.
+
+Setiap kasus dijalankan di subprocess terpisah supaya peak RSS bersih:
+
+    python benchmarks/bench_export.py --rows 10000 100000 1000000 --output export.json
+
+Kasus 'legacy' meniru export lama: list of dict + datetime ->
+pd.DataFrame -> to_excel. Kasus yang dependency-nya tidak ada di-skip.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'Display'))
+
+CASES = ('legacy', 'csv', 'xlsx', 'parquet')
+
+
+def max_rss_mb():
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def synthetic_frame(i):
+    return {
+        'altitude': 100 + (i % 500) * 0.1,
+        'latitude': -63123456 + i,
+        'longitude': 106123456 - i,
+        'voltage': 12.6 - (i % 100) * 0.01,
+        'remaining': 100 - i % 100,
+        'status': 'OK' if i % 50 else 'Warning',
+        'rssi': -80 - (i % 40) * 0.5,
+        'snr': 9 - (i % 20) * 0.25,
+        'cycle_time': 520,
+    }
+
+
+def run_case(case, rows, path):
+    from datetime import datetime
+
+    t0 = 1.7e9
+    if case == 'legacy':
+        import pandas as pd
+
+        data_log = []
+        for i in range(rows):
+            entry = synthetic_frame(i)
+            entry['timestamp'] = datetime.fromtimestamp(t0 + i * 0.5)
+            data_log.append(entry)
+        base = max_rss_mb()
+        start = time.perf_counter()
+        pd.DataFrame(data_log).to_excel(path, index=False)
+    else:
+        from gcs_export import ExportJob
+        from gcs_store import TelemetryStore
+
+        # Import dependency di luar pengukuran, seperti pada kasus legacy
+        if case == 'xlsx':
+            import openpyxl  # noqa: F401
+        elif case == 'parquet':
+            import pyarrow.parquet  # noqa: F401
+
+        store = TelemetryStore(max_rows=None)
+        for i in range(rows):
+            store.append(synthetic_frame(i), t0 + i * 0.5)
+        base = max_rss_mb()
+        start = time.perf_counter()
+        ExportJob(store, path, case).run()
+    elapsed = time.perf_counter() - start
+    return {
+        'case': case,
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_s': rows / elapsed,
+        'peak_extra_mb': max_rss_mb() - base,
+        'file_mb': os.path.getsize(path) / 1e6,
+    }
+
+
+def run_subprocess(case, rows, timeout):
+    suffix = '.xlsx' if case == 'legacy' else '.' + case
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    try:
+        proc = subprocess.run(
+            [sys.executable, __file__, '--child', case, str(rows), path],
+            capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'case': case, 'rows': rows, 'skipped': f'timeout {timeout}s'}
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+    if proc.returncode != 0:
+        reason = (proc.stderr.strip().splitlines() or ['failed'])[-1]
+        return {'case': case, 'rows': rows, 'skipped': reason}
+    return json.loads(proc.stdout)
+
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == '--child':
+        _, _, case, rows, path = sys.argv
+        print(json.dumps(run_case(case, int(rows), path)))
+        return
+
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    ap.add_argument('--cases', nargs='+', choices=CASES, default=list(CASES))
+    ap.add_argument('--timeout', type=float, default=1800)
+    ap.add_argument('--output', help='simpan hasil sebagai JSON')
+    args = ap.parse_args()
+
+    results = []
+    for rows in args.rows:
+        for case in args.cases:
+            result = run_subprocess(case, rows, args.timeout)
+            results.append(result)
+            if 'skipped' in result:
+                print(f"{case:<8} {rows:>9,} rows  skipped: {result['skipped']}")
+            else:
+                print(f"{case:<8} {rows:>9,} rows  {result['rows_per_s']:>12,.0f} rows/s  "
+                      f"peak +{result['peak_extra_mb']:.1f} MB  file {result['file_mb']:.1f} MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
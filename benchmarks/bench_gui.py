@@ -0,0 +1,181 @@
+"""Benchmark jalur update GUI per UI tick: chart, Data Log dan raw console.
+
+Meniru handle_frames() di gcs_main: setiap tick menerima --batch frame,
+lalu update_charts (ChartPanel di backend Agg), update_log_view
+(VirtualLogView di atas TelemetryStore berisi --rows baris) dan
+add_raw_data (RawConsole). Bagian Tk butuh display (X server / Xvfb);
+tanpa display kasus Tk di-skip.
+
+    python benchmarks/bench_gui.py --ticks 500 --rows 100000 --output gui.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'Display'))
+
+from bench_export import synthetic_frame  # noqa: E402
+from bench_parser import FRAME_TEMPLATE  # noqa: E402
+
+CASES = ('update_charts', 'update_log_view', 'add_raw_data')
+
+
+def format_log_row(data):
+    # Sama dengan UAVGCSApp.format_log_row (gcs_main butuh customtkinter)
+    return (
+        datetime.fromtimestamp(data['timestamp']).strftime("%H:%M:%S"),
+        f"{data['altitude']:.2f}",
+        data['latitude'],
+        data['longitude'],
+        f"{data['voltage']:.2f}",
+        data['status'],
+        f"{data['rssi']:.2f}",
+        f"{data['snr']:.2f}"
+    )
+
+
+def summarize(name, tick_times, frames_per_tick, **extra):
+    tick_times = sorted(tick_times)
+    total = sum(tick_times)
+    result = {
+        'name': name,
+        'ticks': len(tick_times),
+        'mean_ms': total / len(tick_times) * 1e3,
+        'p95_ms': tick_times[int(len(tick_times) * 0.95) - 1] * 1e3,
+        'max_ms': tick_times[-1] * 1e3,
+        'frames_per_s': frames_per_tick * len(tick_times) / total,
+    }
+    result.update(extra)
+    return result
+
+
+def bench_charts(ticks, batch, window):
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from gcs_charts import ChartPanel
+
+    fig = Figure(figsize=(10, 8), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    axes = [fig.add_subplot(311), fig.add_subplot(312), fig.add_subplot(313)]
+    alt_line, = axes[0].plot([], [], 'b-')
+    batt_line, = axes[1].plot([], [], 'g-')
+    rssi_line, = axes[2].plot([], [], 'r-')
+    snr_line, = axes[2].plot([], [], 'y-')
+    charts = ChartPanel(canvas, window_points=window)
+    charts.add_axes(axes[0], {'altitude': alt_line})
+    charts.add_axes(axes[1], {'voltage': batt_line})
+    charts.add_axes(axes[2], {'rssi': rssi_line, 'snr': snr_line})
+    canvas.draw()
+
+    t0 = 1.7e9
+    times = []
+    n = 0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        for _ in range(batch):
+            charts.append(synthetic_frame(n), t0 + n * 0.5)
+            n += 1
+        charts.refresh()
+        times.append(time.perf_counter() - start)
+    return summarize('update_charts', times, batch, window_points=window,
+                     full_draws=charts.full_draws, blits=charts.blits)
+
+
+def bench_log_view(root, ticks, batch, rows):
+    from gcs_logview import VirtualLogView
+    from gcs_store import TelemetryStore
+
+    columns = ("Time", "Altitude", "Latitude", "Longitude", "Battery", "Status", "RSSI", "SNR")
+    store = TelemetryStore(max_rows=None)
+    t0 = 1.7e9
+    for i in range(rows):
+        store.append(synthetic_frame(i), t0 + i * 0.5)
+    view = VirtualLogView(root, store, columns, format_log_row)
+    view.pack()
+    root.update()
+
+    times = []
+    n = rows
+    for _ in range(ticks):
+        start = time.perf_counter()
+        for _ in range(batch):
+            store.append(synthetic_frame(n), t0 + n * 0.5)
+            n += 1
+        view.refresh()
+        root.update()
+        times.append(time.perf_counter() - start)
+    return summarize('update_log_view', times, batch, store_rows=rows)
+
+
+def bench_raw_console(root, ticks, batch, max_lines):
+    from gcs_console import RawConsole
+
+    console = RawConsole(root, max_lines=max_lines)
+    console.pack()
+    root.update()
+    lines = FRAME_TEMPLATE.format(alt=100, lat=-63123456, lon=106123456, volt=12.6,
+                                  pct=100, rssi=-80, snr=9).splitlines()
+    t0 = time.time()
+    times = []
+    for _ in range(ticks):
+        items = [(t0, line) for _ in range(batch) for line in lines]
+        start = time.perf_counter()
+        console.append(items)
+        root.update()
+        times.append(time.perf_counter() - start)
+    return summarize('add_raw_data', times, batch, max_lines=max_lines,
+                     lines_per_tick=batch * len(lines))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument('--ticks', type=int, default=500)
+    ap.add_argument('--batch', type=int, default=10, help='frame per UI tick')
+    ap.add_argument('--rows', type=int, default=100000, help='isi store untuk Data Log')
+    ap.add_argument('--window', type=int, default=500, help='window chart (points)')
+    ap.add_argument('--console-lines', type=int, default=1000)
+    ap.add_argument('--cases', nargs='+', choices=CASES, default=list(CASES))
+    ap.add_argument('--output', help='simpan hasil sebagai JSON')
+    args = ap.parse_args(argv)
+
+    results = []
+    if 'update_charts' in args.cases:
+        results.append(bench_charts(args.ticks, args.batch, args.window))
+
+    tk_cases = [case for case in args.cases if case != 'update_charts']
+    if tk_cases:
+        import tkinter as tk
+
+        try:
+            root = tk.Tk()
+        except tk.TclError as e:
+            root = None
+            results += [{'name': case, 'skipped': f'no display: {e}'} for case in tk_cases]
+        if root is not None:
+            root.geometry("1000x600")
+            if 'update_log_view' in tk_cases:
+                results.append(bench_log_view(root, args.ticks, args.batch, args.rows))
+            if 'add_raw_data' in tk_cases:
+                results.append(bench_raw_console(root, args.ticks, args.batch, args.console_lines))
+            root.destroy()
+
+    for result in results:
+        if 'skipped' in result:
+            print(f"{result['name']:<16} skipped: {result['skipped']}")
+        else:
+            print(f"{result['name']:<16} mean {result['mean_ms']:7.3f} ms/tick  "
+                  f"p95 {result['p95_ms']:7.3f} ms  {result['frames_per_s']:>10,.0f} frames/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'batch': args.batch, 'results': results}, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
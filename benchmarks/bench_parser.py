@@ -0,0 +1,246 @@
+"""Micro-benchmark DataParser: lines/second legacy vs table-driven engine.
+
+Jalankan: python benchmarks/bench_parser.py [--frames N | --mb MB] [--chunk BYTES]
+          [--repeat N] [--output parser.json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'Display'))
+
+from gcs_binary import BinaryDecoder, encode_frame  # noqa: E402
+from gcs_parser import DataParser, FrameParser  # noqa: E402
+
+FRAME_TEMPLATE = (
+    "========== UAV DATA ==========\n"
+    "Altitude: {alt:.2f} m\n"
+    "Latitude: {lat}\n"
+    "Longitude: {lon}\n"
+    "Battery: {volt:.2f}V ({pct}%)\n"
+    "Status: OK\n"
+    "Cycle Time: 520 ms\n"
+    "Avg RSSI: {rssi:.2f} dBm\n"
+    "Avg SNR: {snr:.2f} dB\n"
+    "==============================\n"
+)
+
+
+def make_capture(frames):
+    """Buat capture receiver sintetis sebanyak `frames` siklus"""
+    parts = []
+    for i in range(frames):
+        parts.append(FRAME_TEMPLATE.format(
+            alt=100 + (i % 500) * 0.1,
+            lat=-63123456 + i,
+            lon=106123456 - i,
+            volt=12.6 - (i % 100) * 0.01,
+            pct=100 - i % 100,
+            rssi=-80 - (i % 40) * 0.5,
+            snr=9 - (i % 20) * 0.25,
+        ))
+    return ''.join(parts)
+
+
+class LegacyDataParser:
+    """Salinan parser lama (split + regex per baris) sebagai baseline"""
+
+    def __init__(self):
+        self.buffer = ""
+        self.current_data = {}
+        
+    def parse_serial_data(self, data):
+        """Parse data dari Arduino receiver"""
+        self.buffer += data
+        lines = self.buffer.split('\n')
+        self.buffer = lines[-1]  # Simpan incomplete line
+        
+        parsed_data = {}
+        
+        for line in lines[:-1]:
+            line = line.strip()
+            if not line:
+                continue
+                
+            # Parse berdasarkan pattern yang dikirim Arduino
+            if line.startswith("=========="):
+                if self.current_data:
+                    parsed_data = self.current_data.copy()
+                    self.current_data = {}
+                continue
+                
+            elif "Altitude:" in line:
+                try:
+                    match = re.search(r"Altitude:\s*([\d.-]+)", line)
+                    if match:
+                        self.current_data['altitude'] = float(match.group(1))
+                except ValueError:
+                    pass
+                    
+            elif "Latitude:" in line:
+                try:
+                    match = re.search(r"Latitude:\s*([\d.-]+)", line)
+                    if match:
+                        self.current_data['latitude'] = int(match.group(1))
+                except ValueError:
+                    pass
+                    
+            elif "Longitude:" in line:
+                try:
+                    match = re.search(r"Longitude:\s*([\d.-]+)", line)
+                    if match:
+                        self.current_data['longitude'] = int(match.group(1))
+                except ValueError:
+                    pass
+                    
+            elif "Battery:" in line:
+                try:
+                    match = re.search(r"Battery:\s*([\d.-]+)V\s*\((\d+)%\)", line)
+                    if match:
+                        self.current_data['voltage'] = float(match.group(1))
+                        self.current_data['remaining'] = int(match.group(2))
+                except ValueError:
+                    pass
+                    
+            elif "Status:" in line:
+                try:
+                    match = re.search(r"Status:\s*(.+)", line)
+                    if match:
+                        self.current_data['status'] = match.group(1).strip()
+                except:
+                    pass
+                    
+            elif "Avg RSSI:" in line:
+                try:
+                    match = re.search(r"Avg RSSI:\s*([\d.-]+)", line)
+                    if match:
+                        self.current_data['rssi'] = float(match.group(1))
+                except ValueError:
+                    pass
+                    
+            elif "Avg SNR:" in line:
+                try:
+                    match = re.search(r"Avg SNR:\s*([\d.-]+)", line)
+                    if match:
+                        self.current_data['snr'] = float(match.group(1))
+                except ValueError:
+                    pass
+                    
+            elif "Cycle Time:" in line:
+                try:
+                    match = re.search(r"Cycle Time:\s*(\d+)", line)
+                    if match:
+                        self.current_data['cycle_time'] = int(match.group(1))
+                except ValueError:
+                    pass
+        
+        return parsed_data if parsed_data else None
+
+
+def make_raw_packets(frames):
+    """Packet mode raw (AL/LT/LN/BV/ST) untuk parse_raw_packet"""
+    packets = []
+    for i in range(frames):
+        packets += [
+            f"AL{100 + (i % 500) * 0.1:.2f}",
+            f"LT{-63123456 + i}",
+            f"LN{106123456 - i}",
+            f"BV{12.6 - (i % 100) * 0.01:.2f},{100 - i % 100}",
+            "STOK",
+        ]
+    return packets
+
+
+def run(label, func, lines, repeat=1):
+    """Ambil waktu terbaik dari `repeat` kali; return dict hasil"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frames = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<28} {lines / best:>14,.0f} lines/s  "
+          f"({frames} frames, {best * 1000:.1f} ms)")
+    return {
+        'name': label,
+        'seconds': best,
+        'lines': lines,
+        'lines_per_s': lines / best,
+        'frames': frames,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument('--frames', type=int, default=20000)
+    ap.add_argument('--mb', type=float, help='ukuran capture dalam MB (menggantikan --frames)')
+    ap.add_argument('--chunk', type=int, default=4096,
+                    help='ukuran chunk bytes untuk FrameParser.feed')
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--output', help='simpan hasil sebagai JSON')
+    args = ap.parse_args(argv)
+
+    frame_bytes = len(make_capture(1))
+    frames = int(args.mb * 1e6 / frame_bytes) if args.mb else args.frames
+    text = make_capture(frames)
+    lines = text.splitlines(keepends=True)
+    data = text.encode()
+    packets = make_raw_packets(frames)
+    binary = b''.join(encode_frame(i, frame) for i, frame in enumerate(FrameParser().feed(data)))
+
+    def legacy_per_line():
+        p = LegacyDataParser()
+        return sum(1 for line in lines if p.parse_serial_data(line))
+
+    def wrapper_per_line():
+        p = DataParser()
+        return sum(1 for line in lines if p.parse_serial_data(line))
+
+    def engine_chunked():
+        p = FrameParser()
+        step = args.chunk
+        return sum(len(p.feed(data[i:i + step])) for i in range(0, len(data), step))
+
+    def wrapper_chunked():
+        p = DataParser()
+        step = args.chunk
+        return sum(len(p.parse_chunk(data[i:i + step])) for i in range(0, len(data), step))
+
+    def binary_chunked():
+        p = BinaryDecoder()
+        step = args.chunk
+        return sum(len(p.feed(binary[i:i + step])) for i in range(0, len(binary), step))
+
+    def raw_packets():
+        p = DataParser()
+        # parse_raw_packet bisa mencetak debug; jangan ukur terminal
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            return sum(1 for packet in packets if p.parse_raw_packet(packet))
+
+    print(f"{len(lines):,} lines, {len(data) / 1e6:.1f} MB")
+    results = [
+        run("legacy (per line)", legacy_per_line, len(lines), args.repeat),
+        run("DataParser (per line)", wrapper_per_line, len(lines), args.repeat),
+        run(f"DataParser ({args.chunk} B chunks)", wrapper_chunked, len(lines), args.repeat),
+        run(f"FrameParser ({args.chunk} B chunks)", engine_chunked, len(lines), args.repeat),
+        run("parse_raw_packet", raw_packets, len(packets), args.repeat),
+        # Satuan tetap baris teks ekuivalen supaya sebanding
+        run(f"BinaryDecoder ({args.chunk} B chunks)", binary_chunked, len(lines), args.repeat),
+    ]
+    base, new, _, chunked, _, binary_time = (r['seconds'] for r in results)
+    print(f"speedup per line: {base / new:.2f}x, chunked: {base / chunked:.2f}x, "
+          f"binary: {base / binary_time:.2f}x ({len(binary) / 1e6:.1f} MB vs {len(data) / 1e6:.1f} MB)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'capture_mb': len(data) / 1e6, 'frames': frames, 'results': results},
+                      f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
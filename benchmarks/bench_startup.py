@@ -0,0 +1,107 @@
+"""Benchmark waktu startup gcs_main dengan -X importtime.
+
+Mengukur total waktu import modul GUI (tanpa membuat window) dan daftar
+import terberat, untuk tree sekarang dan opsional revisi git lain:
+
+    python benchmarks/bench_startup.py --rev HEAD~1 --output startup.json
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DISPLAY_DIR = os.path.join(ROOT, 'src', 'Display')
+MODULE = 'gcs_main'
+
+
+def parse_importtime(stderr):
+    """Return list (name, self_us, cumulative_us, depth) dari output -X importtime"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative, name = line.split(':', 1)[1].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative), depth))
+    return rows
+
+
+def measure(module_dir, repeat=3):
+    env = dict(os.environ, MPLBACKEND='Agg')
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {MODULE}'],
+            cwd=module_dir, env=env, capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        if best is None or wall < best[0]:
+            best = (wall, proc)
+    wall, proc = best
+    rows = parse_importtime(proc.stderr)
+    top = sorted((r for r in rows if r[3] <= 1), key=lambda r: r[2], reverse=True)[:10]
+    result = {
+        'wall_s': wall,
+        'import_total_us': sum(r[1] for r in rows),
+        'modules': len(rows),
+        'top_imports': [{'name': n, 'cumulative_us': c} for n, _, c, _ in top],
+        'ok': proc.returncode == 0,
+    }
+    if proc.returncode != 0:
+        result['error'] = proc.stderr.strip().splitlines()[-1]
+    return result
+
+
+def checkout_display(rev, dest):
+    listing = subprocess.check_output(
+        ['git', 'ls-tree', '--name-only', rev, 'src/Display/'], cwd=ROOT, text=True)
+    for path in listing.split():
+        if path.endswith('.py'):
+            data = subprocess.check_output(['git', 'show', f'{rev}:{path}'], cwd=ROOT)
+            with open(os.path.join(dest, os.path.basename(path)), 'wb') as f:
+                f.write(data)
+
+
+def print_result(label, result):
+    print(f"== {label}: wall {result['wall_s'] * 1000:.0f} ms, "
+          f"imports {result['import_total_us'] / 1000:.0f} ms, {result['modules']} modules")
+    if not result['ok']:
+        print(f"   import failed: {result['error']}")
+    for item in result['top_imports']:
+        print(f"   {item['cumulative_us'] / 1000:>8.1f} ms  {item['name']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument('--rev', help='revisi git pembanding (mis. baseline atau HEAD~1)')
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--output', help='simpan hasil sebagai JSON')
+    args = ap.parse_args()
+
+    results = {'python': sys.version.split()[0]}
+    if args.rev:
+        tmp = tempfile.mkdtemp(prefix='gcs_startup_')
+        try:
+            checkout_display(args.rev, tmp)
+            results['before'] = dict(measure(tmp, args.repeat), rev=args.rev)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        print_result(f"before ({args.rev})", results['before'])
+    results['after'] = measure(DISPLAY_DIR, args.repeat)
+    print_result("after (working tree)", results['after'])
+    if args.rev and results['before']['ok'] and results['after']['ok']:
+        ratio = results['before']['wall_s'] / results['after']['wall_s']
+        print(f"startup speedup: {ratio:.2f}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""Jalankan semua benchmark dan simpan hasil JSON untuk tracking regresi.
+
+    python benchmarks/run_benchmarks.py --output results/HEAD.json
+    python benchmarks/run_benchmarks.py --quick --compare results/v1.json
+
+Setiap suite (parser, gui, export) dijalankan sebagai subprocess dengan
+--output ke file sementara, lalu digabung bersama metadata (git revision,
+versi Python/library, platform). Dengan --compare, throughput setiap kasus
+dibandingkan dengan file baseline; exit code 1 jika ada yang turun lebih
+dari --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Metric throughput per suite (lebih besar = lebih baik)
+METRICS = {
+    'parser': 'lines_per_s',
+    'gui': 'frames_per_s',
+    'export': 'rows_per_s',
+}
+
+
+def suite_args(quick):
+    if quick:
+        return {
+            'parser': ['--mb', '2', '--repeat', '3'],
+            'gui': ['--ticks', '200', '--rows', '10000'],
+            'export': ['--rows', '10000', '100000', '--cases', 'csv', 'xlsx', 'parquet'],
+        }
+    return {
+        'parser': ['--mb', '20', '--repeat', '3'],
+        'gui': ['--ticks', '1000', '--rows', '1000000'],
+        'export': ['--rows', '10000', '100000', '1000000', '--cases', 'csv', 'xlsx', 'parquet'],
+    }
+
+
+def git_revision():
+    try:
+        rev = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=HERE,
+                             capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        rev = None
+    return rev
+
+
+def library_versions():
+    versions = {}
+    for name in ('numpy', 'matplotlib', 'openpyxl', 'pyarrow', 'pandas'):
+        try:
+            module = __import__(name)
+        except ImportError:
+            continue
+        versions[name] = getattr(module, '__version__', None)
+    return versions
+
+
+def run_suite(name, args, timeout):
+    fd, path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    script = os.path.join(HERE, f'bench_{name}.py')
+    try:
+        proc = subprocess.run([sys.executable, script, '--output', path] + args,
+                              capture_output=True, text=True, timeout=timeout)
+        sys.stdout.write(proc.stdout)
+        if proc.returncode != 0:
+            reason = (proc.stderr.strip().splitlines() or ['failed'])[-1]
+            return {'skipped': reason}
+        with open(path) as f:
+            data = json.load(f)
+    except subprocess.TimeoutExpired:
+        return {'skipped': f'timeout {timeout}s'}
+    finally:
+        os.remove(path)
+    # bench_export menulis list, suite lain dict dengan 'results'
+    return data if isinstance(data, dict) else {'results': data}
+
+
+def result_key(suite, result):
+    key = f"{suite}/{result.get('name') or result.get('case')}"
+    if 'rows' in result and suite == 'export':
+        key += f"/{result['rows']}"
+    return key
+
+
+def flatten(report):
+    values = {}
+    for suite, data in report['suites'].items():
+        metric = METRICS[suite]
+        for result in data.get('results', ()):
+            if metric in result:
+                values[result_key(suite, result)] = result[metric]
+    return values
+
+
+def compare(report, baseline, threshold):
+    current = flatten(report)
+    previous = flatten(baseline)
+    regressions = []
+    print(f"\nvs {baseline['meta'].get('git_revision')} (threshold {threshold:.0%}):")
+    for key in sorted(current):
+        if key not in previous:
+            continue
+        ratio = current[key] / previous[key]
+        flag = ''
+        if ratio < 1 - threshold:
+            flag = '  REGRESSION'
+            regressions.append(key)
+        print(f"  {key:<48} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument('--suites', nargs='+', choices=list(METRICS), default=list(METRICS))
+    ap.add_argument('--quick', action='store_true', help='ukuran kecil untuk CI / cek cepat')
+    ap.add_argument('--timeout', type=float, default=3600)
+    ap.add_argument('--output', help='simpan hasil gabungan sebagai JSON')
+    ap.add_argument('--compare', help='file JSON baseline dari run sebelumnya')
+    ap.add_argument('--threshold', type=float, default=0.15,
+                    help='penurunan throughput relatif yang dianggap regresi')
+    args = ap.parse_args(argv)
+
+    report = {
+        'meta': {
+            'git_revision': git_revision(),
+            'created': time.time(),
+            'quick': args.quick,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'libraries': library_versions(),
+        },
+        'suites': {},
+    }
+    all_args = suite_args(args.quick)
+    for name in args.suites:
+        print(f"== {name}")
+        report['suites'][name] = run_suite(name, all_args[name], args.timeout)
+        if 'skipped' in report['suites'][name]:
+            print(f"skipped: {report['suites'][name]['skipped']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""Framing biner receiver -> GCS (Receiver_5.ino dengan BINARY_OUTPUT 1).
+
+Satu frame = struct little-endian berukuran tetap (44 byte):
+
+    sync        uint16   0xA55A (byte 5A A5)
+    seq         uint16   nomor urut frame, wrap di 65535
+    altitude    float32  m
+    latitude    int32
+    longitude   int32
+    voltage     float32  V
+    remaining   int16    %
+    status      char[8]  ASCII, diisi NUL
+    cycle_time  uint32   ms
+    rssi        float32  dBm (rata-rata siklus)
+    snr         float32  dB (rata-rata siklus)
+    crc         uint16   CRC-16/CCITT-FALSE atas byte seq..snr
+
+Decoder mencari run frame yang berurutan (sync di setiap kelipatan
+FRAME_SIZE, dicek dengan slice bertingkat tanpa loop Python), lalu
+mendekode seluruh run dengan struct.iter_unpack. Frame dengan CRC salah
+membuat decoder resync mulai byte berikutnya.
+"""
+import struct
+from binascii import crc_hqx
+
+from gcs_serial import SerialReader
+from gcs_store import REMAINING_UNKNOWN
+
+SYNC = b'\x5a\xa5'
+FRAME_STRUCT = struct.Struct('<2sHfiifh8sIffH')
+FRAME_SIZE = FRAME_STRUCT.size
+CRC_START = len(SYNC)
+CRC_END = FRAME_SIZE - 2
+CRC_INIT = 0xFFFF
+STATUS_SIZE = 8
+SEQ_MODULO = 1 << 16
+
+# Auto-detect: berapa byte dilihat sebelum menyerah dan memakai mode teks
+DETECT_BYTES = 4 * FRAME_SIZE + 512
+
+
+def crc16(data):
+    return crc_hqx(data, CRC_INIT)
+
+
+_crc_table = None
+
+
+def crc16_rows(rows):
+    """CRC-16/CCITT-FALSE setiap baris matriks uint8 NumPy (N x panjang).
+
+    Table-driven, satu langkah vectorized per kolom byte, jadi biayanya
+    O(panjang) operasi array untuk semua frame sekaligus.
+    """
+    import numpy as np
+
+    global _crc_table
+    if _crc_table is None:
+        _crc_table = np.array([crc_hqx(bytes([i]), 0) for i in range(256)], dtype=np.uint16)
+    table = _crc_table
+    crc = np.full(len(rows), CRC_INIT, dtype=np.uint16)
+    for column in rows.T:
+        crc = (crc << 8) ^ table[(crc >> 8) ^ column]
+    return crc
+
+
+def encode_frame(seq, data):
+    """Frame dict (format DataParser) -> bytes; dipakai simulator dan test"""
+    get = data.get
+    status = get('status', '').encode('ascii', errors='replace')[:STATUS_SIZE]
+    body = FRAME_STRUCT.pack(
+        SYNC, seq % SEQ_MODULO, get('altitude', 0.0), get('latitude', 0), get('longitude', 0),
+        get('voltage', 0.0), get('remaining', REMAINING_UNKNOWN), status, get('cycle_time', 0),
+        get('rssi', 0.0), get('snr', 0.0), 0)
+    return body[:CRC_END] + struct.pack('<H', crc16(body[CRC_START:CRC_END]))
+
+
+def _to_frame(values):
+    (_, seq, altitude, latitude, longitude, voltage, remaining, status,
+     cycle_time, rssi, snr, _) = values
+    # 2 desimal seperti output teks, supaya key fusion sama antar link teks/biner
+    return {
+        'seq': seq,
+        'altitude': round(altitude, 2),
+        'latitude': latitude,
+        'longitude': longitude,
+        'voltage': round(voltage, 2),
+        'remaining': remaining,
+        'status': status.rstrip(b'\0').decode('ascii', errors='ignore'),
+        'cycle_time': cycle_time,
+        'rssi': round(rssi, 2),
+        'snr': round(snr, 2),
+    }
+
+
+def _leading(data, byte):
+    return len(data) - len(data.lstrip(byte))
+
+
+class BinaryDecoder:
+    """Decoder streaming frame biner dengan resync.
+
+    feed(chunk) -> list frame dict. Byte yang tidak membentuk frame valid
+    dibuang dan dihitung di `skipped_bytes`; `missed` menghitung celah seq.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.frames = 0
+        self.crc_errors = 0
+        self.skipped_bytes = 0
+        self.missed = 0
+        self.last_seq = None
+
+    def feed(self, chunk):
+        buf = self.buffer
+        buf += chunk
+        frames = []
+        pos = self._decode(buf, frames)
+        if pos:
+            del buf[:pos]
+        return frames
+
+    def _decode(self, buf, frames):
+        end = len(buf)
+        pos = 0
+        sync0 = SYNC[:1]
+        sync1 = SYNC[1:]
+        while True:
+            start = buf.find(SYNC, pos)
+            if start < 0:
+                # Simpan byte terakhir, bisa jadi awal sync
+                keep = end - 1 if end and buf[-1:] == sync0 else end
+                self.skipped_bytes += keep - pos
+                return keep
+            self.skipped_bytes += start - pos
+            count = (end - start) // FRAME_SIZE
+            if count == 0:
+                return start
+            # Panjang run: frame berurutan yang semua diawali sync
+            region_end = start + count * FRAME_SIZE
+            run = min(_leading(bytes(buf[start:region_end:FRAME_SIZE]), sync0),
+                      _leading(bytes(buf[start + 1:region_end:FRAME_SIZE]), sync1))
+            view = memoryview(buf)[start:start + run * FRAME_SIZE]
+            good = run
+            for i in range(run):
+                offset = i * FRAME_SIZE
+                crc = view[offset + CRC_END] | (view[offset + CRC_END + 1] << 8)
+                if crc16(view[offset + CRC_START:offset + CRC_END]) != crc:
+                    good = i
+                    break
+            if good:
+                self._emit(view[:good * FRAME_SIZE], frames)
+            view.release()
+            pos = start + good * FRAME_SIZE
+            if good < run:
+                self.crc_errors += 1
+                self.skipped_bytes += 1
+                pos += 1  # frame rusak / sync palsu: cari sync berikutnya
+
+    def _emit(self, data, frames):
+        last_seq = self.last_seq
+        for values in FRAME_STRUCT.iter_unpack(data):
+            frame = _to_frame(values)
+            seq = frame['seq']
+            if last_seq is not None:
+                gap = (seq - last_seq - 1) % SEQ_MODULO
+                if gap < SEQ_MODULO // 2:
+                    self.missed += gap
+            last_seq = seq
+            frames.append(frame)
+        self.last_seq = last_seq
+        self.frames += len(data) // FRAME_SIZE
+
+    def reset(self):
+        self.buffer.clear()
+        self.last_seq = None
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'crc_errors': self.crc_errors,
+            'skipped_bytes': self.skipped_bytes,
+            'missed': self.missed,
+        }
+
+
+def decode_array(data):
+    """Decode buffer berisi frame biner berurutan ke NumPy structured array.
+
+    Untuk konversi batch (capture besar); frame dengan sync/CRC salah
+    dibuang. Return (array, jumlah_frame_rusak).
+    """
+    import numpy as np
+
+    dtype = np.dtype([
+        ('sync', 'V2'), ('seq', '<u2'), ('altitude', '<f4'), ('latitude', '<i4'),
+        ('longitude', '<i4'), ('voltage', '<f4'), ('remaining', '<i2'), ('status', 'S8'),
+        ('cycle_time', '<u4'), ('rssi', '<f4'), ('snr', '<f4'), ('crc', '<u2'),
+    ])
+    assert dtype.itemsize == FRAME_SIZE
+    count = len(data) // FRAME_SIZE
+    raw = np.frombuffer(data, dtype=np.uint8, count=count * FRAME_SIZE).reshape(count, FRAME_SIZE)
+    ok = (raw[:, 0] == SYNC[0]) & (raw[:, 1] == SYNC[1])
+    rows = np.flatnonzero(ok)
+    synced = raw[rows]
+    stored = synced[:, CRC_END] | synced[:, CRC_END + 1].astype(np.uint16) << 8
+    ok[rows[crc16_rows(synced[:, CRC_START:CRC_END]) != stored]] = False
+    frames = raw[ok].copy().view(dtype).reshape(-1)
+    return frames, int(count - ok.sum())
+
+
+def looks_like_text(data):
+    """Heuristik: sebagian besar byte printable ASCII / whitespace"""
+    if not data:
+        return False
+    printable = sum(1 for b in data if 32 <= b < 127 or b in (9, 10, 13))
+    return printable >= 0.95 * len(data)
+
+
+class AutoDecoder:
+    """Deteksi otomatis stream teks vs biner per link.
+
+    Sampai format diketahui, byte ditahan; stream dianggap biner jika ada
+    frame dengan CRC valid, teks jika sudah ada baris printable tanpa sync
+    word. Di mode teks, byte mulai sync word ditampung (maks DETECT_BYTES)
+    dan pindah ke mode biner hanya jika berisi frame dengan CRC valid
+    (banner boot receiver biner dicetak sebagai teks); sync word nyasar
+    saja tidak mengubah mode. Mode biner kembali ke deteksi jika tidak
+    menghasilkan frame valid selama DETECT_BYTES (receiver di-flash ulang
+    ke mode teks).
+    """
+
+    def __init__(self, on_line, on_frame, mode=None):
+        self.on_frame = on_frame
+        self.text = SerialReader(None, on_line)
+        self.binary = BinaryDecoder()
+        self.mode = mode
+        self.detections = 0
+        self._pending = bytearray()
+        self._probe = bytearray()
+        self._binary_idle = 0
+
+    @property
+    def latency(self):
+        return self.text.latency
+
+    def feed(self, data, received_at=None):
+        mode = self.mode
+        if mode == 'text':
+            self.text.feed(data, received_at)
+            if self._probe or SYNC in data:
+                self._probe_binary(data)
+        elif mode == 'binary':
+            self._feed_binary(data)
+        else:
+            self._detect(data, received_at)
+
+    def _probe_binary(self, data):
+        # Mode teks: pindah ke biner hanya jika ada frame dengan CRC valid
+        probe = self._probe
+        if not probe:
+            data = data[data.find(SYNC):]
+        probe += data
+        if BinaryDecoder().feed(bytes(probe)):
+            data = bytes(probe)
+            probe.clear()
+            self._switch('binary')
+            self._decode_binary(data)
+        elif len(probe) > DETECT_BYTES:
+            # Sync word nyasar: lanjut dari sync berikutnya (jika ada)
+            start = probe.find(SYNC, 1)
+            del probe[:start if start >= 0 else len(probe)]
+
+    def _decode_binary(self, data):
+        frames = self.binary.feed(data)
+        if frames:
+            self._binary_idle = 0
+            on_frame = self.on_frame
+            for frame in frames:
+                on_frame(frame)
+        return frames
+
+    def _feed_binary(self, data):
+        if self._decode_binary(data):
+            return
+        self._binary_idle += len(data)
+        if self._binary_idle > DETECT_BYTES:
+            self.mode = None
+            self._binary_idle = 0
+            data = bytes(self.binary.buffer)
+            self.binary.reset()
+            self._detect(data, None)
+
+    def _detect(self, data, received_at):
+        pending = self._pending
+        pending += data
+        probe = BinaryDecoder()
+        if probe.feed(bytes(pending)):
+            self._switch('binary')
+        elif len(pending) >= DETECT_BYTES:
+            self._switch('text' if looks_like_text(pending) else 'binary')
+        elif b'\n' in pending and looks_like_text(pending) and SYNC not in pending:
+            self._switch('text')
+        else:
+            return
+        data = bytes(pending)
+        pending.clear()
+        # Langsung ke decoder mode terpilih, bukan lewat feed(): data
+        # teks boleh berisi sync word nyasar
+        if self.mode == 'text':
+            self.text.feed(data, received_at)
+        else:
+            self._decode_binary(data)
+
+    def _switch(self, mode):
+        self.mode = mode
+        self.detections += 1
+
+    def stats(self):
+        stats = {'mode': self.mode, 'detections': self.detections}
+        if self.mode == 'binary' or self.binary.frames:
+            stats.update(self.binary.stats())
+        return stats
+
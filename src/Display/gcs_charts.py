@@ -0,0 +1,190 @@
+import time
+
+import numpy as np
+
+from gcs_downsample import MinMaxPyramid, DEFAULT_RAW_POINTS
+
+DEFAULT_MAX_DRAW_POINTS = 2000
+X_HEADROOM = 0.25              # ruang kosong di kanan sebelum axis digeser
+Y_MARGIN = 0.1
+
+
+class ChartPanel:
+    """Live chart dengan downsampling multi-resolusi dan blitting.
+
+    Setiap series disimpan di MinMaxPyramid (seluruh sesi), dan yang
+    digambar hanya hasil query window/zoom aktif, maksimal max_draw_points
+    titik per line. Full redraw hanya dilakukan saat data keluar dari batas
+    axis (x digeser dengan headroom, y diperlebar); frame lainnya cukup
+    restore background lalu gambar ulang line saja.
+
+    window_points=None dan window_seconds=None berarti seluruh sesi. Zoom /
+    pan dari toolbar matplotlib membuat axes berhenti mengikuti data live
+    sampai follow_live() (atau set_window) dipanggil.
+    """
+
+    def __init__(self, canvas, window_points=50, window_seconds=None,
+                 raw_points=DEFAULT_RAW_POINTS, max_draw_points=DEFAULT_MAX_DRAW_POINTS):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.raw_points = raw_points
+        self.max_draw_points = max_draw_points
+        self.window_points = window_points
+        self.window_seconds = window_seconds
+        self.charts = []  # list of (ax, [(key, line, MinMaxPyramid)])
+        self.t0 = None
+        self.full_draws = 0
+        self.blits = 0
+        self.queries = 0
+        self._manual = {}  # ax -> (x_lo, x_hi) hasil zoom/pan user
+        self._setting_limits = False
+        self._background = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add_axes(self, ax, series):
+        """Daftarkan axes dengan mapping key data -> line artist"""
+        entries = []
+        for key, line in series.items():
+            line.set_animated(True)
+            entries.append((key, line, MinMaxPyramid(self.raw_points)))
+        self.charts.append((ax, entries))
+        ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+    def set_window(self, points=None, seconds=None):
+        """Ganti panjang window; seluruh data sesi tetap tersimpan"""
+        self.window_points = points
+        self.window_seconds = seconds
+        self._manual.clear()
+        self._refresh(force_limits=True)
+
+    def follow_live(self):
+        self._manual.clear()
+        self._refresh(force_limits=True)
+
+    def clear(self):
+        self.t0 = None
+        self._manual.clear()
+        for ax, entries in self.charts:
+            for key, line, series in entries:
+                series.clear()
+                line.set_data([], [])
+        self._request_full_draw()
+
+    def _on_xlim_changed(self, ax):
+        if self._setting_limits:
+            return
+        # Zoom/pan user: query ulang level yang sesuai sebelum canvas digambar
+        self._manual[ax] = ax.get_xlim()
+        for chart_ax, entries in self.charts:
+            if chart_ax is ax:
+                for key, line, series in entries:
+                    line.set_data(*self._visible(ax, series))
+
+    def append(self, data, timestamp=None):
+        """Masukkan frame ke ring buffer tanpa menggambar; return True jika ada field chart"""
+        if timestamp is None:
+            timestamp = time.time()
+        if self.t0 is None:
+            self.t0 = timestamp
+        t = timestamp - self.t0
+
+        touched = False
+        for ax, entries in self.charts:
+            for key, line, series in entries:
+                value = data.get(key)
+                if value is not None:
+                    series.append(t, value)
+                    touched = True
+        return touched
+
+    def update(self, data, timestamp=None):
+        if self.append(data, timestamp):
+            self.refresh()
+
+    def refresh(self):
+        """Gambar ulang chart sekali untuk semua data yang sudah di-append"""
+        self._refresh()
+
+    def _visible(self, ax, series):
+        self.queries += 1
+        if series.t_last is None:
+            return series.query(0.0, 0.0, self.max_draw_points)
+        manual = self._manual.get(ax)
+        if manual is not None:
+            t0, t1 = manual
+        elif self.window_seconds is not None:
+            t0, t1 = series.t_last - self.window_seconds, series.t_last
+        elif self.window_points:
+            t0, t1 = series.tail_start(self.window_points), series.t_last
+        else:
+            t0, t1 = series.t_first, series.t_last
+        return series.query(t0, t1, self.max_draw_points)
+
+    def _refresh(self, force_limits=False):
+        self._setting_limits = True
+        try:
+            full = self._update_limits(force_limits)
+        finally:
+            self._setting_limits = False
+        if full or self._background is None:
+            self._request_full_draw()
+        else:
+            self._blit()
+
+    def _update_limits(self, force_limits):
+        full = force_limits
+        for ax, entries in self.charts:
+            t_first = t_last = None
+            v_min = v_max = None
+            for key, line, series in entries:
+                t, v = self._visible(ax, series)
+                line.set_data(t, v)
+                if not len(t):
+                    continue
+                t_first = t[0] if t_first is None else min(t_first, t[0])
+                t_last = t[-1] if t_last is None else max(t_last, t[-1])
+                finite = v[np.isfinite(v)]
+                if len(finite):
+                    lo, hi = finite.min(), finite.max()
+                    v_min = lo if v_min is None else min(v_min, lo)
+                    v_max = hi if v_max is None else max(v_max, hi)
+            if t_last is None or ax in self._manual:
+                continue
+
+            x_lo, x_hi = ax.get_xlim()
+            if force_limits or t_last > x_hi or t_first < x_lo:
+                span = max(t_last - t_first, self.window_seconds or 1.0)
+                ax.set_xlim(t_first, t_first + span * (1 + X_HEADROOM))
+                full = True
+                force_y = True
+            else:
+                force_y = force_limits
+
+            if v_min is not None:
+                y_lo, y_hi = ax.get_ylim()
+                if force_y or v_min < y_lo or v_max > y_hi:
+                    pad = max((v_max - v_min) * Y_MARGIN, 0.5)
+                    ax.set_ylim(v_min - pad, v_max + pad)
+                    full = True
+        return full
+
+    def _request_full_draw(self):
+        self._background = None
+        self.canvas.draw_idle()
+
+    def _on_draw(self, event):
+        # Background tanpa line (animated) diambil setiap kali full draw
+        self.full_draws += 1
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_lines()
+
+    def _blit(self):
+        self.blits += 1
+        self.canvas.restore_region(self._background)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for ax, entries in self.charts:
+            for key, line, series in entries:
+                ax.draw_artist(line)
+        self.canvas.blit(self.figure.bbox)
@@ -0,0 +1,108 @@
+import tkinter as tk
+from collections import deque
+from datetime import datetime
+from tkinter import ttk
+
+from gcs_parser import is_valid_line
+from gcs_rawpacket import is_packet_line
+
+MAX_SCROLLBACK = 100000
+DEFAULT_TRIM_BATCH = 200
+
+
+def _status_line(line):
+    return line.startswith("Status:") or line.startswith("ST")
+
+
+def _malformed_line(line):
+    # Grammar blok teks UAV DATA atau paket mentah AL/LT/LN/BV/ST (gcs_rawpacket)
+    return not (is_valid_line(line) or is_packet_line(line))
+
+
+# Nama filter -> predicate(line), None = tampilkan semua
+FILTERS = {
+    "All": None,
+    "Status": _status_line,
+    "Malformed": _malformed_line,
+}
+
+
+class RawConsole:
+    """Console raw data dengan jumlah baris yang dihitung sendiri.
+
+    Baris di-insert per batch dalam satu panggilan insert, dan baris lama
+    dibuang dengan index arithmetic (tanpa membaca isi Text widget) setiap
+    kali kelebihan mencapai `trim_batch`. Pause dan filter hanya berlaku
+    untuk baris baru, isi yang sudah tampil tidak di-render ulang.
+    """
+
+    def __init__(self, parent, max_lines=1000, trim_batch=DEFAULT_TRIM_BATCH):
+        self.max_lines = min(max_lines, MAX_SCROLLBACK)
+        self.trim_batch = trim_batch
+        self.line_count = 0
+        self.paused = False
+        self.filter = None
+        self.pending = deque(maxlen=self.max_lines)
+        self.lines_received = 0
+        self.lines_shown = 0
+
+        self.text = tk.Text(parent, wrap=tk.WORD, width=80, height=20,
+                            bg='black', fg='green', font=('Consolas', 10),
+                            undo=False)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.text.yview)
+        self.text.configure(yscrollcommand=self.scrollbar.set)
+
+    def pack(self):
+        self.text.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+    def set_filter(self, name):
+        self.filter = FILTERS[name]
+
+    def set_paused(self, paused):
+        self.paused = paused
+        if not paused and self.pending:
+            items = list(self.pending)
+            self.pending.clear()
+            self._insert(items)
+
+    def append(self, items):
+        """Tambah list (timestamp, line, source); dipanggil sekali per UI tick.
+
+        `source` = nama link (None jika hanya satu receiver) ditampilkan
+        sebagai prefix; filter hanya melihat `line`.
+        """
+        self.lines_received += len(items)
+        predicate = self.filter
+        if predicate is not None:
+            items = [item for item in items if predicate(item[1])]
+        if not items:
+            return
+        if self.paused:
+            self.pending.extend(items)
+            return
+        self._insert(items)
+
+    def _insert(self, items):
+        if len(items) > self.max_lines:
+            items = items[-self.max_lines:]
+        text = ''.join(f"{datetime.fromtimestamp(ts).strftime('%H:%M:%S')} > "
+                       f"{f'[{source}] ' if source else ''}{line}\n"
+                       for ts, line, source in items)
+        # Auto-scroll hanya jika user sedang di bawah
+        at_bottom = self.text.yview()[1] >= 0.999
+        self.text.insert('end', text)
+        self.line_count += len(items)
+        self.lines_shown += len(items)
+
+        excess = self.line_count - self.max_lines
+        if excess >= self.trim_batch:
+            self.text.delete('1.0', f'{excess + 1}.0')
+            self.line_count -= excess
+        if at_bottom:
+            self.text.see('end')
+
+    def clear(self):
+        self.text.delete('1.0', 'end')
+        self.pending.clear()
+        self.line_count = 0
@@ -0,0 +1,432 @@
+"""Konversi batch capture receiver ke file kolom (.npz atau Parquet).
+
+Menelusuri folder capture teks Receiver_5.ino (hasil salin tab Raw Data
+atau log terminal; prefix jam "HH:MM:SS > " menjadi timestamp frame) dan
+flight log .lfr, lalu mem-parse file secara paralel di process pool. File
+dibaca lewat mmap per potongan CHUNK_BYTES yang dipotong di batas baris,
+jadi capture besar tidak pernah dimuat utuh sebagai list baris.
+
+Satu file output per capture:
+    .npz     - format cache FlightIndex, langsung bisa dibuka gcs_query.py
+               dan gcs_rules.py
+    .parquet - skema yang sama dengan export Parquet (butuh pyarrow)
+
+`index.json` di folder output mencatat per capture: ukuran, mtime,
+checksum BLAKE2b, jumlah frame dan rentang waktu. Run berikutnya
+melewati capture yang ukuran+mtime-nya sama tanpa membaca ulang; jika
+hanya mtime yang berubah, checksum dihitung ulang dan capture yang
+isinya sama tidak di-parse lagi. Index ditulis berkala selama run, jadi
+run yang terputus bisa dilanjutkan.
+
+    python gcs_convert.py captures/ -o converted/ --jobs 8
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from gcs_replay import DEFAULT_CYCLE_SECONDS, TIME_PREFIX_RE, CaptureClock, prefix_time
+
+CHUNK_BYTES = 4 * 1024 * 1024
+CAPTURE_EXTENSIONS = ('.txt', '.log', '.lfr')
+FORMATS = ('npz', 'parquet')
+INDEX_NAME = 'index.json'
+INDEX_VERSION = 2  # 2: timestamp capture berprefix dari jam prefix
+INDEX_FLUSH_SECONDS = 2.0
+
+
+def file_checksum(path):
+    """BLAKE2b (hex) isi file, dibaca lewat mmap"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for pos in range(0, len(mm), CHUNK_BYTES):
+                    digest.update(mm[pos:pos + CHUNK_BYTES])
+    return digest.hexdigest()
+
+
+def iter_line_chunks(mm, size=CHUNK_BYTES):
+    """Potongan mmap sebesar ~size yang selalu berakhir di batas baris"""
+    pos = 0
+    end = len(mm)
+    while pos < end:
+        stop = min(pos + size, end)
+        if stop < end:
+            cut = mm.rfind(b'\n', pos, stop)
+            if cut < 0:
+                cut = mm.find(b'\n', stop)
+                stop = end if cut < 0 else cut + 1
+            else:
+                stop = cut + 1
+        yield mm[pos:stop]
+        pos = stop
+
+
+def _anchor_time(match, mtime):
+    # Prefix hanya berisi jam: tanggal diambil dari mtime file; jam yang
+    # lebih besar dari mtime berarti capture dimulai hari sebelumnya
+    end = datetime.fromtimestamp(mtime)
+    start = datetime.combine(end.date(), datetime.min.time()) + timedelta(seconds=prefix_time(match)[0])
+    if start > end:
+        start -= timedelta(days=1)
+    return start.timestamp()
+
+
+def _cycle_seconds(frame):
+    cycle = frame.get('cycle_time', 0)
+    return cycle / 1000.0 if cycle > 0 else DEFAULT_CYCLE_SECONDS
+
+
+def _append_frames(append, frames, clock):
+    advance = clock.advance
+    for frame in frames:
+        append(frame, advance(_cycle_seconds(frame)))
+
+
+def _append_prefixed(append, parser, chunk, clock):
+    # Per baris supaya tiap frame mendapat jam prefix baris penutupnya
+    feed_line = parser.feed_line
+    match_prefix = TIME_PREFIX_RE.match
+    advance = clock.advance
+    for line in chunk.split(b'\n'):
+        match = match_prefix(line)
+        if match is not None:
+            line = line[match.end():]
+        frame = feed_line(line)
+        if frame is not None:
+            append(frame, advance(_cycle_seconds(frame), match))
+
+
+def parse_text_capture(path):
+    """Capture teks -> (TelemetryStore, anchor) dengan timestamp relatif.
+
+    Capture berprefix jam: timestamp frame dari prefix baris penutupnya,
+    relatif ke prefix pertama (anchor = waktu absolutnya), jadi gap dan
+    outage tetap terlihat. Capture tanpa prefix: kumulatif Cycle Time
+    (atau DEFAULT_CYCLE_SECONDS) dan anchor None. Lihat CaptureClock.
+    """
+    from gcs_parser import FrameParser
+    from gcs_store import TelemetryStore
+
+    parser = FrameParser()
+    store = TelemetryStore(max_rows=None)
+    append = store.append
+    anchor = None
+    clock = None
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return store, None
+        mtime = os.fstat(f.fileno()).st_mtime
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for chunk in iter_line_chunks(mm):
+                if clock is None:
+                    match = TIME_PREFIX_RE.search(chunk)
+                    if match is not None:
+                        anchor = _anchor_time(match, mtime)
+                        clock = CaptureClock(match)
+                    elif chunk.strip():
+                        clock = CaptureClock()
+                    else:
+                        continue
+                if anchor is not None:
+                    # Chunk selalu berakhir di batas baris (kecuali ekor file)
+                    _append_prefixed(append, parser, chunk, clock)
+                else:
+                    _append_frames(append, parser.feed(chunk), clock)
+            if clock is not None:
+                # Baris terakhir tanpa newline
+                _append_frames(append, parser.feed(b'\n'), clock)
+    return store, anchor
+
+
+def load_columns(path):
+    """Capture teks atau flight log .lfr -> (kolom NumPy, status_table)"""
+    import numpy as np
+
+    from gcs_query import DTYPES, FlightIndex
+    from gcs_recorder import MAGIC
+    from gcs_store import COLUMN_NAMES
+
+    with open(path, 'rb') as f:
+        head = f.read(len(MAGIC))
+    if head == MAGIC:
+        index = FlightIndex.from_logs([path])
+        return index.columns, index.status_table
+
+    store, anchor = parse_text_capture(path)
+    parts = {name: [] for name in COLUMN_NAMES}
+    for chunk in store.iter_chunks():
+        for name in COLUMN_NAMES:
+            parts[name].append(np.frombuffer(chunk[name], dtype=DTYPES[name]))
+    columns = {name: np.concatenate(arrs) if arrs else np.empty(0, DTYPES[name])
+               for name, arrs in parts.items()}
+    timestamps = columns['timestamp']
+    if anchor is None:
+        # Tanpa jam di capture: anggap frame terakhir selesai saat file terakhir ditulis
+        anchor = os.path.getmtime(path) - (timestamps[-1] if len(timestamps) else 0.0)
+    columns['timestamp'] = timestamps + anchor
+    return columns, store.status_table
+
+
+def write_npz(path, columns, status_table):
+    from gcs_query import FlightIndex
+
+    with open(path, 'wb') as f:
+        FlightIndex(columns, status_table).save(f)
+
+
+def write_parquet(path, columns, status_table):
+    from gcs_export import ParquetWriter
+
+    writer = ParquetWriter(path, status_table)
+    try:
+        writer.write_chunk(columns)
+    finally:
+        writer.close()
+
+
+WRITERS = {
+    'npz': write_npz,
+    'parquet': write_parquet,
+}
+
+
+def convert_file(source, output, fmt, checksum=None):
+    """Konversi satu capture (dijalankan di worker process).
+
+    Jika `checksum` sama dengan checksum isi file saat ini, capture tidak
+    di-parse ulang. Return entry index untuk capture ini.
+    """
+    began = time.perf_counter()
+    stat = os.stat(source)
+    current = file_checksum(source)
+    entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'checksum': current}
+    if checksum == current:
+        entry['unchanged'] = True
+        return entry
+
+    columns, status_table = load_columns(source)
+    timestamps = columns['timestamp']
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    base, ext = os.path.splitext(output)
+    partial = f"{base}.partial{ext}"
+    WRITERS[fmt](partial, columns, status_table)
+    os.replace(partial, output)
+
+    entry.update({
+        'frames': len(timestamps),
+        't_first': float(timestamps.min()) if len(timestamps) else None,
+        't_last': float(timestamps.max()) if len(timestamps) else None,
+        'elapsed': time.perf_counter() - began,
+    })
+    return entry
+
+
+def _convert_task(task):
+    return convert_file(*task)
+
+
+# --- Batch ---
+
+def find_captures(paths, extensions=CAPTURE_EXTENSIONS):
+    """File capture di bawah `paths` -> list (path, nama relatif)"""
+    found = []
+    for root in paths:
+        if os.path.isfile(root):
+            found.append((root, os.path.basename(root)))
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.lower().endswith(extensions):
+                    path = os.path.join(dirpath, name)
+                    found.append((path, os.path.relpath(path, root)))
+    return found
+
+
+def output_names(captures, fmt):
+    """Nama relatif -> nama output; sufiks asli dipertahankan jika bentrok"""
+    names = {}
+    taken = {}
+    for _, rel in captures:
+        name = os.path.splitext(rel)[0] + '.' + fmt
+        taken[name] = taken.get(name, 0) + 1
+        names[rel] = name
+    for rel, name in names.items():
+        if taken[name] > 1:
+            names[rel] = rel + '.' + fmt
+    return names
+
+
+def load_index(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if index.get('version') != INDEX_VERSION:
+        return {}
+    return index.get('files', {})
+
+
+def save_index(path, files):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': INDEX_VERSION, 'files': files}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+class BatchConverter:
+    """Konversi banyak capture secara paralel dengan index yang bisa dilanjutkan"""
+
+    def __init__(self, paths, output_dir, fmt='npz', jobs=None, force=False, log=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"format tidak dikenal: {fmt}")
+        self.paths = paths
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.jobs = jobs or os.cpu_count() or 1
+        self.force = force
+        self.log = log or (lambda message: None)
+        self.index_path = os.path.join(output_dir, INDEX_NAME)
+        self.files = {}
+        self.stats = {'files': 0, 'converted': 0, 'skipped': 0, 'unchanged': 0,
+                      'errors': 0, 'frames': 0, 'bytes': 0, 'elapsed': 0.0}
+
+    def _plan(self):
+        """Return list task (rel, source, output, checksum) yang perlu dikerjakan"""
+        captures = find_captures(self.paths)
+        names = output_names(captures, self.fmt)
+        self.stats['files'] = len(captures)
+        tasks = []
+        for source, rel in captures:
+            output = os.path.join(self.output_dir, names[rel])
+            entry = self.files.get(rel)
+            checksum = None
+            if entry and not self.force and entry.get('format') == self.fmt \
+                    and os.path.exists(output):
+                stat = os.stat(source)
+                if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                    self.stats['skipped'] += 1
+                    continue
+                checksum = entry['checksum']
+            tasks.append((rel, source, output, checksum))
+        # File terbesar dulu supaya worker selesai hampir bersamaan
+        tasks.sort(key=lambda task: os.path.getsize(task[1]), reverse=True)
+        return tasks
+
+    def _done(self, rel, source, output, entry):
+        stats = self.stats
+        if entry.pop('unchanged', False):
+            stats['unchanged'] += 1
+            self.files[rel].update(entry)
+            return
+        entry.update({'source': source, 'output': os.path.relpath(output, self.output_dir),
+                      'format': self.fmt})
+        elapsed = entry.pop('elapsed')
+        self.files[rel] = entry
+        stats['converted'] += 1
+        stats['frames'] += entry['frames']
+        stats['bytes'] += entry['size']
+        self.log(f"{rel}: {entry['frames']} frames ({elapsed:.2f}s)")
+
+    def run(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.files = load_index(self.index_path)
+        began = time.perf_counter()
+        tasks = self._plan()
+        last_flush = time.monotonic()
+        try:
+            if self.jobs == 1 or len(tasks) <= 1:
+                results = ((task, self._call(task)) for task in tasks)
+                self._collect(results, last_flush)
+            else:
+                with ProcessPoolExecutor(max_workers=min(self.jobs, len(tasks))) as pool:
+                    futures = {pool.submit(_convert_task, (source, output, self.fmt, checksum)):
+                               (rel, source, output, checksum)
+                               for rel, source, output, checksum in tasks}
+                    try:
+                        self._collect(((futures[future], self._result(future))
+                                       for future in as_completed(futures)), last_flush)
+                    except BaseException:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        raise
+        finally:
+            save_index(self.index_path, self.files)
+            self.stats['elapsed'] = time.perf_counter() - began
+        return self.stats
+
+    def _call(self, task):
+        rel, source, output, checksum = task
+        try:
+            return convert_file(source, output, self.fmt, checksum)
+        except Exception as e:
+            return e
+
+    @staticmethod
+    def _result(future):
+        try:
+            return future.result()
+        except Exception as e:
+            return e
+
+    def _collect(self, results, last_flush):
+        for (rel, source, output, checksum), result in results:
+            if isinstance(result, Exception):
+                self.stats['errors'] += 1
+                self.log(f"{rel}: error: {result}")
+            else:
+                self._done(rel, source, output, result)
+            now = time.monotonic()
+            if now - last_flush >= INDEX_FLUSH_SECONDS:
+                save_index(self.index_path, self.files)
+                last_flush = now
+
+
+def format_stats(stats):
+    elapsed = max(stats['elapsed'], 1e-9)
+    return (f"{stats['converted']} converted, {stats['skipped'] + stats['unchanged']} up to date, "
+            f"{stats['errors']} errors of {stats['files']} files in {elapsed:.2f}s: "
+            f"{stats['converted'] / elapsed:.1f} files/s, {stats['frames'] / elapsed:.0f} frames/s, "
+            f"{stats['bytes'] / elapsed / 1e6:.1f} MB/s")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Konversi batch capture receiver ke .npz/Parquet")
+    ap.add_argument('paths', nargs='+', help='folder atau file capture (.txt, .log, .lfr)')
+    ap.add_argument('-o', '--output', default='converted', help='folder output (default: converted)')
+    ap.add_argument('--format', choices=FORMATS, default='npz')
+    ap.add_argument('-j', '--jobs', type=int, help='jumlah worker process (default: semua core)')
+    ap.add_argument('--force', action='store_true', help='konversi ulang semua capture')
+    ap.add_argument('-q', '--quiet', action='store_true', help='tanpa baris per file')
+    args = ap.parse_args(argv)
+
+    if args.format == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("error: --format parquet membutuhkan pyarrow", file=sys.stderr)
+            return 2
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    converter = BatchConverter(args.paths, args.output, args.format, args.jobs, args.force,
+                               log=None if args.quiet else log)
+    try:
+        stats = converter.run()
+    except KeyboardInterrupt:
+        print(f"interrupted; progress saved to {converter.index_path}", file=sys.stderr)
+        return 130
+    print(format_stats(stats), file=sys.stderr)
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
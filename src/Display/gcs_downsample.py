@@ -0,0 +1,196 @@
+"""Downsampling multi-resolusi (min/max bucket) untuk chart sesi panjang.
+
+MinMaxPyramid menyimpan sampel mentah terbaru di RingBuffer dan beberapa
+level ringkasan: level k berisi bucket berisi FACTOR**k sampel dengan
+nilai min dan max (beserta waktunya). Semua level di-update incremental
+per sampel (O(jumlah level)), jadi query rentang waktu mana pun cukup
+memilih level terhalus yang muat di `max_points` lalu slice, tanpa
+memindai data mentah. Min/max dipakai (bukan LTTB) supaya spike RSSI
+dan drop tegangan tetap terlihat pada zoom terjauh.
+"""
+import numpy as np
+
+FACTOR = 16
+LEVELS = 6                     # bucket terbesar 16**6 ~ 16.7 juta sampel
+DEFAULT_RAW_POINTS = 1 << 18   # ~36 jam @ 2 Hz di resolusi penuh
+INITIAL_CAPACITY = 1024
+
+
+class RingBuffer:
+    """Ring buffer (time, value) berukuran tetap di atas NumPy.
+
+    Setiap sampel ditulis dua kali (index i dan i + capacity) sehingga
+    view() selalu berupa slice kontigu yang sudah terurut tanpa copy.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._t = np.empty(2 * capacity, dtype=np.float64)
+        self._v = np.empty(2 * capacity, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, t, value):
+        h = self._head
+        cap = self.capacity
+        self._t[h] = self._t[h + cap] = t
+        self._v[h] = self._v[h + cap] = value
+        self._head = (h + 1) % cap
+        if self._count < cap:
+            self._count += 1
+
+    def view(self):
+        start = (self._head - self._count) % self.capacity
+        end = start + self._count
+        return self._t[start:end], self._v[start:end]
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+
+class _Level:
+    """Array bucket yang tumbuh (doubling) + bucket yang sedang terisi"""
+
+    __slots__ = ('size', 'bucket', 'count', 't_first', 't_lo', 'v_lo', 't_hi', 'v_hi',
+                 'p_count', 'p_first', 'p_tlo', 'p_vlo', 'p_thi', 'p_vhi')
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self.count = 0
+        self.size = INITIAL_CAPACITY
+        self.t_first = np.empty(self.size)
+        self.t_lo = np.empty(self.size)
+        self.v_lo = np.empty(self.size)
+        self.t_hi = np.empty(self.size)
+        self.v_hi = np.empty(self.size)
+        self.p_count = 0
+
+    def add(self, t, v):
+        if self.p_count == 0:
+            self.p_first = self.p_tlo = self.p_thi = t
+            self.p_vlo = self.p_vhi = v
+        elif v < self.p_vlo:
+            self.p_tlo, self.p_vlo = t, v
+        elif v > self.p_vhi:
+            self.p_thi, self.p_vhi = t, v
+        self.p_count += 1
+        if self.p_count == self.bucket:
+            self._close()
+
+    def _close(self):
+        n = self.count
+        if n == self.size:
+            self.size *= 2
+            for name in ('t_first', 't_lo', 'v_lo', 't_hi', 'v_hi'):
+                arr = getattr(self, name)
+                grown = np.empty(self.size)
+                grown[:n] = arr
+                setattr(self, name, grown)
+        self.t_first[n] = self.p_first
+        self.t_lo[n] = self.p_tlo
+        self.v_lo[n] = self.p_vlo
+        self.t_hi[n] = self.p_thi
+        self.v_hi[n] = self.p_vhi
+        self.count = n + 1
+        self.p_count = 0
+
+    def buckets(self, t0, t1):
+        """Jumlah bucket (termasuk yang terisi) yang beririsan [t0, t1]"""
+        first = self.t_first[:self.count]
+        b0 = max(np.searchsorted(first, t0, side='right') - 1, 0)
+        b1 = np.searchsorted(first, t1, side='right')
+        partial = self.p_count and self.p_first <= t1
+        return b0, b1, partial
+
+    def points(self, b0, b1, partial):
+        t_lo, v_lo = self.t_lo[b0:b1], self.v_lo[b0:b1]
+        t_hi, v_hi = self.t_hi[b0:b1], self.v_hi[b0:b1]
+        if partial:
+            t_lo = np.append(t_lo, self.p_tlo)
+            v_lo = np.append(v_lo, self.p_vlo)
+            t_hi = np.append(t_hi, self.p_thi)
+            v_hi = np.append(v_hi, self.p_vhi)
+        # Dua titik per bucket, urut waktu di dalam bucket
+        lo_first = t_lo <= t_hi
+        t = np.empty(2 * len(t_lo))
+        v = np.empty(2 * len(t_lo))
+        t[0::2] = np.where(lo_first, t_lo, t_hi)
+        v[0::2] = np.where(lo_first, v_lo, v_hi)
+        t[1::2] = np.where(lo_first, t_hi, t_lo)
+        v[1::2] = np.where(lo_first, v_hi, v_lo)
+        return t, v
+
+    def clear(self):
+        self.count = 0
+        self.p_count = 0
+
+
+class MinMaxPyramid:
+    """Satu series (time, value) dengan level raw + LEVELS level min/max"""
+
+    def __init__(self, raw_points=DEFAULT_RAW_POINTS, factor=FACTOR, levels=LEVELS):
+        self.raw = RingBuffer(raw_points)
+        self.levels = [_Level(factor ** (k + 1)) for k in range(levels)]
+        self.count = 0
+        self.t_first = None
+        self.t_last = None
+
+    def __len__(self):
+        return self.count
+
+    def append(self, t, value):
+        if value != value:  # NaN tidak ikut min/max
+            return
+        if self.t_first is None:
+            self.t_first = t
+        self.t_last = t
+        self.count += 1
+        self.raw.append(t, value)
+        for level in self.levels:
+            level.add(t, value)
+
+    def clear(self):
+        self.raw.clear()
+        for level in self.levels:
+            level.clear()
+        self.count = 0
+        self.t_first = self.t_last = None
+
+    def tail_start(self, points):
+        """Waktu sampel ke-`points` dari belakang (window berbasis jumlah titik)"""
+        t, _ = self.raw.view()
+        if not len(t):
+            return None
+        return t[-min(points, len(t))]
+
+    def query(self, t0, t1, max_points):
+        """(t, v) untuk rentang [t0, t1] dengan paling banyak ~max_points titik"""
+        t, v = self.raw.view()
+        if not len(t):
+            return t, v
+        # Resolusi penuh jika raw masih mencakup awal rentang
+        if t[0] <= t0 or self.count == len(t):
+            i0 = max(np.searchsorted(t, t0, side='left') - 1, 0)
+            i1 = np.searchsorted(t, t1, side='right') + 1
+            if i1 - i0 <= max_points:
+                return t[i0:i1], v[i0:i1]
+        for level in self.levels:
+            b0, b1, partial = level.buckets(t0, t1)
+            n = b1 - b0 + bool(partial)
+            if 2 * n <= max_points or level is self.levels[-1]:
+                t, v = level.points(b0, b1, partial)
+                if len(t) > max_points:
+                    step = -(-len(t) // max_points)
+                    t, v = t[::step], v[::step]
+                return t, v
+        return t[:0], v[:0]
+
+    def memory_usage(self):
+        total = self.raw._t.nbytes + self.raw._v.nbytes
+        for level in self.levels:
+            total += 5 * level.t_first.nbytes
+        return total
@@ -0,0 +1,203 @@
+"""Export streaming dari TelemetryStore ke CSV, xlsx atau Parquet.
+
+Data ditulis per chunk langsung dari kolom store (tanpa DataFrame), di
+worker thread dengan progress dan bisa dibatalkan. openpyxl (xlsx) dan
+pyarrow (Parquet) hanya di-import jika format tersebut dipakai.
+"""
+import csv
+import math
+import os
+import threading
+from datetime import datetime
+
+from gcs_store import COLUMN_NAMES
+
+FORMATS = ('csv', 'xlsx', 'parquet')
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    if ext == 'pq':
+        ext = 'parquet'
+    if ext not in FORMATS:
+        raise ValueError(f"Format export tidak dikenal: {path}")
+    return ext
+
+
+def _num(value):
+    # float32 -> 7 digit signifikan supaya 12.45 tidak jadi 12.449999809
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        return float('%.7g' % value)
+    return value
+
+
+class CSVWriter:
+    def __init__(self, path, status_table):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(COLUMN_NAMES)
+        self.status_table = status_table
+
+    def write_chunk(self, chunk):
+        table = self.status_table
+        fmt = '%.7g'
+        timestamps = [datetime.fromtimestamp(t).isoformat(' ', 'milliseconds')
+                      for t in chunk['timestamp']]
+
+        def floats(name):
+            return ['' if v != v else fmt % v for v in chunk[name]]
+
+        self.writer.writerows(zip(
+            timestamps, floats('altitude'), chunk['latitude'], chunk['longitude'],
+            floats('voltage'), chunk['remaining'], [table[c] for c in chunk['status']],
+            floats('rssi'), floats('snr'), chunk['cycle_time']))
+
+    def close(self):
+        self.file.close()
+
+
+class XLSXWriter:
+    def __init__(self, path, status_table):
+        from openpyxl import Workbook
+
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet('Telemetry')
+        self.sheet.append(COLUMN_NAMES)
+        self.status_table = status_table
+
+    def write_chunk(self, chunk):
+        table = self.status_table
+        append = self.sheet.append
+        columns = [chunk[name] for name in COLUMN_NAMES]
+        for row in zip(*columns):
+            row = [_num(v) for v in row]
+            row[0] = datetime.fromtimestamp(row[0])
+            row[6] = table[row[6]]
+            append(row)
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+class ParquetWriter:
+    def __init__(self, path, status_table):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.pc = pc
+        self.status_table = status_table
+        self.types = {
+            'altitude': pa.float32(), 'latitude': pa.int32(), 'longitude': pa.int32(),
+            'voltage': pa.float32(), 'remaining': pa.int16(), 'rssi': pa.float32(),
+            'snr': pa.float32(), 'cycle_time': pa.int32(),
+        }
+        fields = [pa.field('timestamp', pa.timestamp('us', tz='UTC'))]
+        for name in COLUMN_NAMES[1:]:
+            if name == 'status':
+                fields.append(pa.field(name, pa.dictionary(pa.uint16(), pa.string())))
+            else:
+                fields.append(pa.field(name, self.types[name]))
+        self.schema = pa.schema(fields)
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def _zero_copy(self, arr, pa_type):
+        return self.pa.Array.from_buffers(pa_type, len(arr), [None, self.pa.py_buffer(arr)])
+
+    def write_chunk(self, chunk):
+        pa = self.pa
+        seconds = self._zero_copy(chunk['timestamp'], pa.float64())
+        micros = self.pc.cast(self.pc.multiply(seconds, 1e6), pa.int64(), safe=False)
+        arrays = [micros.view(pa.timestamp('us', tz='UTC'))]
+        for name in COLUMN_NAMES[1:]:
+            if name == 'status':
+                indices = self._zero_copy(chunk[name], pa.uint16())
+                arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(self.status_table)))
+            else:
+                arrays.append(self._zero_copy(chunk[name], self.types[name]))
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {
+    'csv': CSVWriter,
+    'xlsx': XLSXWriter,
+    'parquet': ParquetWriter,
+}
+
+
+class ExportJob:
+    """Export satu snapshot store ke file, sync (run) atau di thread (start).
+
+    `done`/`total` bisa dibaca dari thread lain untuk progress bar.
+    """
+
+    def __init__(self, store, path, fmt=None):
+        self.store = store
+        self.path = path
+        self.fmt = fmt or detect_format(path)
+        self.snapshot = store.snapshot()
+        # Tabel status di-copy setelah snapshot: semua kode di snapshot sudah ada
+        self.status_table = list(store.status_table)
+        spilled, chunks = self.snapshot
+        self.total = spilled + sum(len(c['timestamp']) for c in chunks)
+        self.done = 0
+        self.error = None
+        self.finished = threading.Event()
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def cancelled(self):
+        return isinstance(self.error, ExportCancelled)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run_safe, daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _run_safe(self):
+        try:
+            self.run()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished.set()
+
+    def run(self):
+        writer = WRITERS[self.fmt](self.path, self.status_table)
+        try:
+            for chunk in self.store.iter_snapshot(self.snapshot):
+                if self._cancel.is_set():
+                    raise ExportCancelled(self.path)
+                writer.write_chunk(chunk)
+                self.done += len(chunk['timestamp'])
+            writer.close()
+        except BaseException:
+            try:
+                writer.close()
+            finally:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+            raise
+        return self.path
+
+    def join(self, timeout=None):
+        return self.finished.wait(timeout)
@@ -0,0 +1,179 @@
+"""Grammar bahasa filter telemetry, dipakai gcs_query dan gcs_rules.
+
+    rssi < -110 or (status != OK and not voltage >= 11.1)
+
+Perbandingan `kolom op angka` (op: < <= > >= == != = <>) atau
+`status == / != / contains teks` (teks berupa kata atau string
+berkutip), digabung dengan and / or / not dan kurung. Subclass
+FilterParser menentukan kolom yang valid, operand fungsi tambahan
+(`rate(kolom)`, `delta(kolom)`, `frame_age` di rule alarm) dan node AST
+yang dibuat, jadi query (zone map) dan rule (kode Python + NumPy) tetap
+memakai satu grammar. Modul ini tidak bergantung pada NumPy.
+"""
+import abc
+import operator
+import re
+
+OPS = {
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    '==': operator.eq, '=': operator.eq, '!=': operator.ne, '<>': operator.ne,
+}
+CANONICAL_OPS = {'=': '==', '<>': '!='}
+
+TOKEN_RE = re.compile(r'''\s*(?:
+    (?P<num>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<str>"[^"]*"|'[^']*')
+  | (?P<op><=|>=|==|!=|<>|<|>|=)
+  | (?P<paren>[()])
+  | (?P<word>[A-Za-z_][\w.]*)
+)''', re.VERBOSE)
+
+AGE_FUNCTION = 'frame_age'  # operand tanpa kolom: detik sejak frame sebelumnya
+
+
+def tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = TOKEN_RE.match(text, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Query tidak valid di posisi {pos}: {text[pos:]!r}")
+        tokens.append((m.lastgroup, m.group(m.lastgroup)))
+        pos = m.end()
+    return tokens
+
+
+class FilterParser(abc.ABC):
+    """Parser recursive-descent; subclass mengisi columns/functions dan node.
+
+    compare(func, column, op, value) menerima op yang sudah dinormalisasi
+    (== / != untuk = / <>, 'contains' untuk status); func None untuk
+    kolom biasa, column None untuk frame_age.
+    """
+
+    columns = ()
+    functions = ()
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    # --- Node (diisi subclass) ---
+
+    @abc.abstractmethod
+    def compare(self, func, column, op, value):
+        pass
+
+    @abc.abstractmethod
+    def and_(self, left, right):
+        pass
+
+    @abc.abstractmethod
+    def or_(self, left, right):
+        pass
+
+    @abc.abstractmethod
+    def not_(self, inner):
+        pass
+
+    # --- Grammar ---
+
+    def parse(self):
+        node = self._or()
+        if self.pos < len(self.tokens):
+            raise ValueError(f"Token tidak terduga {self.tokens[self.pos][1]!r} di query {self.text!r}")
+        return node
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _next(self):
+        token = self._peek()
+        if token[0] is None:
+            raise ValueError(f"Query terpotong: {self.text!r}")
+        self.pos += 1
+        return token
+
+    def _keyword(self, word):
+        kind, value = self._peek()
+        if kind == 'word' and value.lower() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def _or(self):
+        node = self._and()
+        while self._keyword('or'):
+            node = self.or_(node, self._and())
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self._keyword('and'):
+            node = self.and_(node, self._not())
+        return node
+
+    def _not(self):
+        if self._keyword('not'):
+            return self.not_(self._not())
+        return self._atom()
+
+    def _atom(self):
+        if self._peek() == ('paren', '('):
+            self.pos += 1
+            node = self._or()
+            if self._next() != ('paren', ')'):
+                raise ValueError(f"Kurung tidak seimbang di query {self.text!r}")
+            return node
+        kind, word = self._next()
+        if kind != 'word':
+            raise ValueError(f"Kolom tidak dikenal: {word!r} (pilihan: {', '.join(self.columns)})")
+        func, column = self._operand(word)
+        if column == 'status':
+            return self._status()
+        label = word if func is None or column is None else f"{func}({column})"
+        kind, op = self._next()
+        if kind != 'op':
+            raise ValueError(f"Operator diharapkan setelah {label!r}, dapat {op!r}")
+        kind, value = self._next()
+        if kind != 'num':
+            raise ValueError(f"Nilai numerik diharapkan untuk {label!r}, dapat {value!r}")
+        return self.compare(func, column, CANONICAL_OPS.get(op, op), float(value))
+
+    def _operand(self, word):
+        """Return (func, column)"""
+        if word not in self.functions:
+            self._check_column(word)
+            return None, word
+        if word == AGE_FUNCTION:
+            return word, None
+        if self._next() != ('paren', '('):
+            raise ValueError(f"'(' diharapkan setelah {word}")
+        _, column = self._next()
+        if self._next() != ('paren', ')'):
+            raise ValueError(f"Kurung tidak seimbang setelah {word}({column}")
+        if column == 'status':
+            raise ValueError(f"{word}() hanya untuk kolom numerik")
+        self._check_column(column)
+        return word, column
+
+    def _check_column(self, column):
+        if column not in self.columns:
+            raise ValueError(f"Kolom tidak dikenal: {column!r} (pilihan: {', '.join(self.columns)})")
+
+    def _status(self):
+        if self._keyword('contains'):
+            op = 'contains'
+        else:
+            kind, op = self._next()
+            op = CANONICAL_OPS.get(op, op)
+            if kind != 'op' or op not in ('==', '!='):
+                raise ValueError("status hanya mendukung ==, != dan contains")
+        kind, value = self._next()
+        if kind == 'str':
+            value = value[1:-1]
+        elif kind not in ('word', 'num'):
+            raise ValueError(f"Teks status diharapkan, dapat {value!r}")
+        return self.compare(None, 'status', op, value)
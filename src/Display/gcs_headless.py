@@ -0,0 +1,354 @@
+"""Headless ingest untuk receiver LoRa (tanpa GUI).
+
+Membaca output Receiver_5.ino dari serial port (atau file capture), parse
+dengan DataParser, simpan ke TelemetryStore dan teruskan frame sebagai
+JSON lines ke file/stdout, serta ke subscriber UDP/multicast, TCP,
+WebSocket dan MAVLink (gcs_publish). Tidak meng-import tkinter,
+customtkinter, matplotlib atau pandas.
+
+Contoh:
+    python gcs_headless.py --port /dev/ttyUSB0 --output flight.jsonl
+    python gcs_headless.py --port /dev/ttyUSB0,/dev/ttyUSB1 --record flight_logs
+    python gcs_headless.py --port /dev/ttyUSB0,tcp://10.0.0.5:4000 --output -
+    python gcs_headless.py --config headless.json --udp 127.0.0.1:14560
+    python gcs_headless.py --port COM3 --udp 239.255.42.99:14560 --serve-tcp 14561 \
+        --serve-ws 14562 --mavlink 127.0.0.1:14550
+    python gcs_headless.py --input flight_logs/flight_x.lfr --speed 10
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+
+from gcs_parser import DataParser
+from gcs_serial import SerialReader, READ_TIMEOUT
+from gcs_ingest import MultiReceiverIngest, parse_ports
+from gcs_store import TelemetryStore, DEFAULT_MAX_ROWS
+from gcs_recorder import FlightRecorder
+from gcs_replay import Replayer
+from gcs_perf import PERF
+from gcs_linkquality import LinkQuality
+from gcs_publish import TelemetryPublisher, encode_json
+from gcs_rules import RuleEngine, RuleError, RuleSet
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULTS = {
+    'port': None,
+    'baud': 115200,
+    'input': None,
+    'speed': 0.0,
+    'output': None,
+    'udp': None,
+    'udp_interface': None,
+    'serve_tcp': None,
+    'serve_ws': None,
+    'mavlink': None,
+    'record': None,
+    'record_raw': False,
+    'max_rows': DEFAULT_MAX_ROWS,
+    'stats_interval': 10.0,
+    'quiet': False,
+    'perf': False,
+    'perf_dump': None,
+    'rules': None,
+}
+
+
+def max_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KiB, macOS: bytes
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+class HeadlessIngest:
+    def __init__(self, output=None, publisher=None, max_rows=DEFAULT_MAX_ROWS, recorder=None,
+                 on_alert=None, rules=None):
+        self.parser = DataParser()
+        self.data_log = TelemetryStore(max_rows=max_rows)
+        self.link_quality = LinkQuality()
+        self.on_alert = on_alert
+        self.rule_engine = RuleEngine(rules) if rules is not None else None
+        self._link_lock = threading.Lock()  # frame dari thread ingest, check() dari stats()
+        self.recorder = recorder
+        self.output = output
+        self.publisher = publisher
+        self.reader = None
+        self.receivers = None
+        self.replayer = None
+        self._stop = threading.Event()
+        self.lines = 0
+        self.frames = 0
+        self.started = time.monotonic()
+
+    def process_received_data(self, raw_data):
+        # Mode file: satu stream, parse di sini
+        now = self.record_line(raw_data)
+        parsed_data = self.parser.parse_line(raw_data)
+        if parsed_data:
+            self.handle_frame(now, parsed_data)
+
+    def record_line(self, raw_data):
+        self.lines += 1
+        now = time.time()
+        if self.recorder:
+            self.recorder.write_raw(now, raw_data)
+        return now
+
+    def handle_frame(self, timestamp, data):
+        self.frames += 1
+        self.data_log.append(data, timestamp)
+        with self._link_lock:
+            changed = self.link_quality.add(timestamp, data)
+            rules = self.rule_engine.process(timestamp, data) if self.rule_engine else None
+        if changed and self.on_alert:
+            self.on_alert(f"link {self.link_quality.summary()}")
+        if rules:
+            self.report_rules(*rules)
+        if self.recorder:
+            self.recorder.write_frame(timestamp, data)
+        if self.output is None and self.publisher is None:
+            return
+        # Serialize sekali untuk file output dan semua subscriber
+        payload = encode_json(timestamp, data)
+        if self.output is not None:
+            self.output.write(payload)
+        if self.publisher is not None:
+            self.publisher.publish(timestamp, data, payload)
+
+    def report_rules(self, raised, cleared):
+        if not self.on_alert:
+            return
+        for alert in raised:
+            self.on_alert(f"alert {alert!r}")
+        for alert in cleared:
+            self.on_alert(f"alert cleared: {alert.rule.name}")
+
+    def run_serial(self, ports, baud):
+        # Satu atau lebih receiver; parse per link + fusion di gcs_ingest
+        self.receivers = MultiReceiverIngest(
+            ports, baud, on_frame=self.handle_frame,
+            on_line=lambda link, line: self.record_line(line))
+        try:
+            failures = self.receivers.start()
+        except IOError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return
+        for port, err in failures.items():
+            print(f"warning: cannot open {port}: {err}", file=sys.stderr)
+        try:
+            while self.receivers.running and not self._stop.wait(READ_TIMEOUT):
+                pass
+        finally:
+            self.receivers.stop()
+
+    def run_replay(self, path, speed=0.0):
+        # Capture teks atau .lfr, lewat DataParser yang sama (gcs_replay)
+        self.replayer = Replayer(path, on_frame=self.handle_frame,
+                                 on_line=self.record_line, speed=speed)
+        self.replayer.run()
+
+    def run_file(self, path):
+        self.reader = SerialReader(None, self.process_received_data)
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            while True:
+                chunk = stream.read(65536)
+                if not chunk:
+                    break
+                self.reader.feed(chunk)
+            self.reader.feed(b'\n')
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+    def stop(self):
+        self._stop.set()
+        if self.reader:
+            self.reader.stop()
+        if self.replayer:
+            self.replayer.stop()
+
+    def stats(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        stats = {
+            'elapsed': elapsed,
+            'lines': self.lines,
+            'frames': self.frames,
+            'lines_per_s': self.lines / elapsed,
+            'frames_per_s': self.frames / elapsed,
+            'stored_rows': len(self.data_log),
+            'store_bytes': self.data_log.memory_usage(),
+            'max_rss_mb': max_rss_mb(),
+        }
+        if self.reader:
+            stats['latency'] = self.reader.latency.summary()
+        if self.replayer:
+            stats['replay'] = self.replayer.stats()
+        if self.receivers:
+            stats['links'] = self.receivers.stats()['links']
+            now = time.time()
+            with self._link_lock:
+                changed = self.link_quality.check(now)
+                rules = self.rule_engine.check(now) if self.rule_engine else None
+            if changed and self.on_alert:
+                self.on_alert(f"link {self.link_quality.summary()}")
+            if rules:
+                self.report_rules(*rules)
+        if self.frames:
+            with self._link_lock:
+                stats['link_quality'] = self.link_quality.summary()
+        if self.recorder:
+            stats['recorder'] = self.recorder.stats()
+        if self.publisher:
+            stats['publish'] = self.publisher.summary()
+        if PERF.enabled:
+            stats['perf'] = PERF.summary_lines()
+        return stats
+
+
+def format_stats(stats):
+    text = (f"[{stats['elapsed']:.1f}s] lines {stats['lines']} ({stats['lines_per_s']:.1f}/s), "
+            f"frames {stats['frames']} ({stats['frames_per_s']:.2f}/s), "
+            f"stored {stats['stored_rows']}")
+    if stats['max_rss_mb'] is not None:
+        text += f", rss {stats['max_rss_mb']:.1f} MB"
+    if 'latency' in stats:
+        text += f", latency {stats['latency']}"
+    if 'replay' in stats:
+        replay = stats['replay']
+        text += (f", replay {replay['progress'] * 100:.0f}% "
+                 f"@ {replay['achieved_fps']:.1f} frames/s")
+    if 'link_quality' in stats:
+        text += f"\n  link quality: {stats['link_quality']}"
+    if 'publish' in stats:
+        text += f"\n  publish: {stats['publish']}"
+    for link in stats.get('links', ()):
+        state = "up" if link['connected'] else "down"
+        text += f"\n  {link['name']}: {state}, frames {link['frames']}, best {link['best']}"
+    for line in stats.get('perf', ()):
+        text += f"\n  perf {line}"
+    return text
+
+
+def build_arg_parser():
+    ap = argparse.ArgumentParser(description="Headless LoRa telemetry ingest")
+    ap.add_argument('--config', help='file JSON berisi opsi di bawah (flag CLI menang)')
+    ap.add_argument('--port', help='sumber receiver, mis. /dev/ttyUSB0, COM3, tcp://host:4000, '
+                    'udp://0.0.0.0:14550 atau file://capture.txt; beberapa dipisah koma')
+    ap.add_argument('--baud', type=int)
+    ap.add_argument('--input', help="replay capture teks atau flight log .lfr ('-' = stdin) "
+                    "alih-alih serial")
+    ap.add_argument('--speed', type=float,
+                    help='kecepatan replay --input: 1 = real-time, N = N kali, 0 = secepatnya')
+    ap.add_argument('--output', help="tulis frame sebagai JSON lines ('-' = stdout)")
+    ap.add_argument('--udp', help='forward frame JSON ke host:port (unicast atau multicast)')
+    ap.add_argument('--udp-interface', dest='udp_interface',
+                    help='IP interface lokal untuk --udp multicast, mis. 127.0.0.1')
+    ap.add_argument('--serve-tcp', dest='serve_tcp',
+                    help='server JSON lines untuk banyak client TCP, [host:]port')
+    ap.add_argument('--serve-ws', dest='serve_ws',
+                    help='server WebSocket JSON untuk banyak client, [host:]port')
+    ap.add_argument('--mavlink', help='re-emit GLOBAL_POSITION_INT/SYS_STATUS/STATUSTEXT '
+                    'MAVLink v1 ke UDP host:port')
+    ap.add_argument('--record', help='direktori flight log .lfr (append-only, crash-safe)')
+    ap.add_argument('--record-raw', dest='record_raw', action='store_true', default=None,
+                    help='rekam juga setiap raw line')
+    ap.add_argument('--max-rows', dest='max_rows', type=int,
+                    help='batas baris TelemetryStore di memori')
+    ap.add_argument('--stats-interval', dest='stats_interval', type=float,
+                    help='detik antar laporan throughput (0 = mati)')
+    ap.add_argument('--quiet', action='store_true', default=None)
+    ap.add_argument('--perf', action='store_true', default=None,
+                    help='aktifkan instrumentasi hot path (gcs_perf)')
+    ap.add_argument('--rules', help='file rule alarm JSON (lihat gcs_rules / alert_rules.json)')
+    ap.add_argument('--perf-dump', dest='perf_dump',
+                    help='simpan snapshot instrumentasi JSON saat selesai (implies --perf)')
+    return ap
+
+
+def load_options(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    options = dict(DEFAULTS)
+    if args.config:
+        with open(args.config) as f:
+            options.update(json.load(f))
+    options.update({k: v for k, v in vars(args).items() if v is not None and k != 'config'})
+    return options
+
+
+def main(argv=None):
+    options = load_options(argv)
+    if not options['port'] and not options['input']:
+        print("error: --port atau --input wajib diisi", file=sys.stderr)
+        return 2
+
+    rules = None
+    if options['rules']:
+        try:
+            rules = RuleSet.load(options['rules'])
+        except (RuleError, ValueError, OSError) as e:
+            print(f"error: --rules: {e}", file=sys.stderr)
+            return 2
+
+    output = None
+    if options['output'] == '-':
+        output = sys.stdout.buffer
+    elif options['output']:
+        output = open(options['output'], 'ab', buffering=1 << 16)
+
+    publisher = None
+    if any(options[name] for name in ('udp', 'serve_tcp', 'serve_ws', 'mavlink')):
+        publisher = TelemetryPublisher(udp=options['udp'], tcp=options['serve_tcp'],
+                                       ws=options['serve_ws'], mavlink=options['mavlink'],
+                                       udp_interface=options['udp_interface'])
+        publisher.start()
+
+    PERF.enabled = PERF.enabled or bool(options['perf'] or options['perf_dump'])
+    recorder = None
+    if options['record']:
+        recorder = FlightRecorder(options['record'], record_raw=options['record_raw'])
+    log = (lambda msg: None) if options['quiet'] else (lambda msg: print(msg, file=sys.stderr))
+    ingest = HeadlessIngest(output=output, publisher=publisher, max_rows=options['max_rows'],
+                            recorder=recorder,
+                            on_alert=log, rules=rules)
+
+    if options['input'] == '-':
+        target, target_args = ingest.run_file, ('-',)
+    elif options['input']:
+        target, target_args = ingest.run_replay, (options['input'], options['speed'])
+    else:
+        target, target_args = ingest.run_serial, (parse_ports(options['port']), options['baud'])
+    worker = threading.Thread(target=target, args=target_args, daemon=True)
+    worker.start()
+
+    interval = options['stats_interval']
+    try:
+        while worker.is_alive():
+            worker.join(interval if interval > 0 else None)
+            if interval > 0 and worker.is_alive():
+                log(format_stats(ingest.stats()))
+    except KeyboardInterrupt:
+        ingest.stop()
+        worker.join(READ_TIMEOUT * 2)
+    finally:
+        log(format_stats(ingest.stats()))
+        if options['perf_dump']:
+            PERF.dump(options['perf_dump'])
+        if recorder:
+            recorder.close()
+        if publisher:
+            publisher.stop()
+        if output is not None and output is not sys.stdout.buffer:
+            output.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,409 @@
+"""Ingest multi-receiver untuk ground station redundan.
+
+Setiap receiver (Receiver_5.ino di antena berbeda, lokal lewat serial
+atau remote lewat TCP/UDP, atau file replay) punya transport dan
+DataParser sendiri; semua link berjalan di satu event loop asyncio (lihat
+gcs_transport). Frame dari semua link digabung oleh FrameFusion: salinan
+dari siklus yang sama (isi telemetri identik dalam `window` detik)
+di-dedup dan yang dipilih adalah salinan dengan RSSI/SNR terbaik.
+"""
+import asyncio
+import threading
+import time
+from time import perf_counter
+
+from gcs_binary import STATUS_SIZE, AutoDecoder
+from gcs_parser import DataParser
+from gcs_perf import PERF
+from gcs_rawpacket import PacketAssembler
+from gcs_transport import DEFAULT_BAUD, open_transport, reconnect_delay
+
+STOP_TIMEOUT = 5.0
+
+# read + split + parse + callback per chunk dari transport
+FEED_PROBE = PERF.probe('ingest_feed')
+DEFAULT_FUSION_WINDOW = 0.15  # detik, < setengah siklus nominal ~500 ms
+
+# Field yang sama untuk semua receiver dalam satu siklus transmitter. Status
+# dibandingkan sepanjang STATUS_SIZE karakter: frame biner memotongnya di
+# situ, jadi link teks dan biner tetap masuk satu group
+CYCLE_KEY_FIELDS = ('altitude', 'latitude', 'longitude', 'voltage', 'remaining')
+
+
+def parse_ports(value):
+    """'COM3, tcp://host:4000' atau list -> list sumber"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [port.strip() for port in value if port.strip()]
+
+
+def _cycle_key(frame):
+    get = frame.get
+    return tuple(get(name) for name in CYCLE_KEY_FIELDS) + ((get('status') or '')[:STATUS_SIZE],)
+
+
+def _score(frame):
+    return (frame.get('rssi', float('-inf')), frame.get('snr', float('-inf')))
+
+
+class FrameFusion:
+    """Dedup frame antar link dan pilih salinan terbaik per siklus.
+
+    Frame pertama dari suatu siklus membuka group; salinan berikutnya
+    dalam `window` detik hanya mengganti kandidat jika skornya lebih baik.
+    Group dikeluarkan (on_frame) setelah window habis. Dengan window 0
+    setiap frame langsung diteruskan.
+    """
+
+    def __init__(self, on_frame, window=DEFAULT_FUSION_WINDOW):
+        self.on_frame = on_frame
+        self.window = window
+        self.frames_in = 0
+        self.frames_out = 0
+        self.duplicates = 0
+        self._groups = {}
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def add(self, link_name, timestamp, frame):
+        if self.window <= 0:
+            self.frames_in += 1
+            self.frames_out += 1
+            self.on_frame(timestamp, dict(frame, link=link_name, links=1))
+            return
+        key = _cycle_key(frame)
+        with self._cond:
+            self.frames_in += 1
+            group = self._groups.get(key)
+            if group is None:
+                self._groups[key] = [timestamp, link_name, frame, 1]
+                self._cond.notify()
+                return
+            self.duplicates += 1
+            group[3] += 1
+            if _score(frame) > _score(group[2]):
+                # Pertahankan status lengkap (teks) jika pemenangnya versi terpotong (biner)
+                status = group[2].get('status')
+                if status and len(status) > len(frame.get('status') or ''):
+                    frame = dict(frame, status=status)
+                group[1] = link_name
+                group[2] = frame
+            else:
+                status = frame.get('status')
+                if status and len(status) > len(group[2].get('status') or ''):
+                    group[2] = dict(group[2], status=status)
+
+    def flush(self, now=None, force=False):
+        """Keluarkan group yang window-nya sudah habis, urut waktu"""
+        if now is None:
+            now = time.time()
+        with self._cond:
+            ready = [(key, group) for key, group in self._groups.items()
+                     if force or group[0] + self.window <= now]
+            for key, _ in ready:
+                del self._groups[key]
+        ready.sort(key=lambda item: item[1][0])
+        for _, (timestamp, link_name, frame, copies) in ready:
+            self.frames_out += 1
+            self.on_frame(timestamp, dict(frame, link=link_name, links=copies))
+        return len(ready)
+
+    def _next_deadline(self):
+        if not self._groups:
+            return None
+        return min(group[0] for group in self._groups.values()) + self.window
+
+    def _run(self):
+        while self._running:
+            with self._cond:
+                deadline = self._next_deadline()
+                timeout = None if deadline is None else max(0.0, deadline - time.time())
+                if timeout is None or timeout > 0:
+                    self._cond.wait(timeout)
+            self.flush()
+
+    def start(self):
+        if self.window <= 0:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._running = False
+        with self._cond:
+            self._cond.notify()
+        self._thread.join()
+        self._thread = None
+        self.flush(force=True)
+
+    def stats(self):
+        return {
+            'frames_in': self.frames_in,
+            'frames_out': self.frames_out,
+            'duplicates': self.duplicates,
+            'pending': len(self._groups),
+        }
+
+
+class ReceiverLink:
+    """Satu receiver: transport + DataParser, dijalankan sebagai task asyncio"""
+
+    def __init__(self, name, transport, on_line, on_frame, on_packet=None):
+        self.name = name
+        self.transport = transport
+        self.port = transport.spec
+        self.on_line = on_line
+        self.on_frame = on_frame
+        self.on_packet = on_packet
+        self.parser = DataParser()
+        # Baris paket mentah (RAW_PACKET_OUTPUT) dirakit jadi frame di sini
+        self.assembler = PacketAssembler(self.process_packet, self.process_frame)
+        # Teks (DataParser per baris) atau frame biner, dideteksi otomatis
+        self.decoder = AutoDecoder(self.process_line, self.process_frame)
+        self.reader = self.decoder.text
+        self.task = None
+        self.connected = False
+        self.error = None
+        self.reconnects = 0
+        self.lines = 0
+        self.frames = 0
+        self.consumer_errors = 0
+        self.best = 0
+        self.last_frame_time = None
+        self.last_rssi = None
+        self.last_snr = None
+        self._rssi_sum = 0.0
+        self._rssi_count = 0
+
+    async def open(self):
+        await self.transport.open()
+        self.connected = True
+        self.error = None
+
+    async def run(self):
+        """Baca transport sampai EOF/error; transport TCP di-reconnect"""
+        transport = self.transport
+        attempt = 0
+        while True:
+            try:
+                if not self.connected:
+                    await self.open()
+                    self.reconnects += 1
+                attempt = 0
+                while True:
+                    data = await transport.read()
+                    if not data:
+                        break
+                    if PERF.enabled:
+                        start = perf_counter()
+                        self.decoder.feed(data)
+                        FEED_PROBE.record(perf_counter() - start)
+                    else:
+                        self.decoder.feed(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.error = str(e)
+                print(f"Read error ({self.name}): {e}")
+            self.connected = False
+            await transport.close()
+            if not transport.reconnect:
+                break
+            await reconnect_delay(attempt)
+            attempt += 1
+        if self.decoder.mode == 'text':
+            try:
+                self.reader.feed(b'\n')  # baris terakhir tanpa newline
+            except Exception as e:
+                print(f"Read error ({self.name}): {e}")
+            self.reader.buffer.clear()
+
+    def _dispatch(self, callback, *args):
+        # Error di consumer (recorder, store, publisher) hanya membuang
+        # frame/baris itu; link tetap membaca
+        try:
+            callback(*args)
+        except Exception as e:
+            self.consumer_errors += 1
+            print(f"Consumer error ({self.name}): {e!r}")
+
+    def process_line(self, line):
+        self.lines += 1
+        if self.on_line:
+            self._dispatch(self.on_line, self, line)
+        if self.assembler.feed_line(line):
+            return
+        frame = self.parser.parse_line(line)
+        if frame:
+            self.process_frame(frame)
+
+    def process_packet(self, timestamp, fields):
+        if self.on_packet:
+            self._dispatch(self.on_packet, self, timestamp, fields)
+
+    def process_frame(self, frame):
+        now = time.time()
+        self.frames += 1
+        self.last_frame_time = now
+        if 'rssi' in frame:
+            self.last_rssi = frame['rssi']
+            self._rssi_sum += frame['rssi']
+            self._rssi_count += 1
+        self.last_snr = frame.get('snr', self.last_snr)
+        self._dispatch(self.on_frame, self.name, now, frame)
+
+    async def close(self):
+        self.connected = False
+        await self.transport.close()
+
+    def stats(self):
+        return {
+            'name': self.name,
+            'port': self.port,
+            'connected': self.connected,
+            'lines': self.lines,
+            'frames': self.frames,
+            'best': self.best,
+            'reconnects': self.reconnects,
+            'consumer_errors': self.consumer_errors,
+            'last_frame_age': None if self.last_frame_time is None
+            else time.time() - self.last_frame_time,
+            'last_rssi': self.last_rssi,
+            'avg_rssi': self._rssi_sum / self._rssi_count if self._rssi_count else None,
+            'last_snr': self.last_snr,
+            'error': self.error,
+            'latency': self.reader.latency.summary(),
+            'format': self.decoder.stats(),
+            'packets': self.assembler.stats() if self.assembler.packets else None,
+        }
+
+
+class MultiReceiverIngest:
+    """Jalankan N link di satu event loop dan keluarkan satu stream frame terfusi.
+
+    `sources` berisi string sumber (lihat gcs_transport.open_transport) atau
+    objek Transport. Dipakai dari kode sync lewat start()/stop() (event loop
+    di thread sendiri), atau dari kode asyncio lewat `await serve()`.
+
+    on_frame(timestamp, frame) dipanggil dari thread ingest (bukan Tk
+    thread); frame berisi field tambahan 'link' (receiver terbaik) dan
+    'links' (jumlah receiver yang menerima siklus itu).
+    on_line(link, line) opsional untuk raw console / recorder.
+    on_packet(link, timestamp, fields) opsional: update parsial per paket
+    LoRa dari receiver mode raw packet (lihat gcs_rawpacket), tanpa fusion.
+    """
+
+    def __init__(self, sources, baud=DEFAULT_BAUD, on_frame=None, on_line=None,
+                 window=DEFAULT_FUSION_WINDOW, on_packet=None):
+        self.on_frame = on_frame
+        if len(sources) < 2:
+            window = 0  # satu link: tidak perlu menunggu salinan lain
+        self.fusion = FrameFusion(self._emit, window)
+        transports = [open_transport(source, baud) for source in sources]
+        self.links = [ReceiverLink(t.spec, t, on_line, self.fusion.add, on_packet)
+                      for t in transports]
+        self._by_name = {link.name: link for link in self.links}
+        self._loop = None
+        self._thread = None
+
+    def _emit(self, timestamp, frame):
+        link = self._by_name.get(frame.get('link'))
+        if link is not None:
+            link.best += 1
+        if self.on_frame:
+            # Dipanggil dari link atau thread FrameFusion; keduanya harus tetap jalan
+            try:
+                self.on_frame(timestamp, frame)
+            except Exception as e:
+                if link is not None:
+                    link.consumer_errors += 1
+                print(f"Consumer error ({frame.get('link')}): {e!r}")
+
+    async def open_links(self):
+        """Buka semua link dan mulai task-nya; return dict port -> error.
+
+        Link yang bisa reconnect (TCP) tetap dijalankan walau gagal dibuka.
+        Raise jika tidak ada satu pun link yang bisa jalan.
+        """
+        links = self.links
+        results = await asyncio.gather(*(link.open() for link in links),
+                                       return_exceptions=True)
+        failures = {}
+        for link, result in zip(links, results):
+            if isinstance(result, BaseException):
+                failures[link.port] = link.error = str(result)
+                await link.transport.close()
+                if not link.transport.reconnect:
+                    continue
+            link.task = asyncio.ensure_future(link.run())
+        if not any(link.task for link in links):
+            raise IOError("; ".join(f"{port}: {err}" for port, err in failures.items()))
+        self.fusion.start()
+        return failures
+
+    async def close_links(self):
+        tasks = [link.task for link in self.links if link.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for link in self.links:
+            link.task = None
+            await link.close()
+        self.fusion.stop()
+
+    async def serve(self):
+        """Jalankan sampai semua link selesai (EOF) atau task di-cancel"""
+        await self.open_links()
+        try:
+            await asyncio.gather(*(link.task for link in self.links if link.task))
+        finally:
+            await self.close_links()
+
+    def start(self):
+        """Jalankan event loop di thread background; return dict port -> error"""
+        loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=loop.run_forever, name="ingest-loop", daemon=True)
+        self._thread.start()
+        self._loop = loop
+        try:
+            return asyncio.run_coroutine_threadsafe(self.open_links(), loop).result()
+        except BaseException:
+            self._stop_loop()
+            raise
+
+    def stop(self):
+        if self._loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self.close_links(), self._loop)
+        try:
+            future.result(STOP_TIMEOUT)
+        finally:
+            self._stop_loop()
+
+    def _stop_loop(self):
+        loop = self._loop
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(STOP_TIMEOUT)
+        loop.close()
+        self._loop = None
+        self._thread = None
+
+    @property
+    def connected(self):
+        return any(link.connected for link in self.links)
+
+    @property
+    def running(self):
+        return any(link.task and not link.task.done() for link in self.links)
+
+    def stats(self):
+        return {
+            'links': [link.stats() for link in self.links],
+            'fusion': self.fusion.stats(),
+        }
@@ -0,0 +1,374 @@
+"""Analitik kualitas link LoRa dari frame (siklus) yang diterima GCS.
+
+Receiver_5.ino hanya mencetak blok UAV DATA untuk siklus yang lengkap;
+siklus yang dibuang (sequence error / timeout 2 s) tidak pernah muncul.
+LinkQuality menebak siklus yang hilang dari jarak antar frame terhadap
+siklus nominal (5 paket x 100 ms = ~500 ms), menjaga statistik rolling
+RSSI/SNR/cycle time yang update-nya O(1) per frame, menghitung link
+margin terhadap sensitivitas SF10 / BW 62.5 kHz, dan menaikkan level
+alert ("degrading" / "critical") jika margin, tren margin atau packet
+loss mengarah ke batas. Cukup murah untuk dipanggil per frame di Tk thread.
+
+    quality = LinkQuality()
+    changed = quality.add(timestamp, frame)   # level baru jika berubah
+    quality.check(time.time())                # per UI tick: deteksi link hilang
+    quality.snapshot()
+"""
+import math
+from collections import deque
+
+NOMINAL_CYCLE = 0.5         # detik, 5 paket @ 100 ms
+SENSITIVITY_DBM = -137.0    # SF10, BW 62.5 kHz
+SNR_FLOOR_DB = -15.0        # batas demodulasi SF10
+LINK_LOST_SECONDS = 2.0     # sama dengan timeout receiver
+
+WINDOW_FRAMES = 120         # ~1 menit siklus untuk mean/percentile/tren
+LOSS_WINDOW = 60.0          # detik untuk packet loss rolling
+EWMA_FAST_TAU = 5.0         # detik
+EWMA_SLOW_TAU = 60.0
+RESYNC_UPDATES = 10000      # hitung ulang running sum untuk buang drift float
+
+MARGIN_WARN_DB = 10.0
+MARGIN_CRITICAL_DB = 5.0
+LOSS_WARN = 0.10
+LOSS_CRITICAL = 0.30
+PREDICT_HORIZON = 300.0     # detik: alert jika margin diprediksi kritis dalam waktu ini
+MIN_LOSS_CYCLES = 20        # siklus minimum di window sebelum loss dinilai
+MIN_TREND_FRAMES = 20
+MIN_TREND_SPAN = 10.0       # detik
+RECOVER_SECONDS = 5.0       # level turun hanya setelah kondisi aman selama ini
+
+LEVEL_OK = 'ok'
+LEVEL_DEGRADING = 'degrading'
+LEVEL_CRITICAL = 'critical'
+SEVERITY = {LEVEL_OK: 0, LEVEL_DEGRADING: 1, LEVEL_CRITICAL: 2}
+
+
+class Ewma:
+    """EWMA dengan konstanta waktu (bukan per sampel), tahan jarak frame tidak rata"""
+
+    __slots__ = ('tau', 'value', '_last')
+
+    def __init__(self, tau):
+        self.tau = tau
+        self.value = None
+        self._last = None
+
+    def update(self, t, value):
+        if self.value is None:
+            self.value = value
+        else:
+            alpha = 1.0 - math.exp(-max(t - self._last, 0.0) / self.tau)
+            self.value += alpha * (value - self.value)
+        self._last = t
+        return self.value
+
+    def reset(self):
+        self.value = None
+        self._last = None
+
+
+class RollingStats:
+    """Window N sampel terakhir: mean/std, percentile (histogram) dan slope.
+
+    add() O(1): running sum, histogram bucket tetap (percentile dengan
+    resolusi `bucket`) dan sum regresi linear nilai terhadap waktu.
+    """
+
+    def __init__(self, size, lo, hi, bucket):
+        self.size = size
+        self.lo = lo
+        self.bucket = bucket
+        self.counts = [0] * (int(math.ceil((hi - lo) / bucket)) + 1)
+        self.samples = deque()
+        self._origin = None
+        self._updates = 0
+        self._sums = [0.0] * 6  # n, y, yy, x, xx, xy
+
+    def __len__(self):
+        return len(self.samples)
+
+    def _bin(self, value):
+        i = int((value - self.lo) / self.bucket)
+        return min(max(i, 0), len(self.counts) - 1)
+
+    def _accumulate(self, x, y, sign):
+        s = self._sums
+        s[0] += sign
+        s[1] += sign * y
+        s[2] += sign * y * y
+        s[3] += sign * x
+        s[4] += sign * x * x
+        s[5] += sign * x * y
+
+    def add(self, t, value):
+        if self._origin is None:
+            self._origin = t
+        x = t - self._origin
+        samples = self.samples
+        if len(samples) == self.size:
+            old_x, old_value, old_bin = samples.popleft()
+            self.counts[old_bin] -= 1
+            self._accumulate(old_x, old_value, -1)
+        b = self._bin(value)
+        samples.append((x, value, b))
+        self.counts[b] += 1
+        self._accumulate(x, value, 1)
+        self._updates += 1
+        if self._updates % RESYNC_UPDATES == 0:
+            self._sums = [0.0] * 6
+            for sx, sy, _ in samples:
+                self._accumulate(sx, sy, 1)
+
+    def clear(self):
+        self.counts = [0] * len(self.counts)
+        self.samples.clear()
+        self._origin = None
+        self._sums = [0.0] * 6
+
+    @property
+    def last(self):
+        return self.samples[-1][1] if self.samples else None
+
+    def mean(self):
+        n = self._sums[0]
+        return self._sums[1] / n if n else None
+
+    def std(self):
+        n, sy, syy = self._sums[:3]
+        if not n:
+            return None
+        return math.sqrt(max(syy / n - (sy / n) ** 2, 0.0))
+
+    def percentile(self, pct):
+        """Nilai tengah bucket yang memuat persentil `pct`"""
+        n = len(self.samples)
+        if not n:
+            return None
+        target = pct / 100.0 * n
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return self.lo + (i + 0.5) * self.bucket
+        return self.samples[-1][1]
+
+    def span(self):
+        return self.samples[-1][0] - self.samples[0][0] if self.samples else 0.0
+
+    def slope(self):
+        """Perubahan per detik (least squares atas window)"""
+        n, sy, _, sx, sxx, sxy = self._sums
+        denom = n * sxx - sx * sx
+        if n < 2 or denom <= 0:
+            return None
+        return (n * sxy - sx * sy) / denom
+
+
+def _finite(value):
+    return value is not None and value == value and not math.isinf(value)
+
+
+class LinkQuality:
+    def __init__(self, nominal_cycle=NOMINAL_CYCLE, window=WINDOW_FRAMES, loss_window=LOSS_WINDOW,
+                 sensitivity=SENSITIVITY_DBM, snr_floor=SNR_FLOOR_DB):
+        self.nominal_cycle = nominal_cycle
+        self.loss_window = loss_window
+        self.sensitivity = sensitivity
+        self.snr_floor = snr_floor
+        self.rssi = RollingStats(window, lo=-160.0, hi=0.0, bucket=0.5)
+        self.snr = RollingStats(window, lo=-30.0, hi=20.0, bucket=0.25)
+        self.cycle = RollingStats(window, lo=0.0, hi=5000.0, bucket=10.0)  # ms
+        self.rssi_fast = Ewma(EWMA_FAST_TAU)
+        self.rssi_slow = Ewma(EWMA_SLOW_TAU)
+        self.snr_fast = Ewma(EWMA_FAST_TAU)
+        self._loss = deque()  # (timestamp, missed) per frame dalam loss_window
+        self.clear()
+
+    def clear(self):
+        for stats in (self.rssi, self.snr, self.cycle):
+            stats.clear()
+        for ewma in (self.rssi_fast, self.rssi_slow, self.snr_fast):
+            ewma.reset()
+        self._loss.clear()
+        self._loss_missed = 0
+        self.frames = 0
+        self.missed = 0
+        self.outages = 0
+        self.last_time = None
+        self.level = LEVEL_OK
+        self.reasons = []
+        self.alerts = 0
+        self._clear_since = None
+
+    # --- Update ---
+
+    def add(self, timestamp, data):
+        """Catat satu frame; return level baru jika berubah, selain itu None"""
+        missed = 0
+        if self.last_time is not None:
+            gap = timestamp - self.last_time
+            missed = max(0, int(round(gap / self.nominal_cycle)) - 1)
+            if gap >= LINK_LOST_SECONDS:
+                self.outages += 1
+        self.last_time = timestamp
+        self.frames += 1
+        self.missed += missed
+
+        self._loss.append((timestamp, missed))
+        self._loss_missed += missed
+        self._trim_loss(timestamp)
+
+        rssi = data.get('rssi')
+        if _finite(rssi):
+            self.rssi.add(timestamp, rssi)
+            self.rssi_fast.update(timestamp, rssi)
+            self.rssi_slow.update(timestamp, rssi)
+        snr = data.get('snr')
+        if _finite(snr):
+            self.snr.add(timestamp, snr)
+            self.snr_fast.update(timestamp, snr)
+        cycle_time = data.get('cycle_time')
+        if cycle_time:
+            self.cycle.add(timestamp, cycle_time)
+        return self._evaluate(timestamp)
+
+    def check(self, now):
+        """Evaluasi ulang tanpa frame baru (link hilang terdeteksi di sini)"""
+        self._trim_loss(now)
+        return self._evaluate(now)
+
+    def _trim_loss(self, now):
+        loss = self._loss
+        limit = now - self.loss_window
+        while loss and loss[0][0] < limit:
+            self._loss_missed -= loss.popleft()[1]
+
+    # --- Metrik turunan ---
+
+    @property
+    def loss_rate(self):
+        """Perkiraan fraksi siklus hilang dalam loss_window"""
+        received = len(self._loss)
+        total = received + self._loss_missed
+        return self._loss_missed / total if total else 0.0
+
+    @property
+    def rssi_margin(self):
+        value = self.rssi_fast.value
+        return None if value is None else value - self.sensitivity
+
+    @property
+    def snr_margin(self):
+        value = self.snr_fast.value
+        return None if value is None else value - self.snr_floor
+
+    @property
+    def margin(self):
+        """Margin efektif (dB): yang terkecil dari margin RSSI dan SNR"""
+        margins = [m for m in (self.rssi_margin, self.snr_margin) if m is not None]
+        return min(margins) if margins else None
+
+    @property
+    def rssi_trend(self):
+        """dB per menit, None jika window belum cukup"""
+        if len(self.rssi) < MIN_TREND_FRAMES or self.rssi.span() < MIN_TREND_SPAN:
+            return None
+        slope = self.rssi.slope()
+        return None if slope is None else slope * 60.0
+
+    def time_to_critical(self):
+        """Detik sampai margin RSSI menyentuh MARGIN_CRITICAL_DB jika tren berlanjut"""
+        trend, margin = self.rssi_trend, self.rssi_margin
+        if trend is None or margin is None or trend >= 0:
+            return None
+        return max(margin - MARGIN_CRITICAL_DB, 0.0) / (-trend / 60.0)
+
+    def _evaluate(self, now):
+        level = LEVEL_OK
+        reasons = []
+
+        def raise_to(new_level, reason):
+            nonlocal level
+            if SEVERITY[new_level] > SEVERITY[level]:
+                level = new_level
+            reasons.append(reason)
+
+        if self.last_time is not None and now - self.last_time > LINK_LOST_SECONDS:
+            raise_to(LEVEL_CRITICAL, f"no frame for {now - self.last_time:.0f}s")
+        margin = self.margin
+        if margin is not None:
+            if margin < MARGIN_CRITICAL_DB:
+                raise_to(LEVEL_CRITICAL, f"margin {margin:.1f} dB")
+            elif margin < MARGIN_WARN_DB:
+                raise_to(LEVEL_DEGRADING, f"margin {margin:.1f} dB")
+        eta = self.time_to_critical()
+        if eta is not None and eta < PREDICT_HORIZON and (margin is None or margin >= MARGIN_CRITICAL_DB):
+            raise_to(LEVEL_DEGRADING, f"RSSI {self.rssi_trend:+.1f} dB/min, critical in ~{eta:.0f}s")
+        loss = self.loss_rate
+        if len(self._loss) + self._loss_missed < MIN_LOSS_CYCLES:
+            loss = 0.0  # terlalu sedikit siklus, satu drop = 10%+
+        if loss >= LOSS_CRITICAL:
+            raise_to(LEVEL_CRITICAL, f"loss {loss * 100:.0f}%")
+        elif loss >= LOSS_WARN:
+            raise_to(LEVEL_DEGRADING, f"loss {loss * 100:.0f}%")
+
+        # Naik level langsung, turun level setelah aman RECOVER_SECONDS (anti flapping)
+        if SEVERITY[level] < SEVERITY[self.level]:
+            if self._clear_since is None:
+                self._clear_since = now
+            if now - self._clear_since < RECOVER_SECONDS:
+                return None
+        self._clear_since = None
+        self.reasons = reasons
+        if level == self.level:
+            return None
+        if SEVERITY[level] > SEVERITY[self.level]:
+            self.alerts += 1
+        self.level = level
+        return level
+
+    # --- Laporan ---
+
+    def snapshot(self):
+        def window(stats, *pcts):
+            data = {'mean': stats.mean(), 'std': stats.std()}
+            for pct in pcts:
+                data[f'p{pct}'] = stats.percentile(pct)
+            return data
+
+        rssi = window(self.rssi, 10, 50, 90)
+        rssi.update(ewma_fast=self.rssi_fast.value, ewma_slow=self.rssi_slow.value,
+                    trend_db_per_min=self.rssi_trend)
+        snr = window(self.snr, 10, 50, 90)
+        snr['ewma'] = self.snr_fast.value
+        return {
+            'level': self.level,
+            'reasons': list(self.reasons),
+            'alerts': self.alerts,
+            'frames': self.frames,
+            'missed': self.missed,
+            'loss_rate': self.loss_rate,
+            'loss_total': self.missed / (self.frames + self.missed) if self.frames else 0.0,
+            'outages': self.outages,
+            'margin': self.margin,
+            'rssi_margin': self.rssi_margin,
+            'snr_margin': self.snr_margin,
+            'time_to_critical': self.time_to_critical(),
+            'rssi': rssi,
+            'snr': snr,
+            'cycle_ms': window(self.cycle, 50, 95),
+        }
+
+    def summary(self):
+        margin = self.margin
+        trend = self.rssi_trend
+        text = (f"{self.level.upper()}, loss {self.loss_rate * 100:.1f}% "
+                f"({self.missed} missed / {self.frames} frames)")
+        if margin is not None:
+            text += f", margin {margin:.1f} dB"
+        if trend is not None:
+            text += f", RSSI trend {trend:+.1f} dB/min"
+        if self.reasons:
+            text += f" [{'; '.join(self.reasons)}]"
+        return text
@@ -0,0 +1,108 @@
+from tkinter import ttk
+
+ROW_HEIGHT = 20       # default rowheight ttk.Treeview
+HEADER_HEIGHT = 25
+
+
+class VirtualLogView:
+    """Treeview tervirtualisasi di atas TelemetryStore.
+
+    Widget hanya berisi baris yang terlihat; item-item itu dipakai ulang
+    dan isinya diganti saat scroll atau saat ada data baru, jadi biaya
+    refresh tidak bergantung pada jumlah baris di store.
+    """
+
+    def __init__(self, parent, store, columns, formatter, visible_rows=15):
+        self.store = store
+        self.formatter = formatter
+        self.visible_rows = visible_rows
+        self.top = 0
+        self.follow = True  # auto-scroll ke baris terbaru
+        self._items = []
+        self._rendered = None
+
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", height=visible_rows)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100)
+
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._on_scroll)
+
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll_rows(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_rows(3))
+        self.tree.bind('<Configure>', self._on_resize)
+
+    def pack(self):
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+    def refresh(self, force=False):
+        """Render window yang terlihat; dipanggil sekali per UI tick"""
+        total = len(self.store)
+        visible = self.visible_rows
+        if self.follow:
+            self.top = max(0, total - visible)
+        else:
+            self.top = max(0, min(self.top, total - visible))
+
+        state = (self.top, total, visible)
+        if state == self._rendered and not force:
+            return
+        self._rendered = state
+
+        count = min(visible, total - self.top)
+        self._resize_items(count)
+        store = self.store
+        formatter = self.formatter
+        for offset, iid in enumerate(self._items):
+            self.tree.item(iid, values=formatter(store.row(self.top + offset)))
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _resize_items(self, count):
+        items = self._items
+        while len(items) < count:
+            items.append(self.tree.insert("", "end", values=()))
+        if len(items) > count:
+            self.tree.delete(*items[count:])
+            del items[count:]
+
+    def clear(self):
+        if self._items:
+            self.tree.delete(*self._items)
+        self._items = []
+        self.top = 0
+        self.follow = True
+        self._rendered = None
+        self.scrollbar.set(0.0, 1.0)
+
+    def scroll_rows(self, delta):
+        self.set_top(self.top + delta)
+
+    def set_top(self, top):
+        total = len(self.store)
+        self.top = max(0, min(int(top), total - self.visible_rows))
+        self.follow = self.top + self.visible_rows >= total
+        self.refresh()
+
+    def _on_scroll(self, action, *args):
+        if action == 'moveto':
+            self.set_top(float(args[0]) * len(self.store))
+        elif action == 'scroll':
+            amount, unit = int(args[0]), args[1]
+            step = self.visible_rows if unit == 'pages' else 1
+            self.scroll_rows(amount * step)
+
+    def _on_wheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_resize(self, event):
+        rows = max(1, (event.height - HEADER_HEIGHT) // ROW_HEIGHT)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.refresh()
@@ -1,18 +1,84 @@
-import serial
-import serial.tools.list_ports
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import pandas as pd
 from datetime import datetime
 import threading
 import time
-import json
-import os
-from gcs_parser import DataParser  # Import parser kita
+from gcs_store import TelemetryStore
+from gcs_queue import BoundedQueue
+from gcs_ingest import MultiReceiverIngest, parse_ports
+from gcs_recorder import FlightRecorder
+from gcs_export import ExportJob
+from gcs_logview import VirtualLogView
+from gcs_console import RawConsole, FILTERS
+from gcs_replay import Replayer
+from gcs_perf import PERF, timed
+from gcs_perfview import PerfPanel
+from gcs_linkquality import LinkQuality
+from gcs_publish import TelemetryPublisher
+from gcs_parser import to_degrees
+from gcs_rules import RuleEngine, RuleError, RuleSet, DEFAULT_RULES, load_rules, format_episode
+
+# serial, matplotlib, numpy dan pandas di-import saat pertama dipakai
+# supaya window muncul secepat mungkin (lihat benchmarks/bench_startup.py)
+
+# Pilihan window chart: label -> (points, seconds)
+CHART_WINDOWS = {
+    "50 pts": (50, None),
+    "500 pts": (500, None),
+    "1 min": (None, 60.0),
+    "10 min": (None, 600.0),
+    "Full flight": (None, None),
+}
+CHART_WINDOW = "50 pts"
+CHART_BUILD_DELAY_MS = 100
+RAW_CONSOLE_LINES = 1000     # scrollback raw console, maks 100k
+
+# Flight recorder (append-only, lihat gcs_recorder)
+FLIGHT_LOG_DIR = "flight_logs"
+RECORD_RAW_LINES = False
+
+# Reader thread -> Tk thread
+UI_INTERVAL_MS = 50          # 20 Hz UI refresh
+FRAME_QUEUE_SIZE = 5000
+RAW_QUEUE_SIZE = 2000
+MAX_FRAMES_PER_TICK = 500
+MAX_RAW_PER_TICK = 200
+# Update parsial per paket LoRa (RAW_PACKET_OUTPUT, lihat gcs_rawpacket)
+PACKET_QUEUE_SIZE = 2000
+MAX_PACKETS_PER_TICK = 500
+FIELD_AGE_TICKS = 5
+
+# Replay capture / flight log (lihat gcs_replay); 0 = secepatnya
+REPLAY_SPEEDS = {"1x": 1.0, "2x": 2.0, "10x": 10.0, "100x": 100.0, "Max": 0.0}
+REPLAY_SPEED = "1x"
+REPLAY_MAX_BACKLOG = 2 * MAX_FRAMES_PER_TICK
+
+# Analitik link (lihat gcs_linkquality); cek link hilang tiap N UI tick
+LINK_CHECK_TICKS = 10
+LINK_LEVEL_COLORS = {"ok": "green", "degrading": "orange", "critical": "red"}
+FIELD_AGE_NAMES = (("altitude", "ALT"), ("latitude", "LAT"), ("longitude", "LON"),
+                   ("voltage", "BATT"), ("status", "ST"), ("rssi", "RSSI"))
+
+# Rule alarm operator (lihat gcs_rules); alarm critical berbunyi ulang tiap N tick
+ALERT_RULES = "alert_rules.json"
+ALERT_REPEAT_TICKS = 20
+MAX_ALERT_LINES = 4
+ALERT_COLORS = {"info": "gray", "warning": "orange", "critical": "red"}
+
+# Tile peta offline: folder {z}/{x}/{y}.png atau file .mbtiles (lihat gcs_map)
+MAP_TILES = "map_tiles"
+
+# Fan-out frame ke subscriber lokal (lihat gcs_publish); None = nonaktif
+PUBLISH_UDP = "239.255.42.99:14560"
+PUBLISH_UDP_INTERFACE = None
+PUBLISH_TCP = "127.0.0.1:14561"
+PUBLISH_WS = "127.0.0.1:14562"
+PUBLISH_MAVLINK = "127.0.0.1:14550"
+
+# Tab Performance (lihat gcs_perf), refresh tiap N UI tick
+PERF_REFRESH_TICKS = 10
+PERF_DUMP_DIR = "perf_dumps"
 
 # Set theme
 ctk.set_appearance_mode("Dark")
@@ -27,17 +93,42 @@ class UAVGCSApp(ctk.CTk):
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         
         # Data storage
-        self.data_log = []
+        self.data_log = TelemetryStore()
+        self.link_quality = LinkQuality()
+        self.rule_engine, rules_error = self.load_alert_rules()
+        self._review = None
         self.connected = False
-        self.ser = None
-        self.parser = DataParser()  # Initialize parser
+        self.ingest = None
+        self.multi_link = False
+        self.recorder = None
+        self.publisher = None
+        self.export_job = None
+        self.replayer = None
+        self._pending_replay = None
+        self.charts = None
+        self.map_panel = None
+        self._detected_ports = None
         self.logging_active = False
         
+        # Queue dari reader thread, di-drain oleh ui_tick di Tk thread
+        self.frame_queue = BoundedQueue(FRAME_QUEUE_SIZE)
+        self.raw_queue = BoundedQueue(RAW_QUEUE_SIZE)
+        self.packet_queue = BoundedQueue(PACKET_QUEUE_SIZE)
+        self.field_times = {}
+        self.frame_age = PERF.probe('frame_age')
+        self._tick_count = 0
+        self.register_perf_gauges()
+        
         # Setup GUI
         self.setup_gui()
         
         # Auto-detect port
         self.auto_detect_port()
+        if rules_error:
+            messagebox.showwarning("Alert Rules", f"{rules_error}\nUsing default rules.")
+        
+        # UI scheduler
+        self._ui_job = self.after(UI_INTERVAL_MS, self.ui_tick)
     
     def setup_gui(self):
         # Main frame
@@ -70,20 +161,46 @@ class UAVGCSApp(ctk.CTk):
                     font=ctk.CTkFont(weight="bold")).pack(pady=5)
         
         self.port_var = ctk.StringVar(value="COM3")
-        port_combo = ctk.CTkComboBox(conn_frame, values=self.get_serial_ports(),
-                                   variable=self.port_var)
-        port_combo.pack(fill="x", pady=5)
+        self.port_combo = ctk.CTkComboBox(conn_frame, values=[],
+                                        variable=self.port_var)
+        self.port_combo.pack(fill="x", pady=5)
         
         self.connect_btn = ctk.CTkButton(conn_frame, text="Connect", 
                                        command=self.toggle_connection)
         self.connect_btn.pack(fill="x", pady=5)
         
+        self.replay_btn = ctk.CTkButton(conn_frame, text="Replay Log...", 
+                                      command=self.toggle_replay)
+        self.replay_btn.pack(fill="x", pady=5)
+        
+        # Kontrol replay, hanya tampil saat replay berjalan
+        self.replay_frame = ctk.CTkFrame(conn_frame)
+        self.replay_pause_btn = ctk.CTkButton(self.replay_frame, text="Pause", width=70,
+                                            command=self.toggle_replay_pause)
+        self.replay_pause_btn.grid(row=0, column=0, padx=2, pady=2)
+        self.replay_speed_var = ctk.StringVar(value=REPLAY_SPEED)
+        ctk.CTkOptionMenu(self.replay_frame, values=list(REPLAY_SPEEDS), width=80,
+                         variable=self.replay_speed_var,
+                         command=lambda name: self.replayer and self.replayer.set_speed(REPLAY_SPEEDS[name])
+                         ).grid(row=0, column=1, padx=2, pady=2)
+        self.replay_slider = ctk.CTkSlider(self.replay_frame, from_=0, to=1,
+                                         command=lambda value: self.replayer and self.replayer.seek_fraction(value))
+        self.replay_slider.grid(row=1, column=0, columnspan=2, sticky="ew", padx=2)
+        self.replay_label = ctk.CTkLabel(self.replay_frame, text="", font=ctk.CTkFont(size=11))
+        self.replay_label.grid(row=2, column=0, columnspan=2)
+        
         # Status indicators
         self.setup_status_indicators(parent)
         
         # Data display
         self.setup_data_display(parent)
         
+        # Link quality
+        self.setup_link_quality(parent)
+        
+        # Alarm dari rule engine
+        self.setup_alerts(parent)
+        
         # Controls
         self.setup_controls(parent)
     
@@ -145,11 +262,60 @@ class UAVGCSApp(ctk.CTk):
                                      font=ctk.CTkFont(size=14))
         self.snr_label.pack(pady=3)
         
+        # Umur nilai terakhir per field (per paket pada mode raw packet)
+        self.field_age_label = ctk.CTkLabel(data_frame, text="Age: --", 
+                                           text_color="gray", font=ctk.CTkFont(size=11))
+        self.field_age_label.pack(pady=3)
+        
         # Raw data display untuk debugging
         self.raw_label = ctk.CTkLabel(data_frame, text="Raw: --", 
                                      text_color="gray", font=ctk.CTkFont(size=10))
         self.raw_label.pack(pady=5)
     
+    def setup_link_quality(self, parent):
+        link_frame = ctk.CTkFrame(parent)
+        link_frame.pack(fill="x", padx=10, pady=10)
+        
+        ctk.CTkLabel(link_frame, text="Link Quality", 
+                    font=ctk.CTkFont(weight="bold")).pack(pady=5)
+        
+        self.link_level_label = ctk.CTkLabel(link_frame, text="Link: --", 
+                                           font=ctk.CTkFont(size=14, weight="bold"))
+        self.link_level_label.pack(pady=2)
+        
+        self.link_loss_label = ctk.CTkLabel(link_frame, text="Loss: --")
+        self.link_loss_label.pack(pady=2)
+        
+        self.link_margin_label = ctk.CTkLabel(link_frame, text="Margin: --")
+        self.link_margin_label.pack(pady=2)
+        
+        self.link_stats_label = ctk.CTkLabel(link_frame, text="", text_color="gray",
+                                           font=ctk.CTkFont(size=11), wraplength=300)
+        self.link_stats_label.pack(pady=2)
+    
+    def setup_alerts(self, parent):
+        alert_frame = ctk.CTkFrame(parent)
+        alert_frame.pack(fill="x", padx=10, pady=10)
+        
+        self.alert_title = ctk.CTkLabel(alert_frame, text=f"Alerts ({len(self.rule_engine.ruleset)} rules)", 
+                                      font=ctk.CTkFont(weight="bold"))
+        self.alert_title.pack(pady=5)
+        self._alert_title_color = self.alert_title.cget("text_color")
+        
+        self.alert_label = ctk.CTkLabel(alert_frame, text="No active alerts", justify="left",
+                                      wraplength=300)
+        self.alert_label.pack(pady=2)
+        
+        buttons = ctk.CTkFrame(alert_frame, fg_color="transparent")
+        buttons.pack(fill="x", pady=2)
+        ctk.CTkButton(buttons, text="Ack", width=60, 
+                     command=self.acknowledge_alerts).pack(side="left", expand=True, padx=2)
+        ctk.CTkButton(buttons, text="Reload Rules", width=90, 
+                     command=self.reload_alert_rules).pack(side="left", expand=True, padx=2)
+        self.review_btn = ctk.CTkButton(buttons, text="Review Log", width=90, 
+                                      command=self.review_alerts)
+        self.review_btn.pack(side="left", expand=True, padx=2)
+    
     def setup_controls(self, parent):
         control_frame = ctk.CTkFrame(parent)
         control_frame.pack(fill="x", padx=10, pady=10)
@@ -161,14 +327,30 @@ class UAVGCSApp(ctk.CTk):
                                    command=self.toggle_logging)
         self.log_btn.pack(fill="x", pady=5)
         
-        export_btn = ctk.CTkButton(control_frame, text="Export to Excel", 
-                                 command=self.export_data)
-        export_btn.pack(fill="x", pady=5)
+        self.export_btn = ctk.CTkButton(control_frame, text="Export Data", 
+                                      command=self.export_data)
+        self.export_btn.pack(fill="x", pady=5)
+        
+        # Progress export, hanya tampil saat export berjalan
+        self.export_progress = ctk.CTkProgressBar(control_frame)
+        self.export_progress.set(0)
         
         clear_btn = ctk.CTkButton(control_frame, text="Clear Data", 
                                 command=self.clear_data)
         clear_btn.pack(fill="x", pady=5)
         
+        # Panjang window chart
+        self.window_var = ctk.StringVar(value=CHART_WINDOW)
+        window_menu = ctk.CTkOptionMenu(control_frame, values=list(CHART_WINDOWS),
+                                      variable=self.window_var,
+                                      command=self.set_chart_window)
+        window_menu.pack(fill="x", pady=5)
+        
+        # Bagikan frame ke mission planner / layar operator lain
+        self.publish_var = ctk.BooleanVar(value=False)
+        ctk.CTkSwitch(control_frame, text="Publish Telemetry", variable=self.publish_var,
+                      command=self.toggle_publish).pack(fill="x", pady=5)
+        
         # Debug button
         debug_btn = ctk.CTkButton(control_frame, text="Debug Info", 
                                 command=self.show_debug_info)
@@ -183,8 +365,8 @@ class UAVGCSApp(ctk.CTk):
         telemetry_frame = ctk.CTkFrame(self.notebook)
         self.notebook.add(telemetry_frame, text="Telemetry Charts")
         
-        # Charts
-        self.setup_charts(telemetry_frame)
+        # Charts dibangun setelah window tampil
+        self.after(CHART_BUILD_DELAY_MS, lambda: self.setup_charts(telemetry_frame))
         
         # Data tab
         data_frame = ctk.CTkFrame(self.notebook)
@@ -195,8 +377,27 @@ class UAVGCSApp(ctk.CTk):
         raw_frame = ctk.CTkFrame(self.notebook)
         self.notebook.add(raw_frame, text="Raw Data")
         self.setup_raw_view(raw_frame)
+        
+        # Performance tab
+        perf_frame = ctk.CTkFrame(self.notebook)
+        self.notebook.add(perf_frame, text="Performance")
+        self.setup_perf_view(perf_frame)
+        
+        # Query tab (numpy), dibangun setelah window tampil seperti charts
+        query_frame = ctk.CTkFrame(self.notebook)
+        self.notebook.add(query_frame, text="Query")
+        self.after(CHART_BUILD_DELAY_MS, lambda: self.setup_query_view(query_frame))
+        
+        # Map tab (numpy), track UAV di atas tile offline
+        map_frame = ctk.CTkFrame(self.notebook)
+        self.notebook.add(map_frame, text="Map")
+        self.after(CHART_BUILD_DELAY_MS, lambda: self.setup_map_view(map_frame))
     
     def setup_charts(self, parent):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.figure import Figure
+        from gcs_charts import ChartPanel
+        
         # Create figure for plots
         self.fig = Figure(figsize=(10, 8), dpi=100)
         
@@ -212,6 +413,23 @@ class UAVGCSApp(ctk.CTk):
         
         # Canvas
         self.canvas = FigureCanvasTkAgg(self.fig, parent)
+        
+        # Downsampling min/max + blitting, lihat gcs_charts / gcs_downsample
+        points, seconds = CHART_WINDOWS[self.window_var.get()]
+        self.charts = ChartPanel(self.canvas, window_points=points, window_seconds=seconds)
+        self.charts.add_axes(self.alt_ax, {'altitude': self.alt_line})
+        self.charts.add_axes(self.batt_ax, {'voltage': self.batt_line})
+        self.charts.add_axes(self.signal_ax, {'rssi': self.rssi_line, 'snr': self.snr_line})
+        
+        # Zoom/pan toolbar; chart berhenti mengikuti data live sampai "Follow Live"
+        toolbar_frame = ctk.CTkFrame(parent)
+        toolbar_frame.pack(side="bottom", fill="x")
+        self.chart_toolbar = NavigationToolbar2Tk(self.canvas, toolbar_frame, pack_toolbar=False)
+        self.chart_toolbar.pack(side="left", fill="x")
+        follow_btn = ctk.CTkButton(toolbar_frame, text="Follow Live", width=100,
+                                 command=self.charts.follow_live)
+        follow_btn.pack(side="right", padx=5, pady=2)
+        
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
     
@@ -220,134 +438,326 @@ class UAVGCSApp(ctk.CTk):
         self.alt_ax.set_ylabel('Altitude (m)')
         self.alt_ax.grid(True, alpha=0.3)
         self.alt_line, = self.alt_ax.plot([], [], 'b-', linewidth=2)
-        self.alt_data = []
-        self.alt_times = []
     
     def setup_battery_plot(self):
         self.batt_ax.set_title('Battery Status', fontweight='bold')
         self.batt_ax.set_ylabel('Voltage (V)')
         self.batt_ax.grid(True, alpha=0.3)
         self.batt_line, = self.batt_ax.plot([], [], 'g-', linewidth=2)
-        self.batt_data = []
-        self.batt_times = []
     
     def setup_signal_plot(self):
         self.signal_ax.set_title('Signal Quality', fontweight='bold')
         self.signal_ax.set_ylabel('dB / dBm')
+        self.signal_ax.set_xlabel('Time (s)')
         self.signal_ax.grid(True, alpha=0.3)
         self.rssi_line, = self.signal_ax.plot([], [], 'r-', linewidth=2, label='RSSI')
         self.snr_line, = self.signal_ax.plot([], [], 'y-', linewidth=2, label='SNR')
         self.signal_ax.legend()
-        self.rssi_data = []
-        self.snr_data = []
-        self.signal_times = []
     
     def setup_log_view(self, parent):
-        # Create treeview for data log
+        # Treeview tervirtualisasi: hanya baris yang terlihat ada di widget
         columns = ("Time", "Altitude", "Latitude", "Longitude", "Battery", "Status", "RSSI", "SNR")
-        self.log_tree = ttk.Treeview(parent, columns=columns, show="headings", height=15)
+        self.log_view = VirtualLogView(parent, self.data_log, columns, self.format_log_row)
+        self.log_view.pack()
+    
+    def setup_raw_view(self, parent):
+        # Toolbar pause / filter
+        toolbar = ctk.CTkFrame(parent)
+        toolbar.pack(side="top", fill="x")
         
-        for col in columns:
-            self.log_tree.heading(col, text=col)
-            self.log_tree.column(col, width=100)
+        self.raw_pause_var = tk.BooleanVar(value=False)
+        ctk.CTkCheckBox(toolbar, text="Pause", variable=self.raw_pause_var,
+                       command=lambda: self.raw_console.set_paused(self.raw_pause_var.get())
+                       ).pack(side="left", padx=5, pady=5)
+        ctk.CTkOptionMenu(toolbar, values=list(FILTERS),
+                         command=lambda name: self.raw_console.set_filter(name)
+                         ).pack(side="left", padx=5, pady=5)
+        
+        # Text widget untuk raw data
+        self.raw_console = RawConsole(parent, max_lines=RAW_CONSOLE_LINES)
+        self.raw_console.pack()
+    
+    def setup_perf_view(self, parent):
+        toolbar = ctk.CTkFrame(parent)
+        toolbar.pack(side="top", fill="x")
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.log_tree.yview)
-        self.log_tree.configure(yscrollcommand=scrollbar.set)
+        self.perf_enabled_var = tk.BooleanVar(value=PERF.enabled)
+        ctk.CTkCheckBox(toolbar, text="Enable Instrumentation", variable=self.perf_enabled_var,
+                       command=self.toggle_perf).pack(side="left", padx=5, pady=5)
+        ctk.CTkButton(toolbar, text="Reset", width=80,
+                     command=PERF.reset).pack(side="left", padx=5, pady=5)
+        ctk.CTkButton(toolbar, text="Dump JSON", width=100,
+                     command=self.dump_perf).pack(side="left", padx=5, pady=5)
         
-        self.log_tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.perf_panel = PerfPanel(parent, PERF)
+        self.perf_panel.pack()
     
-    def setup_raw_view(self, parent):
-        # Text widget untuk raw data
-        self.raw_text = tk.Text(parent, wrap=tk.WORD, width=80, height=20, 
-                               bg='black', fg='green', font=('Consolas', 10))
+    def setup_query_view(self, parent):
+        from gcs_queryview import QueryPanel
         
-        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.raw_text.yview)
-        self.raw_text.configure(yscrollcommand=scrollbar.set)
+        # Filter + agregasi atas Data Log atau flight log, lihat gcs_query
+        self.query_panel = QueryPanel(parent, self.data_log)
+        self.query_panel.pack()
+    
+    def setup_map_view(self, parent):
+        from gcs_mapview import MapPanel
         
-        self.raw_text.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.map_panel = MapPanel(parent, tiles_path=MAP_TILES)
+        self.map_panel.pack()
+    
+    def register_perf_gauges(self):
+        for name, q in (("frame_queue", self.frame_queue), ("raw_queue", self.raw_queue),
+                        ("packet_queue", self.packet_queue)):
+            PERF.gauge(f"{name}.depth", q.__len__)
+            PERF.gauge(f"{name}.high_water", lambda q=q: q.high_water)
+            PERF.gauge(f"{name}.dropped", lambda q=q: q.dropped)
+        PERF.gauge("store.rows", self.data_log.__len__)
+        PERF.gauge("frame_age.last_ms", lambda: round(self.frame_age.recent[-1] * 1e3, 3)
+                   if self.frame_age.recent else None)
+    
+    def toggle_perf(self):
+        PERF.enabled = self.perf_enabled_var.get()
+        if PERF.enabled:
+            PERF.reset()
+    
+    def dump_perf(self):
+        import os
+        
+        os.makedirs(PERF_DUMP_DIR, exist_ok=True)
+        path = os.path.join(PERF_DUMP_DIR, f"perf_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            PERF.dump(path)
+            messagebox.showinfo("Performance", f"Saved to {path}")
+        except OSError as e:
+            messagebox.showerror("Performance", f"Dump failed: {str(e)}")
     
     def get_serial_ports(self):
+        import serial.tools.list_ports
+        
         ports = serial.tools.list_ports.comports()
         return [port.device for port in ports]
     
     def auto_detect_port(self):
-        ports = self.get_serial_ports()
+        # Enumerasi port bisa lambat (driver USB), jalankan di luar Tk thread
+        def detect():
+            try:
+                self._detected_ports = self.get_serial_ports()
+            except Exception as e:
+                print(f"Port detection error: {e}")
+                self._detected_ports = []
+        
+        self._detected_ports = None
+        threading.Thread(target=detect, daemon=True).start()
+        self.after(50, self._apply_detected_ports)
+    
+    def _apply_detected_ports(self):
+        ports = self._detected_ports
+        if ports is None:
+            self.after(50, self._apply_detected_ports)
+            return
+        self.port_combo.configure(values=ports)
         if ports:
             self.port_var.set(ports[0])
     
     def toggle_connection(self):
         if not self.connected:
+            self.stop_replay()
             self.connect_serial()
         else:
             self.disconnect_serial()
     
     def connect_serial(self):
+        # Beberapa receiver bisa dipisah koma, mis. "COM3, COM4"
+        ports = parse_ports(self.port_var.get())
+        if not ports:
+            messagebox.showerror("Connection Error", "No serial port selected")
+            return
+        
+        # Rekam setiap frame ke disk selama terkoneksi
+        self.recorder = FlightRecorder(FLIGHT_LOG_DIR, record_raw=RECORD_RAW_LINES)
+        self.multi_link = len(ports) > 1
+        self.link_quality.clear()
+        self.rule_engine.clear()
+        self.field_times.clear()
+        self.ingest = MultiReceiverIngest(ports, baud=115200,
+                                          on_frame=self.process_fused_frame,
+                                          on_line=self.process_received_data,
+                                          on_packet=self.process_packet_update)
         try:
-            self.ser = serial.Serial(
-                port=self.port_var.get(),
-                baudrate=115200,
-                timeout=1
-            )
-            self.connected = True
-            self.connect_btn.configure(text="Disconnect")
-            self.conn_status.configure(text="CONNECTED", text_color="green")
-            
-            # Start reading thread
-            self.read_thread = threading.Thread(target=self.read_serial, daemon=True)
-            self.read_thread.start()
-            
-            messagebox.showinfo("Connected", f"Successfully connected to {self.port_var.get()}")
-            
+            failures = self.ingest.start()
         except Exception as e:
+            self.ingest = None
+            self.recorder.close()
+            self.recorder = None
             messagebox.showerror("Connection Error", f"Cannot connect to {self.port_var.get()}\n{str(e)}")
+            return
+        
+        self.connected = True
+        self.connect_btn.configure(text="Disconnect")
+        self.conn_status.configure(text="CONNECTED", text_color="green")
+        
+        if failures:
+            messagebox.showwarning("Partially Connected", "\n".join(
+                f"Cannot connect to {port}: {err}" for port, err in failures.items()))
+        else:
+            messagebox.showinfo("Connected", f"Successfully connected to {', '.join(ports)}")
     
     def disconnect_serial(self):
         self.connected = False
-        if self.ser and self.ser.is_open:
-            self.ser.close()
+        if self.ingest:
+            self.ingest.stop()
+            self.ingest = None
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
         self.connect_btn.configure(text="Connect")
         self.conn_status.configure(text="DISCONNECTED", text_color="red")
     
-    def read_serial(self):
-        while self.connected:
-            try:
-                if self.ser and self.ser.in_waiting:
-                    raw_data = self.ser.readline().decode('utf-8', errors='ignore').strip()
-                    if raw_data:
-                        self.process_received_data(raw_data)
-                time.sleep(0.01)
-            except Exception as e:
-                print(f"Read error: {e}")
-                break
-    
-    def process_received_data(self, raw_data):
-        # Update raw data display
-        self.raw_label.configure(text=f"Raw: {raw_data[:50]}...")
-        self.add_raw_data(f"{datetime.now().strftime('%H:%M:%S')} > {raw_data}\n")
-        
-        # Parse data
-        parsed_data = self.parser.parse_serial_data(raw_data + '\n')
-        
-        if parsed_data:
-            self.packet_count += 1
-            self.packet_label.configure(text=f"Packets: {self.packet_count}")
-            self.data_status.configure(text=f"Last Data: {datetime.now().strftime('%H:%M:%S')}", 
-                                     text_color="green")
+    @timed('process_received_data')
+    def process_received_data(self, link, raw_data):
+        # Dipanggil dari reader thread link: hanya enqueue, tanpa akses widget.
+        # Parsing per link dilakukan oleh gcs_ingest.ReceiverLink
+        now = time.time()
+        text = raw_data.decode('utf-8', errors='ignore')
+        source = link.name if self.multi_link and link is not None else None
+        self.raw_queue.put((now, text, source))
+        recorder = self.recorder
+        if recorder:
+            recorder.write_raw(now, raw_data)
+    
+    @timed('process_fused_frame')
+    def process_fused_frame(self, timestamp, parsed_data):
+        # Satu frame per siklus setelah dedup antar receiver
+        recorder = self.recorder
+        if recorder:
+            recorder.write_frame(timestamp, parsed_data)
+        publisher = self.publisher
+        if publisher:
+            publisher.publish(timestamp, parsed_data)
+        self.frame_queue.put((timestamp, parsed_data))
+    
+    def process_packet_update(self, link, timestamp, fields):
+        # Field dari satu paket LoRa, sebelum siklusnya lengkap
+        self.packet_queue.put((timestamp, fields))
+    
+    @timed('ui_tick')
+    def ui_tick(self):
+        """Drain queue secara batch di Tk thread dengan rate tetap"""
+        try:
+            raw_items = self.raw_queue.drain(MAX_RAW_PER_TICK)
+            if raw_items:
+                self.raw_label.configure(text=f"Raw: {raw_items[-1][1][:50]}...")
+                self.add_raw_data(raw_items)
+            
+            packets = self.packet_queue.drain(MAX_PACKETS_PER_TICK)
+            if packets:
+                self.handle_packets(packets)
+            
+            frames = self.frame_queue.drain(MAX_FRAMES_PER_TICK)
+            if frames:
+                self.handle_frames(frames)
             
-            # Update display dengan data yang berhasil di-parse
-            self.update_display(parsed_data)
+            if self.replayer is not None:
+                self.update_replay_status()
+            
+            self._tick_count += 1
+            if self.field_times and self._tick_count % FIELD_AGE_TICKS == 0:
+                self.update_field_ages()
+            if self.connected and self._tick_count % LINK_CHECK_TICKS == 0:
+                # Tanpa frame baru: deteksi link hilang / pulih
+                now = time.time()
+                changed = self.link_quality.check(now)
+                if changed:
+                    self.update_link_quality(changed)
+                raised, cleared = self.rule_engine.check(now)
+                if raised or cleared:
+                    self.update_alerts(raised)
+            if self._tick_count % ALERT_REPEAT_TICKS == 0 and self.rule_engine.unacknowledged():
+                self.bell()
+                self.flash_alerts()
+            if PERF.enabled and self._tick_count % PERF_REFRESH_TICKS == 0:
+                self.perf_panel.refresh()
+        finally:
+            self._ui_job = self.after(UI_INTERVAL_MS, self.ui_tick)
+    
+    def handle_frames(self, frames):
+        changed = None
+        positions = []
+        raised = []
+        alerts_changed = False
+        add_link = self.link_quality.add
+        evaluate_rules = self.rule_engine.process
+        # Mode raw packet satu link: chart sudah dapat titik per paket
+        per_packet = not self.multi_link
+        for ts, data in frames:
+            changed = add_link(ts, data) or changed
+            new, cleared = evaluate_rules(ts, data)
+            if new or cleared:
+                raised += new
+                alerts_changed = True
+            if self.charts is not None and not (per_packet and data.get('assembled')):
+                self.charts.append(data, ts)
+            if 'latitude' in data and 'longitude' in data:
+                positions.append((data['latitude'], data['longitude']))
+            # Log data
+            if self.logging_active:
+                self.log_data(data, ts)
+        
+        self.packet_count += len(frames)
+        self.packet_label.configure(text=f"Packets: {self.packet_count}")
+        last_ts, last_data = frames[-1]
+        self.data_status.configure(text=f"Last Data: {datetime.fromtimestamp(last_ts).strftime('%H:%M:%S')}", 
+                                 text_color="green")
+        
+        # Label cukup di-update dengan frame terbaru
+        self.field_times.update(dict.fromkeys(last_data, last_ts))
+        self.update_display(last_data)
+        self.update_link_quality(changed)
+        if alerts_changed:
+            self.update_alerts(raised)
+        self.update_charts()
+        if positions and self.map_panel is not None:
+            self.update_map(positions)
+        if self.logging_active:
+            self.update_log_view()
+        
+        if PERF.enabled:
+            # Umur frame dari diterima ingest sampai widget ter-update
+            self.update_idletasks()
+            now = time.time()
+            record = self.frame_age.record
+            for ts, _ in frames:
+                record(now - ts)
+    
+    def handle_packets(self, packets):
+        merged = {}
+        field_times = self.field_times
+        append = self.charts.append if self.charts is not None and not self.multi_link else None
+        for ts, fields in packets:
+            merged.update(fields)
+            field_times.update(dict.fromkeys(fields, ts))
+            if append:
+                append(fields, ts)
+        self.update_display(merged)
+        if append:
+            self.update_charts()
+    
+    def update_field_ages(self):
+        now = time.time()
+        ages = [(name, now - self.field_times[key]) for key, name in FIELD_AGE_NAMES
+                if key in self.field_times]
+        self.field_age_label.configure(
+            text="Age: " + ", ".join(f"{name} {age:.1f}s" for name, age in ages))
     
+    @timed('update_display')
     def update_display(self, data):
         # Update labels
         if 'altitude' in data:
             self.alt_label.configure(text=f"Altitude: {data['altitude']:.2f} m")
         if 'latitude' in data:
-            self.lat_label.configure(text=f"Latitude: {data['latitude']}")
+            self.lat_label.configure(text=f"Latitude: {to_degrees(data['latitude']):.7f}°")
         if 'longitude' in data:
-            self.lon_label.configure(text=f"Longitude: {data['longitude']}")
+            self.lon_label.configure(text=f"Longitude: {to_degrees(data['longitude']):.7f}°")
         if 'voltage' in data and 'remaining' in data:
             batt_color = "green" if data['remaining'] > 20 else "red"
             self.batt_label.configure(text=f"Battery: {data['voltage']:.2f} V ({data['remaining']}%)",
@@ -362,61 +772,132 @@ class UAVGCSApp(ctk.CTk):
                                     text_color=rssi_color)
         if 'snr' in data:
             self.snr_label.configure(text=f"SNR: {data['snr']:.2f} dB")
+    
+    @timed('update_link_quality')
+    def update_link_quality(self, changed=None):
+        quality = self.link_quality
+        level = quality.level
+        color = LINK_LEVEL_COLORS[level]
+        text = f"Link: {level.upper()}"
+        if quality.reasons:
+            text += f" ({quality.reasons[0]})"
+        self.link_level_label.configure(text=text, text_color=color)
+        if changed and changed != "ok":
+            self.bell()
         
-        # Update charts
-        self.update_charts(data)
+        self.link_loss_label.configure(
+            text=f"Loss: {quality.loss_rate * 100:.1f}% ({quality.missed} missed cycles)")
+        margin = quality.margin
+        trend = quality.rssi_trend
+        text = "Margin: --" if margin is None else f"Margin: {margin:.1f} dB"
+        if trend is not None:
+            text += f" ({trend:+.1f} dB/min)"
+        self.link_margin_label.configure(text=text, text_color=color)
         
-        # Log data
-        if self.logging_active:
-            self.log_data(data)
+        rssi = quality.rssi
+        cycle_mean = quality.cycle.mean()
+        if len(rssi):
+            self.link_stats_label.configure(
+                text=f"RSSI p10/p50 {rssi.percentile(10):.1f}/{rssi.percentile(50):.1f} dBm, "
+                     f"EWMA {quality.rssi_fast.value:.1f}; cycle "
+                     f"{'--' if cycle_mean is None else f'{cycle_mean:.0f}'} ms")
     
-    def update_charts(self, data):
-        current_time = datetime.now()
-        
-        # Update altitude chart
-        if 'altitude' in data:
-            self.alt_data.append(data['altitude'])
-            self.alt_times.append(current_time)
-            if len(self.alt_data) > 50:
-                self.alt_data.pop(0)
-                self.alt_times.pop(0)
-            
-            self.alt_line.set_data(range(len(self.alt_data)), self.alt_data)
-            self.alt_ax.relim()
-            self.alt_ax.autoscale_view()
-        
-        # Update battery chart
-        if 'voltage' in data:
-            self.batt_data.append(data['voltage'])
-            self.batt_times.append(current_time)
-            if len(self.batt_data) > 50:
-                self.batt_data.pop(0)
-                self.batt_times.pop(0)
-            
-            self.batt_line.set_data(range(len(self.batt_data)), self.batt_data)
-            self.batt_ax.relim()
-            self.batt_ax.autoscale_view()
+    def update_alerts(self, raised=()):
+        alerts = self.rule_engine.alerts()
+        if raised:
+            self.bell()
+        if not alerts:
+            self.alert_label.configure(text="No active alerts", text_color="green")
+            self.alert_title.configure(text_color=self._alert_title_color)
+            return
+        lines = [f"{alert.rule.severity.upper()}: {alert.rule.name} "
+                 f"({datetime.fromtimestamp(alert.since).strftime('%H:%M:%S')})"
+                 for alert in alerts[:MAX_ALERT_LINES]]
+        if len(alerts) > MAX_ALERT_LINES:
+            lines.append(f"+{len(alerts) - MAX_ALERT_LINES} more")
+        self.alert_label.configure(text="\n".join(lines),
+                                   text_color=ALERT_COLORS[alerts[0].rule.severity])
+    
+    def flash_alerts(self):
+        # Judul panel berkedip selama ada alarm critical yang belum di-ack
+        flashing = self.alert_title.cget("text_color") == "red"
+        self.alert_title.configure(text_color=self._alert_title_color if flashing else "red")
+    
+    def acknowledge_alerts(self):
+        self.rule_engine.acknowledge()
+        self.alert_title.configure(text_color=self._alert_title_color)
+    
+    def load_alert_rules(self):
+        """RuleEngine dari ALERT_RULES; (engine, error) dengan rule default jika file rusak"""
+        try:
+            return RuleEngine(load_rules(ALERT_RULES)), None
+        except (RuleError, ValueError, OSError) as e:
+            return RuleEngine(RuleSet.from_config(DEFAULT_RULES)), f"Cannot load {ALERT_RULES}: {e}"
+    
+    def reload_alert_rules(self):
+        engine, error = self.load_alert_rules()
+        if error:
+            messagebox.showerror("Alert Rules", error)
+            return
+        self.rule_engine = engine
+        self.alert_title.configure(text=f"Alerts ({len(engine.ruleset)} rules)")
+        self.update_alerts()
+    
+    def review_alerts(self):
+        """Jalankan rule atas seluruh Data Log (vectorized) di worker thread"""
+        if self._review is not None or not self.data_log:
+            return
+        ruleset = self.rule_engine.ruleset
+        store = self.data_log
+        box = {}
         
-        # Update signal chart
-        if 'rssi' in data:
-            self.rssi_data.append(data['rssi'])
-            self.signal_times.append(current_time)
-            if len(self.rssi_data) > 50:
-                self.rssi_data.pop(0)
-                self.signal_times.pop(0)
-            
-            self.rssi_line.set_data(range(len(self.rssi_data)), self.rssi_data)
-            
-        if 'snr' in data:
-            self.snr_data.append(data['snr'])
-            if len(self.snr_data) > 50:
-                self.snr_data.pop(0)
-            
-            self.snr_line.set_data(range(len(self.snr_data)), self.snr_data)
-            self.signal_ax.relim()
-            self.signal_ax.autoscale_view()
+        def review():
+            from gcs_query import FlightIndex
+            try:
+                index = FlightIndex.from_store(store)
+                box['rows'] = len(index)
+                box['episodes'] = ruleset.review(index)
+            except Exception as e:
+                box['error'] = e
         
-        self.canvas.draw_idle()
+        self._review = (threading.Thread(target=review, daemon=True), box)
+        self._review[0].start()
+        self.review_btn.configure(state="disabled")
+        self.after(100, self.poll_review)
+    
+    def poll_review(self):
+        thread, box = self._review
+        if thread.is_alive():
+            self.after(100, self.poll_review)
+            return
+        self._review = None
+        self.review_btn.configure(state="normal")
+        if 'error' in box:
+            messagebox.showerror("Alert Review", str(box['error']))
+            return
+        episodes = box['episodes']
+        text = f"{len(episodes)} alerts in {box['rows']} frames\n\n"
+        text += "\n".join(format_episode(e) for e in episodes[:30])
+        if len(episodes) > 30:
+            text += f"\n... {len(episodes) - 30} more (gcs_rules.py for full list)"
+        messagebox.showinfo("Alert Review", text)
+    
+    @timed('update_charts')
+    def update_charts(self):
+        # Satu redraw per UI tick untuk semua frame yang sudah di-append
+        if self.charts is not None:
+            self.charts.refresh()
+    
+    @timed('update_map')
+    def update_map(self, positions):
+        # Posisi baru hanya memperpanjang track, lihat gcs_mapview
+        self.map_panel.extend(positions)
+    
+    def set_chart_window(self, choice):
+        if self.charts is None:
+            return  # setup_charts membaca window_var
+        points, seconds = CHART_WINDOWS[choice]
+        self.charts.set_window(points=points, seconds=seconds)
     
     def toggle_logging(self):
         self.logging_active = not self.logging_active
@@ -427,27 +908,18 @@ class UAVGCSApp(ctk.CTk):
             self.log_btn.configure(text="Start Logging", fg_color="#1f6aa5")
             messagebox.showinfo("Logging", f"Data logging stopped! Total records: {len(self.data_log)}")
     
-    def log_data(self, data):
-        log_entry = {
-            'timestamp': datetime.now(),
-            'altitude': data.get('altitude', 0),
-            'latitude': data.get('latitude', 0),
-            'longitude': data.get('longitude', 0),
-            'voltage': data.get('voltage', 0),
-            'remaining': data.get('remaining', 0),
-            'status': data.get('status', ''),
-            'rssi': data.get('rssi', 0),
-            'snr': data.get('snr', 0)
-        }
-        
-        self.data_log.append(log_entry)
-        
-        # Update log view
-        self.update_log_view(log_entry)
-    
-    def update_log_view(self, data):
-        self.log_tree.insert("", "end", values=(
-            data['timestamp'].strftime("%H:%M:%S"),
+    def log_data(self, data, timestamp=None):
+        # Log view di-refresh sekali per UI tick, lihat handle_frames
+        self.data_log.append(data, timestamp)
+    
+    @timed('update_log_view')
+    def update_log_view(self):
+        self.log_view.refresh()
+    
+    @staticmethod
+    def format_log_row(data):
+        return (
+            datetime.fromtimestamp(data['timestamp']).strftime("%H:%M:%S"),
             f"{data['altitude']:.2f}",
             data['latitude'],
             data['longitude'],
@@ -455,39 +927,152 @@ class UAVGCSApp(ctk.CTk):
             data['status'],
             f"{data['rssi']:.2f}",
             f"{data['snr']:.2f}"
-        ))
-        
-        # Auto-scroll to bottom
-        self.log_tree.see(self.log_tree.get_children()[-1])
+        )
     
-    def add_raw_data(self, text):
-        self.raw_text.insert('end', text)
-        self.raw_text.see('end')
-        # Keep only last 1000 lines
-        lines = self.raw_text.get('1.0', 'end').split('\n')
-        if len(lines) > 1000:
-            self.raw_text.delete('1.0', f'{len(lines)-1000}.0')
+    @timed('add_raw_data')
+    def add_raw_data(self, items):
+        # Batch (timestamp, line, source) per UI tick, lihat gcs_console.RawConsole
+        self.raw_console.append(items)
     
     def export_data(self):
+        # Tombol yang sama dipakai untuk membatalkan export yang berjalan
+        if self.export_job is not None:
+            self.export_job.cancel()
+            return
+        
         if not self.data_log:
             messagebox.showwarning("No Data", "No data to export!")
             return
+        
+        filename = filedialog.asksaveasfilename(
+            initialfile=f"uav_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            defaultextension=".xlsx",
+            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv"), ("Parquet", "*.parquet")])
+        if not filename:
+            return
             
         try:
-            filename = f"uav_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            df = pd.DataFrame(self.data_log)
-            df.to_excel(filename, index=False)
-            messagebox.showinfo("Export Successful", f"Data exported to {filename}")
+            self.export_job = ExportJob(self.data_log, filename).start()
         except Exception as e:
             messagebox.showerror("Export Error", str(e))
+            return
+        
+        self.export_btn.configure(text="Cancel Export")
+        self.export_progress.set(0)
+        self.export_progress.pack(fill="x", pady=5, after=self.export_btn)
+        self.after(100, self._poll_export)
+    
+    def _poll_export(self):
+        job = self.export_job
+        self.export_progress.set(job.progress)
+        if not job.finished.is_set():
+            self.after(100, self._poll_export)
+            return
+        
+        self.export_job = None
+        self.export_progress.pack_forget()
+        self.export_btn.configure(text="Export Data")
+        if job.cancelled:
+            messagebox.showinfo("Export Cancelled", "Export cancelled.")
+        elif job.error:
+            messagebox.showerror("Export Error", str(job.error))
+        else:
+            messagebox.showinfo("Export Successful", f"{job.total} rows exported to {job.path}")
+    
+    def toggle_replay(self):
+        if self.replayer is not None or self._pending_replay is not None:
+            self.stop_replay()
+            return
+        path = filedialog.askopenfilename(
+            filetypes=[("Capture / Flight log", "*.txt *.log *.lfr"), ("All files", "*.*")])
+        if not path:
+            return
+        if self.connected:
+            self.disconnect_serial()
+        
+        # Index file bisa lama untuk log besar, jadi di luar Tk thread
+        def load():
+            try:
+                self._pending_replay = Replayer(
+                    path, on_frame=self.process_fused_frame,
+                    on_line=lambda line: self.process_received_data(None, line),
+                    speed=REPLAY_SPEEDS[self.replay_speed_var.get()],
+                    backlog=self.frame_queue.__len__, max_backlog=REPLAY_MAX_BACKLOG)
+            except Exception as e:
+                self._pending_replay = e
+        
+        self._pending_replay = path
+        self.replay_btn.configure(text="Loading...", state="disabled")
+        threading.Thread(target=load, daemon=True).start()
+        self.after(50, self._start_pending_replay)
+    
+    def _start_pending_replay(self):
+        pending = self._pending_replay
+        if isinstance(pending, str):
+            self.after(50, self._start_pending_replay)
+            return
+        self._pending_replay = None
+        self.replay_btn.configure(state="normal")
+        if isinstance(pending, Exception):
+            self.replay_btn.configure(text="Replay Log...")
+            messagebox.showerror("Replay Error", str(pending))
+            return
+        
+        self.multi_link = False
+        self.link_quality.clear()
+        self.rule_engine.clear()
+        self.field_times.clear()
+        self.replayer = pending.start()
+        self.replay_btn.configure(text="Stop Replay")
+        self.replay_pause_btn.configure(text="Pause")
+        self.replay_frame.pack(fill="x", pady=5)
+        self.conn_status.configure(text="REPLAY", text_color="orange")
+    
+    def stop_replay(self):
+        if self.replayer is None:
+            return
+        self.replayer.stop()
+        self.replayer = None
+        self.replay_frame.pack_forget()
+        self.replay_btn.configure(text="Replay Log...")
+        self.conn_status.configure(text="DISCONNECTED", text_color="red")
+    
+    def toggle_replay_pause(self):
+        replayer = self.replayer
+        if replayer is None:
+            return
+        if replayer.paused:
+            replayer.resume()
+            self.replay_pause_btn.configure(text="Pause")
+        else:
+            replayer.pause()
+            self.replay_pause_btn.configure(text="Resume")
+    
+    def update_replay_status(self):
+        stats = self.replayer.stats()
+        state = "finished" if stats['finished'] else ("paused" if stats['paused'] else "")
+        self.replay_label.configure(
+            text=f"{stats['position']:.0f}/{stats['duration']:.0f} s  "
+                 f"{stats['achieved_fps']:.1f} frames/s {state}")
+        self.replay_slider.set(stats['progress'])
     
     def clear_data(self):
+        # Frame yang sudah antre jangan sampai masuk Data Log setelah clear
+        self.frame_queue.clear()
         self.data_log.clear()
-        for item in self.log_tree.get_children():
-            self.log_tree.delete(item)
-        self.raw_text.delete('1.0', 'end')
+        self.log_view.clear()
+        self.raw_console.clear()
+        self.raw_queue.clear()
+        self.packet_queue.clear()
         self.packet_count = 0
         self.packet_label.configure(text="Packets: 0")
+        self.link_quality.clear()
+        self.rule_engine.clear()
+        self.update_alerts()
+        self.field_times.clear()
+        self.field_age_label.configure(text="Age: --")
+        if self.map_panel is not None:
+            self.map_panel.clear()
         messagebox.showinfo("Clear", "All data cleared!")
     
     def show_debug_info(self):
@@ -495,12 +1080,69 @@ class UAVGCSApp(ctk.CTk):
         info += f"Packets Received: {self.packet_count}\n"
         info += f"Data Log Entries: {len(self.data_log)}\n"
         info += f"Logging Active: {self.logging_active}\n"
-        info += f"Serial Port: {self.port_var.get()}"
+        info += f"Serial Port: {self.port_var.get()}\n"
+        if self.ingest:
+            fusion = self.ingest.fusion.stats()
+            info += (f"Fusion: {fusion['frames_in']} in, {fusion['frames_out']} out, "
+                     f"{fusion['duplicates']} duplicates\n")
+            for link in self.ingest.stats()['links']:
+                state = "up" if link['connected'] else f"down ({link['error']})"
+                rssi = "--" if link['avg_rssi'] is None else f"{link['avg_rssi']:.1f}"
+                info += (f"Link {link['name']}: {state}, {link['frames']} frames, "
+                         f"best {link['best']}, avg RSSI {rssi}\n")
+                info += f"  Ingest Latency: {link['latency']}\n"
+                if link['packets']:
+                    info += f"  Raw Packets: {link['packets']}\n"
+        info += f"Link Quality: {self.link_quality.summary()}\n"
+        alerts = self.rule_engine.alerts()
+        info += (f"Alerts: {len(alerts)} active of {len(self.rule_engine.ruleset)} rules, "
+                 f"{self.rule_engine.evaluated} frames evaluated\n")
+        if self.replayer:
+            stats = self.replayer.stats()
+            info += (f"Replay: {stats['frames']} frames @ {stats['achieved_fps']:.1f} frames/s, "
+                     f"speed {stats['speed'] or 'max'}, throttled {stats['throttled']}\n")
+        if self.recorder:
+            stats = self.recorder.stats()
+            info += f"Flight Log: {stats['path']} ({stats['frames']} frames)\n"
+        if self.publisher:
+            info += f"Publish: {self.publisher.summary()}\n"
+        for name, q in (("Frame", self.frame_queue), ("Raw", self.raw_queue),
+                        ("Packet", self.packet_queue)):
+            stats = q.stats()
+            info += (f"{name} Queue: depth {stats['depth']}, max {stats['high_water']}, "
+                     f"dropped {stats['dropped']}\n")
+        if PERF.enabled:
+            info += "Performance:\n"
+            info += "".join(f"  {line}\n" for line in PERF.summary_lines())
+        else:
+            info += "Performance: instrumentation disabled (see Performance tab)\n"
         
         messagebox.showinfo("Debug Info", info)
     
+    def toggle_publish(self):
+        if not self.publish_var.get():
+            publisher, self.publisher = self.publisher, None
+            if publisher:
+                publisher.stop()
+            return
+        publisher = TelemetryPublisher(udp=PUBLISH_UDP, tcp=PUBLISH_TCP, ws=PUBLISH_WS,
+                                       mavlink=PUBLISH_MAVLINK,
+                                       udp_interface=PUBLISH_UDP_INTERFACE)
+        try:
+            publisher.start()
+        except OSError as e:
+            publisher.stop()
+            self.publish_var.set(False)
+            messagebox.showerror("Publish Error", f"Cannot start telemetry publisher\n{e}")
+            return
+        self.publisher = publisher
+    
     def on_closing(self):
+        self.after_cancel(self._ui_job)
+        self.stop_replay()
         self.disconnect_serial()
+        if self.publisher:
+            self.publisher.stop()
         self.destroy()
 
 if __name__ == "__main__":
@@ -0,0 +1,266 @@
+"""Peta offline: proyeksi Web Mercator, sumber tile lokal dan track UAV.
+
+Tidak bergantung pada Tk; tampilan ada di gcs_mapview.
+
+- DirectoryTiles / MBTiles membaca tile dari folder `{z}/{x}/{y}.png`
+  (mis. hasil download tile server) atau file .mbtiles, tanpa jaringan.
+- TileCache menyimpan tile yang sudah di-decode dalam LRU di memori,
+  termasuk tile yang tidak ada, supaya pan/zoom tidak membaca disk lagi.
+- Track menyimpan posisi dalam koordinat world (0..1) dan, untuk setiap
+  zoom level, index titik yang berjarak >= TRACK_TOLERANCE_PX piksel dari
+  titik sebelumnya yang disimpan (radial distance). Update incremental
+  O(jumlah zoom) per titik, jadi track 100k+ titik tetap ringan digambar
+  di zoom mana pun.
+"""
+import math
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+TILE_SIZE = 256
+MIN_ZOOM = 0
+MAX_ZOOM = 19
+MAX_LATITUDE = 85.05112878     # batas Web Mercator
+TRACK_TOLERANCE_PX = 1.5
+TILE_CACHE_SIZE = 256
+INITIAL_CAPACITY = 1024
+TILE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def project(lon, lat):
+    """Derajat -> koordinat world Web Mercator (x, y dalam 0..1, y ke bawah)"""
+    lat = min(max(lat, -MAX_LATITUDE), MAX_LATITUDE)
+    x = (lon + 180.0) / 360.0
+    y = 0.5 - math.log(math.tan(math.pi / 4 + math.radians(lat) / 2)) / (2 * math.pi)
+    return x, y
+
+
+def unproject(x, y):
+    """Koordinat world -> (lon, lat) derajat"""
+    lon = x * 360.0 - 180.0
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+    return lon, lat
+
+
+def world_size(zoom):
+    """Lebar dunia dalam piksel pada zoom level"""
+    return TILE_SIZE * (1 << zoom)
+
+
+# --- Sumber tile ---
+
+class DirectoryTiles:
+    """Tile dari folder `root/{z}/{x}/{y}.png` (atau .jpg), skema XYZ"""
+
+    def __init__(self, root):
+        if not os.path.isdir(root):
+            raise IOError(f"tile directory not found: {root}")
+        self.root = root
+        self.name = root
+        self._ext = None
+
+    def get(self, z, x, y):
+        base = os.path.join(self.root, str(z), str(x), str(y))
+        for ext in (self._ext,) if self._ext else TILE_EXTENSIONS:
+            try:
+                with open(base + ext, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue
+            self._ext = ext
+            return data
+        return None
+
+    def close(self):
+        pass
+
+
+class MBTiles:
+    """Tile dari file MBTiles (sqlite, baris TMS: y dibalik)"""
+
+    def __init__(self, path):
+        if not os.path.isfile(path):
+            raise IOError(f"MBTiles file not found: {path}")
+        self.name = path
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.metadata = dict(self._conn.execute("SELECT name, value FROM metadata"))
+
+    def get(self, z, x, y):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+                (z, x, (1 << z) - 1 - y)).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        self._conn.close()
+
+
+def open_tiles(path):
+    """Path folder tile atau file .mbtiles -> sumber tile"""
+    if os.path.isdir(path):
+        return DirectoryTiles(path)
+    return MBTiles(path)
+
+
+class TileCache:
+    """LRU tile ter-decode di atas sumber tile.
+
+    `decode(data)` mengubah bytes tile jadi objek siap gambar (mis.
+    PhotoImage; dipanggil di thread pemanggil get()). Tile yang tidak ada
+    atau gagal di-decode disimpan sebagai None.
+    """
+
+    def __init__(self, source, decode=bytes, capacity=TILE_CACHE_SIZE):
+        self.source = source
+        self.decode = decode
+        self.capacity = capacity
+        self._tiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.decode_errors = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def get(self, z, x, y):
+        key = (z, x, y)
+        tiles = self._tiles
+        if key in tiles:
+            self.hits += 1
+            tiles.move_to_end(key)
+            return tiles[key]
+        self.misses += 1
+        tile = None
+        data = self.source.get(z, x, y) if self.source else None
+        if data:
+            try:
+                tile = self.decode(data)
+            except Exception:
+                self.decode_errors += 1
+        tiles[key] = tile
+        if len(tiles) > self.capacity:
+            tiles.popitem(last=False)
+            self.evictions += 1
+        return tile
+
+    def clear(self):
+        self._tiles.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'tiles': len(self._tiles),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else None,
+            'evictions': self.evictions,
+            'decode_errors': self.decode_errors,
+        }
+
+
+# --- Track ---
+
+class _Indices:
+    """Array index int64 yang tumbuh (doubling)"""
+
+    __slots__ = ('data', 'count', 'last_x', 'last_y')
+
+    def __init__(self):
+        self.data = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        self.count = 0
+        self.last_x = self.last_y = None
+
+    def append(self, i):
+        n = self.count
+        if n == len(self.data):
+            grown = np.empty(2 * n, dtype=np.int64)
+            grown[:n] = self.data
+            self.data = grown
+        self.data[n] = i
+        self.count = n + 1
+
+    def view(self):
+        return self.data[:self.count]
+
+
+class Track:
+    """Track posisi UAV dengan simplifikasi per zoom level"""
+
+    def __init__(self, tolerance_px=TRACK_TOLERANCE_PX, max_zoom=MAX_ZOOM):
+        self.count = 0
+        self.x = np.empty(INITIAL_CAPACITY)
+        self.y = np.empty(INITIAL_CAPACITY)
+        # Toleransi dalam satuan world per zoom level
+        self.tolerances = [tolerance_px / world_size(z) for z in range(max_zoom + 1)]
+        self.levels = [_Indices() for _ in self.tolerances]
+
+    def __len__(self):
+        return self.count
+
+    def append(self, lon, lat):
+        """Tambah satu posisi (derajat); return (x, y) world"""
+        x, y = project(lon, lat)
+        i = self.count
+        if i == len(self.x):
+            for name in ('x', 'y'):
+                grown = np.empty(2 * i)
+                grown[:i] = getattr(self, name)
+                setattr(self, name, grown)
+        self.x[i] = x
+        self.y[i] = y
+        self.count = i + 1
+        for level, tol in zip(self.levels, self.tolerances):
+            lx = level.last_x
+            if lx is None or abs(x - lx) >= tol or abs(y - level.last_y) >= tol:
+                level.append(i)
+                level.last_x = x
+                level.last_y = y
+        return x, y
+
+    def clear(self):
+        self.count = 0
+        self.levels = [_Indices() for _ in self.tolerances]
+
+    def last(self):
+        if not self.count:
+            return None
+        i = self.count - 1
+        return self.x[i], self.y[i]
+
+    def level_size(self, zoom):
+        return self.levels[zoom].count
+
+    def level_points(self, zoom, start=0):
+        """(x, y) titik tersimplifikasi pada zoom mulai index level `start`"""
+        idx = self.levels[zoom].view()[start:]
+        return self.x[idx], self.y[idx]
+
+    def runs(self, zoom, x0, y0, x1, y1):
+        """Potongan track tersimplifikasi yang terlihat di kotak world [x0, x1] x [y0, y1].
+
+        Return list (x, y) array; titik di luar kotak yang bersebelahan
+        dengan titik di dalam ikut disertakan supaya segmen yang memotong
+        tepi tetap tergambar. Titik terakhir selalu disertakan.
+        """
+        if not self.count:
+            return []
+        idx = self.levels[zoom].view()
+        if idx[-1] != self.count - 1:
+            idx = np.append(idx, self.count - 1)
+        xs = self.x[idx]
+        ys = self.y[idx]
+        inside = (xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1)
+        keep = inside.copy()
+        keep[1:] |= inside[:-1]
+        keep[:-1] |= inside[1:]
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], keep.view(np.int8), [0]))))
+        return [(xs[a:b], ys[a:b]) for a, b in zip(edges[0::2], edges[1::2])]
+
+    def memory_usage(self):
+        return self.x.nbytes + self.y.nbytes + sum(level.data.nbytes for level in self.levels)
@@ -0,0 +1,305 @@
+import io
+import math
+from tkinter import filedialog, messagebox, ttk
+import tkinter as tk
+
+from gcs_map import MAX_ZOOM, MIN_ZOOM, Track, TileCache, open_tiles, unproject, world_size
+from gcs_parser import to_degrees
+
+try:
+    from PIL import Image, ImageTk
+except ImportError:  # tanpa Pillow: hanya tile PNG (PhotoImage Tk)
+    Image = ImageTk = None
+
+DEFAULT_ZOOM = 16
+TAIL_POINTS = 256          # titik per item line "tail" sebelum dibekukan
+PAN_REDRAW_MS = 120        # jeda redraw tile setelah drag
+FOLLOW_MARGIN = 0.2        # recenter jika posisi keluar 20% tepi canvas
+BACKGROUND = "#1e1e1e"
+TRACK_COLOR = "#ff3b30"
+TRACK_WIDTH = 2
+
+
+def _photo(data):
+    if ImageTk is not None:
+        return ImageTk.PhotoImage(Image.open(io.BytesIO(data)))
+    return tk.PhotoImage(data=data)
+
+
+class MapPanel:
+    """Peta tile offline + track UAV di atas tk.Canvas.
+
+    Redraw penuh (tile + track tersimplifikasi untuk zoom saat ini, hanya
+    bagian yang terlihat) hanya terjadi saat zoom, resize, selesai pan
+    atau recenter. Posisi baru cukup memperpanjang item line "tail"
+    (maksimal TAIL_POINTS titik, lalu dibekukan dan tail baru dimulai),
+    jadi biaya per frame tidak bergantung pada panjang track. Saat drag,
+    semua item digeser dengan canvas.move dan tile dilengkapi setelahnya.
+    """
+
+    def __init__(self, parent, tiles_path=None):
+        self.parent = parent
+        self.track = Track()
+        self.tiles = TileCache(None, _photo)
+        self.zoom = DEFAULT_ZOOM
+        self.center = None           # (x, y) world; None = belum ada posisi
+        self.follow = True
+        self.redraws = 0
+        self._tail_item = None
+        self._tail_coords = []
+        self._tail_start = 0         # index level zoom yang sudah tergambar
+        self._drag = None
+        self._redraw_job = None
+
+        toolbar = ttk.Frame(parent)
+        self.toolbar = toolbar
+        ttk.Button(toolbar, text="+", width=3, command=lambda: self.zoom_by(1)).pack(side="left")
+        ttk.Button(toolbar, text="-", width=3, command=lambda: self.zoom_by(-1)).pack(side="left")
+        ttk.Button(toolbar, text="Follow", command=self.follow_live).pack(side="left", padx=3)
+        ttk.Button(toolbar, text="Open MBTiles...", command=self.open_mbtiles).pack(side="left")
+        ttk.Button(toolbar, text="Tile Folder...", command=self.open_tile_folder).pack(side="left")
+        self.status_label = ttk.Label(toolbar, text="")
+        self.status_label.pack(side="left", padx=10)
+
+        self.canvas = tk.Canvas(parent, background=BACKGROUND, highlightthickness=0)
+        self.marker = None
+        canvas = self.canvas
+        canvas.bind("<Configure>", lambda event: self.redraw())
+        canvas.bind("<ButtonPress-1>", self._drag_start)
+        canvas.bind("<B1-Motion>", self._drag_move)
+        canvas.bind("<ButtonRelease-1>", self._drag_end)
+        canvas.bind("<MouseWheel>", lambda event: self.zoom_by(1 if event.delta > 0 else -1, event))
+        canvas.bind("<Button-4>", lambda event: self.zoom_by(1, event))
+        canvas.bind("<Button-5>", lambda event: self.zoom_by(-1, event))
+
+        if tiles_path:
+            try:
+                self.set_tiles(tiles_path)
+            except (IOError, OSError) as e:
+                self.status_label.configure(text=f"No tiles: {e}")
+
+    def pack(self):
+        self.toolbar.pack(side="top", fill="x", pady=3)
+        self.canvas.pack(side="top", fill="both", expand=True)
+
+    # --- Sumber tile ---
+
+    def set_tiles(self, path):
+        source = open_tiles(path)
+        if self.tiles.source:
+            self.tiles.source.close()
+        self.tiles = TileCache(source, _photo)
+        self.redraw()
+
+    def open_mbtiles(self):
+        path = filedialog.askopenfilename(filetypes=[("MBTiles", "*.mbtiles"), ("All files", "*.*")])
+        if path:
+            self._open(path)
+
+    def open_tile_folder(self):
+        path = filedialog.askdirectory(title="Tile folder ({z}/{x}/{y}.png)")
+        if path:
+            self._open(path)
+
+    def _open(self, path):
+        try:
+            self.set_tiles(path)
+        except Exception as e:
+            messagebox.showerror("Map Tiles", f"Cannot open {path}\n{e}")
+
+    # --- Data ---
+
+    def extend(self, positions):
+        """Tambah posisi (latitude, longitude) integer derajat * 1e7 dari frame"""
+        append = self.track.append
+        added = False
+        for lat, lon in positions:
+            if lat == 0 and lon == 0:
+                continue  # transmitter belum dapat fix GPS
+            append(to_degrees(lon), to_degrees(lat))
+            added = True
+        if not added:
+            return
+        if self.center is None or (self.follow and not self._near_center(self.track.last())):
+            self.center = self.track.last()
+            self.redraw()
+        else:
+            self._extend_tail()
+
+    def clear(self):
+        self.track.clear()
+        self.center = None
+        self.redraw()
+
+    def follow_live(self):
+        self.follow = True
+        if self.track.count:
+            self.center = self.track.last()
+        self.redraw()
+
+    # --- Koordinat ---
+
+    def _size(self):
+        return max(self.canvas.winfo_width(), 1), max(self.canvas.winfo_height(), 1)
+
+    def _to_canvas(self, x, y):
+        w, h = self._size()
+        scale = world_size(self.zoom)
+        return (x - self.center[0]) * scale + w / 2, (y - self.center[1]) * scale + h / 2
+
+    def _near_center(self, point):
+        w, h = self._size()
+        px, py = self._to_canvas(*point)
+        return (FOLLOW_MARGIN * w <= px <= (1 - FOLLOW_MARGIN) * w
+                and FOLLOW_MARGIN * h <= py <= (1 - FOLLOW_MARGIN) * h)
+
+    # --- Gambar ---
+
+    def redraw(self):
+        """Gambar ulang tile + track yang terlihat"""
+        if self._redraw_job is not None:
+            self.canvas.after_cancel(self._redraw_job)
+            self._redraw_job = None
+        canvas = self.canvas
+        canvas.delete("all")
+        self.marker = None
+        self._tail_item = None
+        if self.center is None:
+            self._update_status()
+            return
+        self.redraws += 1
+        w, h = self._size()
+        scale = world_size(self.zoom)
+        x0 = self.center[0] - w / 2 / scale
+        y0 = self.center[1] - h / 2 / scale
+        x1 = x0 + w / scale
+        y1 = y0 + h / scale
+        self._draw_tiles(x0, y0, x1, y1)
+
+        zoom = self.zoom
+        for xs, ys in self.track.runs(zoom, x0, y0, x1, y1):
+            if len(xs) > 1:
+                coords = self._flatten(xs, ys)
+                canvas.create_line(*coords, fill=TRACK_COLOR, width=TRACK_WIDTH, tags="track")
+        self._tail_start = self.track.level_size(zoom)
+        last = self.track.last()
+        if last is not None:
+            self._tail_coords = list(self._to_canvas(*last))
+            self._draw_marker(last)
+        self._update_status()
+
+    def _flatten(self, xs, ys):
+        scale = world_size(self.zoom)
+        w, h = self._size()
+        coords = [0.0] * (2 * len(xs))
+        coords[0::2] = ((xs - self.center[0]) * scale + w / 2).tolist()
+        coords[1::2] = ((ys - self.center[1]) * scale + h / 2).tolist()
+        return coords
+
+    def _draw_tiles(self, x0, y0, x1, y1):
+        zoom = self.zoom
+        n = 1 << zoom
+        scale = world_size(zoom)
+        tx0 = max(int(math.floor(x0 * n)), 0)
+        ty0 = max(int(math.floor(y0 * n)), 0)
+        tx1 = min(int(math.floor(x1 * n)), n - 1)
+        ty1 = min(int(math.floor(y1 * n)), n - 1)
+        w, h = self._size()
+        get = self.tiles.get
+        for tx in range(tx0, tx1 + 1):
+            for ty in range(ty0, ty1 + 1):
+                image = get(zoom, tx, ty)
+                if image is None:
+                    continue
+                px = (tx / n - self.center[0]) * scale + w / 2
+                py = (ty / n - self.center[1]) * scale + h / 2
+                self.canvas.create_image(px, py, image=image, anchor="nw", tags="tile")
+
+    def _extend_tail(self):
+        # Tambah titik baru level zoom saat ini ke line tail, tanpa redraw
+        track = self.track
+        zoom = self.zoom
+        coords = self._tail_coords
+        xs, ys = track.level_points(zoom, self._tail_start)
+        self._tail_start = track.level_size(zoom)
+        if len(xs):
+            if len(coords) >= 2 * TAIL_POINTS:
+                # Bekukan tail, mulai tail baru dari titik terakhirnya
+                self._tail_item = None
+                del coords[:-2]
+            coords.extend(self._flatten(xs, ys))
+        if len(coords) >= 4:
+            if self._tail_item is None:
+                self._tail_item = self.canvas.create_line(
+                    *coords, fill=TRACK_COLOR, width=TRACK_WIDTH, tags="track")
+            else:
+                self.canvas.coords(self._tail_item, *coords)
+        self._draw_marker(track.last())
+        self._update_status()
+
+    def _draw_marker(self, point):
+        px, py = self._to_canvas(*point)
+        r = 6
+        if self.marker is None:
+            self.marker = self.canvas.create_oval(px - r, py - r, px + r, py + r, fill="yellow",
+                                                  outline="black", width=2, tags="marker")
+        else:
+            self.canvas.coords(self.marker, px - r, py - r, px + r, py + r)
+            self.canvas.tag_raise(self.marker)
+
+    def _update_status(self):
+        text = f"Zoom {self.zoom}, {len(self.track)} points"
+        last = self.track.last()
+        if last is not None:
+            lon, lat = unproject(*last)
+            text += f", UAV {lat:.6f}, {lon:.6f}"
+        stats = self.tiles.stats()
+        if self.tiles.source is None:
+            text += ", no tile source"
+        elif stats['hit_rate'] is not None:
+            text += f", tiles {stats['tiles']} cached ({stats['hit_rate'] * 100:.0f}% hit)"
+        if not self.follow:
+            text += " [manual]"
+        self.status_label.configure(text=text)
+
+    # --- Interaksi ---
+
+    def zoom_by(self, step, event=None):
+        zoom = min(max(self.zoom + step, MIN_ZOOM), MAX_ZOOM)
+        if zoom == self.zoom or self.center is None:
+            return
+        if event is not None:
+            # Titik di bawah kursor tetap di tempat
+            w, h = self._size()
+            old = world_size(self.zoom)
+            new = world_size(zoom)
+            dx = event.x - w / 2
+            dy = event.y - h / 2
+            self.center = (self.center[0] + dx / old - dx / new,
+                           self.center[1] + dy / old - dy / new)
+            self.follow = False
+        self.zoom = zoom
+        self.redraw()
+
+    def _drag_start(self, event):
+        self._drag = (event.x, event.y)
+
+    def _drag_move(self, event):
+        if self._drag is None or self.center is None:
+            return
+        dx = event.x - self._drag[0]
+        dy = event.y - self._drag[1]
+        self._drag = (event.x, event.y)
+        scale = world_size(self.zoom)
+        self.center = (self.center[0] - dx / scale, self.center[1] - dy / scale)
+        self.follow = False
+        self.canvas.move("all", dx, dy)
+        if self._tail_coords:
+            self._tail_coords[0::2] = [c + dx for c in self._tail_coords[0::2]]
+            self._tail_coords[1::2] = [c + dy for c in self._tail_coords[1::2]]
+        if self._redraw_job is not None:
+            self.canvas.after_cancel(self._redraw_job)
+        self._redraw_job = self.canvas.after(PAN_REDRAW_MS, self.redraw)
+
+    def _drag_end(self, event):
+        self._drag = None
@@ -1,122 +1,229 @@
-import re
-from datetime import datetime
+from gcs_perf import timed
+
+
+def _to_float(rest):
+    return float(rest.split(None, 1)[0])
+
+
+def _to_int(rest):
+    return int(rest.split(None, 1)[0])
+
+
+def _parse_battery(rest, frame):
+    # Format: "12.45V (85%)"
+    volt, _, pct = rest.partition(b'V')
+    voltage = float(volt)
+    remaining = int(pct.partition(b'(')[2].partition(b'%')[0])
+    frame['voltage'] = voltage
+    frame['remaining'] = remaining
+
+
+def _parse_status(rest, frame):
+    status = rest.strip().decode('utf-8', errors='ignore')
+    if status:
+        frame['status'] = status
+
+
+def _field(key, convert):
+    def handler(rest, frame):
+        frame[key] = convert(rest)
+    return handler
+
+
+# Lookup table: prefix sebelum ':' -> handler(rest, frame)
+LINE_HANDLERS = {
+    b'Altitude': _field('altitude', _to_float),
+    b'Latitude': _field('latitude', _to_int),
+    b'Longitude': _field('longitude', _to_int),
+    b'Battery': _parse_battery,
+    b'Status': _parse_status,
+    b'Avg RSSI': _field('rssi', _to_float),
+    b'Avg SNR': _field('snr', _to_float),
+    b'Cycle Time': _field('cycle_time', _to_int),
+}
+
+FRAME_DELIMITER = b'=========='
+
+COORD_SCALE = 1e7  # latitude/longitude dari transmitter = derajat * 1e7 (MAVLink)
+
+
+def to_degrees(value):
+    """Integer latitude/longitude frame -> derajat"""
+    return value / COORD_SCALE
+
+
+def _packet_battery(rest, frame):
+    # Format: "12.45,85"
+    volt, sep, pct = rest.partition(b',')
+    if not sep:
+        raise ValueError("battery packet tanpa ','")
+    frame['voltage'] = float(volt)
+    frame['remaining'] = int(pct)
+
+
+# Payload paket LoRa dari Transmit_5.ino: prefix 2 byte -> handler(rest, frame)
+PACKET_HANDLERS = {
+    b'AL': _field('altitude', _to_float),
+    b'LT': _field('latitude', _to_int),
+    b'LN': _field('longitude', _to_int),
+    b'BV': _packet_battery,
+    b'ST': _parse_status,
+}
+# Urutan paket dalam satu siklus (expectedNext di Receiver_5.ino)
+PACKET_SEQUENCE = (b'AL', b'LT', b'LN', b'BV', b'ST')
+
+
+def parse_packet(data):
+    """Payload satu paket ('AL150.50', b'BV12.45,85', ...) -> (prefix, fields) atau None"""
+    if isinstance(data, str):
+        data = data.encode('utf-8', errors='ignore')
+    data = data.strip()
+    prefix = data[:2]
+    handler = PACKET_HANDLERS.get(prefix)
+    if handler is None or len(data) <= 2:
+        return None
+    fields = {}
+    try:
+        handler(data[2:], fields)
+    except (ValueError, IndexError):
+        return None
+    return (prefix, fields) if fields else None
+
+
+def is_valid_line(line):
+    """True jika baris adalah delimiter atau field yang bisa di-parse"""
+    if isinstance(line, str):
+        line = line.encode('utf-8', errors='ignore')
+    line = line.strip()
+    if line.startswith(FRAME_DELIMITER):
+        return True
+    key, sep, rest = line.partition(b':')
+    handler = LINE_HANDLERS.get(key) if sep else None
+    if handler is None:
+        return False
+    try:
+        handler(rest, {})
+    except (ValueError, IndexError):
+        return False
+    return True
+
+
+class FrameParser:
+    """Streaming parser untuk output teks Receiver_5.ino.
+
+    Menerima chunk bytes/bytearray secara incremental dan mengembalikan
+    frame yang sudah lengkap (ditutup oleh baris '==========').
+    """
+
+    def __init__(self, max_line_length=4096):
+        self.buffer = bytearray()
+        self.current_data = {}
+        self.max_line_length = max_line_length
+        self.lines_parsed = 0
+        self.frames_parsed = 0
+
+    def feed(self, chunk):
+        """Consume satu chunk dan return list frame yang selesai"""
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8', errors='ignore')
+        elif not isinstance(chunk, bytes):
+            chunk = bytes(chunk)
+
+        buf = self.buffer
+        if not buf and chunk.find(b'\n') == len(chunk) - 1:
+            # Fast path: tepat satu baris lengkap (pola readline())
+            frame = self.feed_line(chunk)
+            return [frame] if frame is not None else []
+
+        if buf:
+            buf += chunk
+            data = bytes(buf)
+        else:
+            data = chunk
+        # Buffer hanya berisi sisa baris terakhir, jadi split ini O(chunk)
+        lines = data.split(b'\n')
+        tail = lines.pop()
+
+        frames = []
+        feed_line = self.feed_line
+        for line in lines:
+            frame = feed_line(line)
+            if frame is not None:
+                frames.append(frame)
+
+        buf.clear()
+        if len(tail) <= self.max_line_length:
+            buf += tail
+        # else: garbage tanpa newline, buang supaya buffer tidak tumbuh terus
+        return frames
+
+    def feed_line(self, line):
+        """Proses satu baris lengkap (tanpa newline), return frame atau None"""
+        line = line.strip()
+        if not line:
+            return None
+        self.lines_parsed += 1
+
+        if line.startswith(FRAME_DELIMITER):
+            if self.current_data:
+                frame = self.current_data
+                self.current_data = {}
+                self.frames_parsed += 1
+                return frame
+            return None
+
+        key, sep, rest = line.partition(b':')
+        if not sep:
+            return None
+        handler = LINE_HANDLERS.get(key)
+        if handler is None:
+            return None
+        try:
+            handler(rest, self.current_data)
+        except (ValueError, IndexError):
+            pass
+        return None
+
+    def reset(self):
+        self.buffer.clear()
+        self.current_data = {}
+
 
 class DataParser:
     def __init__(self):
-        self.buffer = ""
-        self.current_data = {}
-        
+        self.engine = FrameParser()
+
+    @property
+    def current_data(self):
+        return self.engine.current_data
+
     def parse_serial_data(self, data):
-        """Parse data dari Arduino receiver"""
-        self.buffer += data
-        lines = self.buffer.split('\n')
-        self.buffer = lines[-1]  # Simpan incomplete line
-        
-        parsed_data = {}
-        
-        for line in lines[:-1]:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Parse berdasarkan pattern yang dikirim Arduino
-            if line.startswith("=========="):
-                if self.current_data:
-                    parsed_data = self.current_data.copy()
-                    self.current_data = {}
-                continue
-                
-            elif "Altitude:" in line:
-                try:
-                    match = re.search(r"Altitude:\s*([\d.-]+)", line)
-                    if match:
-                        self.current_data['altitude'] = float(match.group(1))
-                except ValueError:
-                    pass
-                    
-            elif "Latitude:" in line:
-                try:
-                    match = re.search(r"Latitude:\s*([\d.-]+)", line)
-                    if match:
-                        self.current_data['latitude'] = int(match.group(1))
-                except ValueError:
-                    pass
-                    
-            elif "Longitude:" in line:
-                try:
-                    match = re.search(r"Longitude:\s*([\d.-]+)", line)
-                    if match:
-                        self.current_data['longitude'] = int(match.group(1))
-                except ValueError:
-                    pass
-                    
-            elif "Battery:" in line:
-                try:
-                    match = re.search(r"Battery:\s*([\d.-]+)V\s*\((\d+)%\)", line)
-                    if match:
-                        self.current_data['voltage'] = float(match.group(1))
-                        self.current_data['remaining'] = int(match.group(2))
-                except ValueError:
-                    pass
-                    
-            elif "Status:" in line:
-                try:
-                    match = re.search(r"Status:\s*(.+)", line)
-                    if match:
-                        self.current_data['status'] = match.group(1).strip()
-                except:
-                    pass
-                    
-            elif "Avg RSSI:" in line:
-                try:
-                    match = re.search(r"Avg RSSI:\s*([\d.-]+)", line)
-                    if match:
-                        self.current_data['rssi'] = float(match.group(1))
-                except ValueError:
-                    pass
-                    
-            elif "Avg SNR:" in line:
-                try:
-                    match = re.search(r"Avg SNR:\s*([\d.-]+)", line)
-                    if match:
-                        self.current_data['snr'] = float(match.group(1))
-                except ValueError:
-                    pass
-                    
-            elif "Cycle Time:" in line:
-                try:
-                    match = re.search(r"Cycle Time:\s*(\d+)", line)
-                    if match:
-                        self.current_data['cycle_time'] = int(match.group(1))
-                except ValueError:
-                    pass
-        
-        return parsed_data if parsed_data else None
+        """Parse data dari Arduino receiver (str atau bytes), per baris.
+
+        Kontrak lama: return frame yang baru selesai atau None, jadi
+        `data` sebaiknya satu baris (seperti readline()). Untuk chunk
+        berisi banyak frame pakai parse_chunk() supaya tidak ada frame
+        yang terlewat.
+        """
+        frames = self.engine.feed(data)
+        return frames[-1] if frames else None
+
+    def parse_chunk(self, data):
+        """Parse chunk bytes/str sembarang, return list semua frame yang selesai"""
+        return self.engine.feed(data)
+
+    @timed('parse_line')
+    def parse_line(self, line):
+        """Parse satu baris lengkap tanpa buffering (str atau bytes)"""
+        if isinstance(line, str):
+            line = line.encode('utf-8', errors='ignore')
+        return self.engine.feed_line(line)
 
     def parse_raw_packet(self, data):
-        """Alternative parser untuk raw packet data"""
-        data = data.strip()
-        
-        # Debug: print raw data
-        print(f"RAW: {data}")
-        
-        parsed = {}
-        
-        try:
-            if data.startswith("AL") and len(data) > 2:
-                parsed['altitude'] = float(data[2:])
-            elif data.startswith("LT") and len(data) > 2:
-                parsed['latitude'] = int(data[2:])
-            elif data.startswith("LN") and len(data) > 2:
-                parsed['longitude'] = int(data[2:])
-            elif data.startswith("BV") and len(data) > 2:
-                parts = data[2:].split(',')
-                if len(parts) == 2:
-                    parsed['voltage'] = float(parts[0])
-                    parsed['remaining'] = int(parts[1])
-            elif data.startswith("ST") and len(data) > 2:
-                parsed['status'] = data[2:]
-        except ValueError as e:
-            print(f"Parse error: {e} for data: {data}")
-            
-        return parsed
\ No newline at end of file
+        """Parse payload satu paket LoRa mentah (AL/LT/LN/BV/ST), tanpa reassembly.
+
+        Return dict field (kosong jika tidak valid). Untuk stream paket
+        lengkap dengan state machine siklus, lihat gcs_rawpacket.
+        """
+        packet = parse_packet(data)
+        return packet[1] if packet else {}
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""Instrumentasi hot path: timer monotonic per probe + gauge.
+
+Semua probe terdaftar di registry global PERF. Saat PERF.enabled False
+(default) biaya di titik ukur hanya satu cek atribut; aktifkan dari tab
+Performance, `--perf` di headless, atau env GCS_PERF=1.
+
+    @timed('update_charts')
+    def update_charts(self): ...
+
+    if PERF.enabled:
+        start = perf_counter()
+        ...
+        probe.record(perf_counter() - start)
+
+Setiap probe menyimpan histogram kumulatif (LatencyHistogram, log2) dan
+window sampel terakhir untuk p50/p95/max rolling. record() bisa dipanggil
+dari thread mana saja; hitungan bisa sedikit meleset saat race, cukup
+untuk diagnosa.
+"""
+import functools
+import json
+import os
+import time
+from collections import deque
+from time import perf_counter
+
+from gcs_serial import LatencyHistogram
+
+ROLLING_SAMPLES = 512
+RATE_INTERVAL = 0.5  # detik minimum antar perhitungan ulang rate
+
+
+class Probe:
+    __slots__ = ('name', 'histogram', 'recent', 'rate', '_last_count', '_last_time')
+
+    def __init__(self, name, samples=ROLLING_SAMPLES):
+        self.name = name
+        self.histogram = LatencyHistogram()
+        self.recent = deque(maxlen=samples)
+        self.rate = 0.0
+        self._last_count = 0
+        self._last_time = time.monotonic()
+
+    def record(self, seconds):
+        self.histogram.record(seconds)
+        self.recent.append(seconds)
+
+    @property
+    def count(self):
+        return self.histogram.count
+
+    def reset(self):
+        self.histogram.reset()
+        self.recent.clear()
+        self.rate = 0.0
+        self._last_count = 0
+        self._last_time = time.monotonic()
+
+    def snapshot(self):
+        """Statistik dalam detik; `rate` = panggilan/s di interval terakhir"""
+        hist = self.histogram
+        now = time.monotonic()
+        count = hist.count
+        elapsed = now - self._last_time
+        if elapsed >= RATE_INTERVAL:
+            self.rate = (count - self._last_count) / elapsed
+            self._last_count = count
+            self._last_time = now
+        recent = sorted(self.recent)
+        n = len(recent)
+        return {
+            'count': count,
+            'rate': self.rate,
+            'mean': hist.mean(),
+            'p99_bucket': hist.percentile(99),
+            'max': hist.max,
+            'recent_p50': recent[n // 2] if n else 0.0,
+            'recent_p95': recent[min(n - 1, int(n * 0.95))] if n else 0.0,
+            'recent_max': recent[-1] if n else 0.0,
+        }
+
+
+class PerfRegistry:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.probes = {}
+        self.gauges = {}
+        self.started = time.time()
+
+    def probe(self, name):
+        probe = self.probes.get(name)
+        if probe is None:
+            probe = self.probes[name] = Probe(name)
+        return probe
+
+    def record(self, name, seconds):
+        if self.enabled:
+            self.probe(name).record(seconds)
+
+    def gauge(self, name, func):
+        """Daftarkan callable tanpa argumen yang dibaca saat snapshot"""
+        self.gauges[name] = func
+
+    def reset(self):
+        for probe in self.probes.values():
+            probe.reset()
+        self.started = time.time()
+
+    def snapshot(self):
+        gauges = {}
+        for name, func in self.gauges.items():
+            try:
+                gauges[name] = func()
+            except Exception as e:
+                gauges[name] = f"error: {e}"
+        return {
+            'created': time.time(),
+            'since': self.started,
+            'enabled': self.enabled,
+            'probes': {name: probe.snapshot() for name, probe in sorted(self.probes.items())},
+            'gauges': gauges,
+        }
+
+    def dump(self, path):
+        """Simpan snapshot + histogram lengkap sebagai JSON untuk analisa offline"""
+        data = self.snapshot()
+        for name, probe in self.probes.items():
+            data['probes'][name]['histogram'] = probe.histogram.to_dict()
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
+        return path
+
+    def summary_lines(self):
+        lines = []
+        for name, stats in self.snapshot()['probes'].items():
+            if stats['count']:
+                lines.append(f"{name}: n={stats['count']} mean={stats['mean'] * 1e3:.3f}ms "
+                             f"p95={stats['recent_p95'] * 1e3:.3f}ms "
+                             f"max={stats['max'] * 1e3:.3f}ms")
+        return lines
+
+
+PERF = PerfRegistry(enabled=os.environ.get('GCS_PERF', '') not in ('', '0'))
+
+
+def timed(name, registry=PERF):
+    """Decorator: catat durasi fungsi ke probe `name` jika registry aktif"""
+    def decorator(func):
+        probe = registry.probe(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                probe.record(perf_counter() - start)
+        return wrapper
+    return decorator
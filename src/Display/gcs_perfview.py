@@ -0,0 +1,57 @@
+from tkinter import ttk
+
+COLUMNS = ("Probe", "Calls", "Rate/s", "Mean ms", "p50 ms", "p95 ms", "Max ms")
+
+
+def _ms(seconds):
+    return f"{seconds * 1e3:.3f}"
+
+
+class PerfPanel:
+    """Tabel probe + gauge dari PerfRegistry, di-refresh beberapa kali per detik.
+
+    Baris Treeview dibuat sekali per probe/gauge lalu hanya isinya yang
+    diganti, sama seperti VirtualLogView.
+    """
+
+    def __init__(self, parent, registry):
+        self.registry = registry
+        self._rows = {}
+
+        self.tree = ttk.Treeview(parent, columns=COLUMNS, show="headings", height=14)
+        for col in COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=150 if col == "Probe" else 90,
+                             anchor="w" if col == "Probe" else "e")
+
+        self.gauge_tree = ttk.Treeview(parent, columns=("Gauge", "Value"), show="headings", height=8)
+        self.gauge_tree.heading("Gauge", text="Gauge")
+        self.gauge_tree.heading("Value", text="Value")
+        self.gauge_tree.column("Gauge", width=200, anchor="w")
+        self.gauge_tree.column("Value", width=200, anchor="e")
+
+    def pack(self):
+        self.tree.pack(side="top", fill="both", expand=True)
+        self.gauge_tree.pack(side="top", fill="x")
+
+    def _set(self, tree, key, values):
+        iid = self._rows.get((tree, key))
+        if iid is None:
+            self._rows[(tree, key)] = tree.insert("", "end", values=values)
+        else:
+            tree.item(iid, values=values)
+
+    def refresh(self):
+        snapshot = self.registry.snapshot()
+        for name, stats in snapshot['probes'].items():
+            self._set(self.tree, name, (
+                name, stats['count'], f"{stats['rate']:.1f}", _ms(stats['mean']),
+                _ms(stats['recent_p50']), _ms(stats['recent_p95']), _ms(stats['max'])))
+        for name, value in snapshot['gauges'].items():
+            self._set(self.gauge_tree, name, (name, value))
+        return snapshot
+
+    def clear(self):
+        for (tree, _), iid in self._rows.items():
+            tree.delete(iid)
+        self._rows = {}
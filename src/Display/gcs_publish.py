@@ -0,0 +1,349 @@
+"""Fan-out frame telemetry ke banyak subscriber lokal.
+
+TelemetryPublisher dipanggil dari thread ingest untuk setiap frame
+(setelah fusion) dan meneruskannya ke:
+
+- UDP unicast / multicast (mis. 239.255.42.99:14560): satu datagram JSON
+  per frame, socket non-blocking, datagram dibuang jika buffer penuh;
+- TCP JSON lines dan WebSocket (teks JSON) untuk jumlah client bebas,
+  dilayani event loop asyncio di thread sendiri;
+- MAVLink v1 GLOBAL_POSITION_INT / SYS_STATUS / STATUSTEXT via UDP
+  (opsional) supaya mission planner bisa membaca backup LoRa langsung.
+
+Frame di-serialize sekali per frame (JSON, lalu satu frame WebSocket),
+bukan per client. Client yang lambat tidak menahan ingest: write ke
+transport asyncio tidak blocking, dan client yang buffer kirimnya
+melewati `max_client_buffer` langsung diputus. Tidak bergantung pada
+GUI, jadi dipakai sama oleh gcs_main dan gcs_headless.
+
+Contoh subscriber:
+    nc 127.0.0.1 14561
+    websocat ws://127.0.0.1:14562
+"""
+import asyncio
+import base64
+import hashlib
+import ipaddress
+import json
+import socket
+import struct
+import threading
+import time
+
+from gcs_perf import timed
+
+MAX_CLIENT_BUFFER = 256 * 1024   # byte tertahan per client sebelum di-drop
+MAX_HANDSHAKE = 8192
+MULTICAST_TTL = 1                # multicast hanya di jaringan lokal
+STOP_TIMEOUT = 5.0
+WS_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'  # RFC 6455
+
+# MAVLink v1: msgid -> CRC_EXTRA (common.xml)
+MAV_STX = 0xFE
+MAVLINK_SYS_STATUS = 1
+MAVLINK_GLOBAL_POSITION_INT = 33
+MAVLINK_STATUSTEXT = 253
+MAV_CRC_EXTRA = {MAVLINK_SYS_STATUS: 124, MAVLINK_GLOBAL_POSITION_INT: 104,
+                 MAVLINK_STATUSTEXT: 83}
+MAV_SEVERITY_WARNING = 4
+MAV_SEVERITY_INFO = 6
+
+GLOBAL_POSITION_INT = struct.Struct('<IiiiihhhH')
+SYS_STATUS = struct.Struct('<IIIHHhHHHHHHb')
+STATUSTEXT = struct.Struct('<B50s')
+
+
+def parse_address(value, default_host='127.0.0.1'):
+    """'host:port' atau 'port' -> (host, port)"""
+    host, _, port = str(value).rpartition(':')
+    return host or default_host, int(port)
+
+
+def encode_json(timestamp, data):
+    """Satu frame -> JSON line (bytes), format sama dengan --output headless"""
+    return (json.dumps(dict(data, timestamp=timestamp), separators=(',', ':')) + '\n').encode()
+
+
+def websocket_frame(payload):
+    """Frame teks WebSocket server -> client (tanpa mask)"""
+    n = len(payload)
+    if n < 126:
+        header = struct.pack('!BB', 0x81, n)
+    elif n < 1 << 16:
+        header = struct.pack('!BBH', 0x81, 126, n)
+    else:
+        header = struct.pack('!BBQ', 0x81, 127, n)
+    return header + payload
+
+
+def websocket_accept(request):
+    """Header HTTP upgrade -> nilai Sec-WebSocket-Accept, atau None"""
+    for line in request.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'sec-websocket-key':
+            digest = hashlib.sha1(value.strip() + WS_GUID).digest()
+            return base64.b64encode(digest)
+    return None
+
+
+def x25_crc(data, crc=0xFFFF):
+    """CRC-16/MCRF4XX yang dipakai MAVLink"""
+    for b in data:
+        tmp = (b ^ crc) & 0xFF
+        tmp = (tmp ^ (tmp << 4)) & 0xFF
+        crc = ((crc >> 8) ^ (tmp << 8) ^ (tmp << 3) ^ (tmp >> 4)) & 0xFFFF
+    return crc
+
+
+class MavlinkEncoder:
+    """Re-encode frame LoRa jadi pesan MAVLink v1 (tanpa pymavlink).
+
+    altitude LoRa adalah relative_alt transmitter, jadi dipakai untuk alt
+    dan relative_alt. STATUSTEXT hanya dikirim saat status berubah.
+    """
+
+    def __init__(self, system_id=1, component_id=1):
+        self.system_id = system_id
+        self.component_id = component_id
+        self.seq = 0
+        self.started = time.monotonic()
+        self.errors = 0
+        self._status = None
+
+    def message(self, msgid, payload):
+        header = bytes((len(payload), self.seq, self.system_id, self.component_id, msgid))
+        self.seq = (self.seq + 1) & 0xFF
+        crc = x25_crc(header + payload)
+        crc = x25_crc((MAV_CRC_EXTRA[msgid],), crc)
+        return bytes((MAV_STX,)) + header + payload + struct.pack('<H', crc)
+
+    def encode(self, data):
+        """Pesan MAVLink untuk satu frame (list bytes)"""
+        messages = []
+        try:
+            if 'altitude' in data and 'latitude' in data and 'longitude' in data:
+                boot_ms = int((time.monotonic() - self.started) * 1000) & 0xFFFFFFFF
+                alt_mm = int(round(data['altitude'] * 1000))
+                messages.append(self.message(MAVLINK_GLOBAL_POSITION_INT, GLOBAL_POSITION_INT.pack(
+                    boot_ms, data['latitude'], data['longitude'], alt_mm, alt_mm,
+                    0, 0, 0, 0xFFFF)))  # kecepatan tidak dikirim LoRa, heading unknown
+            if 'voltage' in data:
+                messages.append(self.message(MAVLINK_SYS_STATUS, SYS_STATUS.pack(
+                    0, 0, 0, 0, int(round(data['voltage'] * 1000)), -1,
+                    0, 0, 0, 0, 0, 0, data.get('remaining', -1))))
+        except struct.error:
+            self.errors += 1
+        status = data.get('status')
+        if status and status != self._status:
+            self._status = status
+            severity = MAV_SEVERITY_INFO if status == 'OK' else MAV_SEVERITY_WARNING
+            messages.append(self.message(MAVLINK_STATUSTEXT, STATUSTEXT.pack(
+                severity, status.encode('utf-8', errors='ignore')[:50])))
+        return messages
+
+
+class _Client(asyncio.Protocol):
+    """Satu subscriber TCP ('tcp') atau WebSocket ('ws')"""
+
+    def __init__(self, publisher, kind):
+        self.publisher = publisher
+        self.kind = kind
+        self.transport = None
+        self.ready = kind == 'tcp'
+        self._request = b''
+
+    def connection_made(self, transport):
+        self.transport = transport
+        if self.ready:
+            self.publisher._add_client(self)
+
+    def data_received(self, data):
+        if self.kind == 'tcp':
+            return  # stream satu arah
+        if not self.ready:
+            self._handshake(data)
+        elif data[0] & 0x0F == 0x8:
+            # Close frame dari client; pesan client lain diabaikan
+            self.transport.write(b'\x88\x00')
+            self.transport.close()
+
+    def _handshake(self, data):
+        self._request += data
+        if b'\r\n\r\n' not in self._request:
+            if len(self._request) > MAX_HANDSHAKE:
+                self.transport.abort()
+            return
+        accept = websocket_accept(self._request)
+        if accept is None:
+            self.transport.write(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n')
+            self.transport.close()
+            return
+        self.transport.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n'
+                             b'Connection: Upgrade\r\nSec-WebSocket-Accept: ' + accept + b'\r\n\r\n')
+        self.ready = True
+        self._request = b''
+        self.publisher._add_client(self)
+
+    def connection_lost(self, exc):
+        self.publisher._remove_client(self)
+
+
+class TelemetryPublisher:
+    """Publisher frame ke UDP/multicast, TCP, WebSocket dan MAVLink.
+
+    Alamat berupa 'host:port'; tcp/ws tanpa host listen di 127.0.0.1,
+    port 0 memilih port bebas (lihat `addresses` setelah start()).
+    `udp_interface` memilih interface multicast (default: route sistem).
+    publish() aman dipanggil dari thread mana pun.
+    """
+
+    def __init__(self, udp=None, tcp=None, ws=None, mavlink=None, udp_interface=None,
+                 max_client_buffer=MAX_CLIENT_BUFFER):
+        self.udp_target = parse_address(udp) if udp else None
+        self.mavlink_target = parse_address(mavlink) if mavlink else None
+        self.listen = {kind: parse_address(spec) for kind, spec in (('tcp', tcp), ('ws', ws)) if spec}
+        self.max_client_buffer = max_client_buffer
+        self.mavlink = MavlinkEncoder() if mavlink else None
+        self.sock = None
+        if udp or mavlink:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.sock.setblocking(False)
+            if self.udp_target and ipaddress.ip_address(
+                    socket.gethostbyname(self.udp_target[0])).is_multicast:
+                self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, MULTICAST_TTL)
+                if udp_interface:
+                    # IP interface lokal untuk multicast, mis. 127.0.0.1 untuk loopback
+                    self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF,
+                                         socket.inet_aton(udp_interface))
+        self.clients = {'tcp': set(), 'ws': set()}
+        self.addresses = {}
+        self.frames = 0
+        self.udp_dropped = 0
+        self.mavlink_messages = 0
+        self.clients_total = 0
+        self.clients_dropped = 0
+        self._servers = []
+        self._loop = None
+        self._thread = None
+
+    # --- Lifecycle ---
+
+    def start(self):
+        """Buka server TCP/WebSocket di thread event loop sendiri"""
+        if not self.listen or self._loop is not None:
+            return
+        loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=loop.run_forever, name="publish-loop", daemon=True)
+        self._thread.start()
+        self._loop = loop
+        try:
+            asyncio.run_coroutine_threadsafe(self._open(), loop).result(STOP_TIMEOUT)
+        except BaseException:
+            # Server yang sudah terbuka ditutup lagi (mis. port ws sudah dipakai)
+            asyncio.run_coroutine_threadsafe(self._close(), loop).result(STOP_TIMEOUT)
+            self._stop_loop()
+            raise
+
+    async def _open(self):
+        loop = asyncio.get_running_loop()
+        for kind, (host, port) in self.listen.items():
+            server = await loop.create_server(lambda kind=kind: _Client(self, kind), host, port)
+            self._servers.append(server)
+            self.addresses[kind] = server.sockets[0].getsockname()[:2]
+
+    async def _close(self):
+        for server in self._servers:
+            server.close()
+        for clients in self.clients.values():
+            for client in list(clients):
+                client.transport.abort()
+            clients.clear()
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers = []
+
+    def stop(self):
+        if self._loop is not None:
+            future = asyncio.run_coroutine_threadsafe(self._close(), self._loop)
+            try:
+                future.result(STOP_TIMEOUT)
+            finally:
+                self._stop_loop()
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def _stop_loop(self):
+        loop = self._loop
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(STOP_TIMEOUT)
+        loop.close()
+        self._loop = None
+        self._thread = None
+
+    # --- Publish ---
+
+    @timed('publish')
+    def publish(self, timestamp, data, payload=None):
+        """Kirim satu frame; `payload` = hasil encode_json jika sudah ada"""
+        self.frames += 1
+        if payload is None:
+            payload = encode_json(timestamp, data)
+        if self.udp_target:
+            self._sendto(payload, self.udp_target)
+        if self.mavlink:
+            for message in self.mavlink.encode(data):
+                self.mavlink_messages += 1
+                self._sendto(message, self.mavlink_target)
+        loop = self._loop
+        if loop is not None and (self.clients['tcp'] or self.clients['ws']):
+            loop.call_soon_threadsafe(self._broadcast, payload)
+
+    def _sendto(self, data, target):
+        try:
+            self.sock.sendto(data, target)
+        except OSError:
+            # Buffer penuh / tidak ada listener: buang, jangan tahan ingest
+            self.udp_dropped += 1
+
+    def _broadcast(self, payload):
+        # Di thread event loop; satu encode per jenis client
+        for kind, clients in self.clients.items():
+            if not clients:
+                continue
+            data = payload if kind == 'tcp' else websocket_frame(payload[:-1])
+            for client in list(clients):
+                transport = client.transport
+                if transport.get_write_buffer_size() > self.max_client_buffer:
+                    self.clients_dropped += 1
+                    clients.discard(client)
+                    transport.abort()
+                    continue
+                transport.write(data)
+
+    def _add_client(self, client):
+        self.clients_total += 1
+        self.clients[client.kind].add(client)
+
+    def _remove_client(self, client):
+        self.clients[client.kind].discard(client)
+
+    # --- Statistik ---
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'addresses': dict(self.addresses),
+            'tcp_clients': len(self.clients['tcp']),
+            'ws_clients': len(self.clients['ws']),
+            'clients_total': self.clients_total,
+            'clients_dropped': self.clients_dropped,
+            'udp_dropped': self.udp_dropped,
+            'mavlink_messages': self.mavlink_messages,
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return (f"{stats['frames']} frames, {stats['tcp_clients']} tcp + {stats['ws_clients']} ws "
+                f"clients ({stats['clients_dropped']} dropped), "
+                f"udp dropped {stats['udp_dropped']}, mavlink {stats['mavlink_messages']} msgs")
@@ -0,0 +1,628 @@
+"""Query engine untuk analisa flight log setelah terbang.
+
+FlightIndex menyimpan telemetri sebagai kolom NumPy yang terurut waktu,
+dibagi per blok BLOCK_SIZE baris. Setiap blok punya zone map: min/max per
+kolom numerik (plus penanda NaN) dan himpunan kode status. Filter dicek
+dulu terhadap zone map: blok yang pasti tidak cocok dilewati, blok yang
+pasti cocok diambil utuh tanpa memeriksa baris, dan hanya blok sisanya
+yang dievaluasi per baris (vectorized).
+
+    index = FlightIndex.open(['flight.lfr'])
+    result = index.query("rssi < -110 or status != OK", '14:02', '14:10')
+    result.aggregate('slope(voltage)')        # V per menit
+    result.group_by('slope(voltage)', 60)     # slope tiap menit
+
+Bahasa filter (lihat gcs_filter): perbandingan `kolom op nilai` (op:
+< <= > >= == != =) digabung dengan and / or / not dan kurung. Nilai
+status berupa kata (OK) atau string berkutip ("Low Battery"), dengan
+==, != atau contains (tanpa membedakan huruf besar/kecil). Rentang waktu memakai
+HH:MM[:SS] (tanggal diambil dari awal log), ISO datetime, atau epoch.
+
+Sumber index: TelemetryStore (GUI), file .lfr, atau cache .npz (save()).
+"""
+import os
+import re
+import sys
+import json
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import numpy as np
+
+from gcs_filter import CANONICAL_OPS, OPS, FilterParser
+from gcs_recorder import FRAME_STRUCT, RECORD_FRAME, iter_records
+from gcs_store import COLUMNS, COLUMN_NAMES, REMAINING_UNKNOWN
+
+BLOCK_SIZE = 4096
+SLOPE_INTERVAL = 60.0  # slope dilaporkan per menit
+INDEX_VERSION = 1
+
+DTYPES = {name: np.dtype(code) for name, code in COLUMNS}
+NUMERIC_COLUMNS = tuple(name for name in COLUMN_NAMES if name != 'status')
+
+# Layout FRAME_STRUCT recorder ('<dfiifhffi') + status di sisa payload
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'), ('altitude', '<f4'), ('latitude', '<i4'), ('longitude', '<i4'),
+    ('voltage', '<f4'), ('remaining', '<i2'), ('rssi', '<f4'), ('snr', '<f4'),
+    ('cycle_time', '<i4'),
+])
+assert RECORD_DTYPE.itemsize == FRAME_STRUCT.size
+
+NONE, SOME, ALL = 0, 1, 2  # hasil zone map per blok
+
+AGG_RE = re.compile(r'^\s*(\w+)\s*(?:\(\s*(\w+)\s*\))?\s*$')
+
+
+def known_values(name, values):
+    """Nilai kolom untuk filter/agregasi: remaining REMAINING_UNKNOWN -> NaN.
+
+    Sama dengan evaluasi rule (gcs_rules), jadi frame tanpa data baterai
+    tidak cocok dengan `remaining <= 20` dan tidak ikut min/mean.
+    """
+    if name != 'remaining':
+        return values
+    values = values.astype(np.float64)
+    values[values == REMAINING_UNKNOWN] = np.nan
+    return values
+
+
+# --- Filter ---
+
+class Compare:
+    def __init__(self, column, op, value):
+        self.column = column
+        self.op = CANONICAL_OPS.get(op, op)
+        self.value = value
+
+    def __repr__(self):
+        return f"{self.column} {self.op} {self.value!r}"
+
+    def zone(self, index, blocks):
+        if self.column == 'status':
+            return self._status_zone(index, blocks)
+        lo, hi, has_nan = (arr[blocks] for arr in index.zone_maps[self.column])
+        v = self.value
+        exact = ~has_nan
+        op = self.op
+        if op == '<':
+            none, full = lo >= v, (hi < v) & exact
+        elif op == '<=':
+            none, full = lo > v, (hi <= v) & exact
+        elif op == '>':
+            none, full = hi <= v, (lo > v) & exact
+        elif op == '>=':
+            none, full = hi < v, (lo >= v) & exact
+        elif op == '==':
+            none, full = (lo > v) | (hi < v), (lo == v) & (hi == v) & exact
+        else:
+            # NaN != v bernilai True, jadi NaN tidak mengubah kasus ALL
+            none, full = (lo == v) & (hi == v) & exact, (lo > v) | (hi < v)
+        return np.where(none, NONE, np.where(full, ALL, SOME)).astype(np.int8)
+
+    def _status_codes(self, index):
+        if self.op == 'contains':
+            value = self.value.lower()
+            return [code for code, status in enumerate(index.status_table) if value in status.lower()]
+        code = index.status_code(self.value)
+        return [] if code is None else [code]
+
+    def _status_zone(self, index, blocks):
+        present = index.status_blocks[blocks]
+        codes = self._status_codes(index)
+        matching = present[:, codes].sum(axis=1)
+        eq = np.where(matching == 0, NONE,
+                      np.where(matching == present.sum(axis=1), ALL, SOME)).astype(np.int8)
+        return ALL - eq if self.op == '!=' else eq
+
+    def mask(self, index, get):
+        if self.column == 'status':
+            eq = np.isin(get('status'), self._status_codes(index))
+            return ~eq if self.op == '!=' else eq
+        return OPS[self.op](known_values(self.column, get(self.column)), self.value)
+
+
+class And:
+    def __init__(self, left, right):
+        self.left, self.right = left, right
+
+    def __repr__(self):
+        return f"({self.left!r} and {self.right!r})"
+
+    def zone(self, index, blocks):
+        return np.minimum(self.left.zone(index, blocks), self.right.zone(index, blocks))
+
+    def mask(self, index, get):
+        return self.left.mask(index, get) & self.right.mask(index, get)
+
+
+class Or:
+    def __init__(self, left, right):
+        self.left, self.right = left, right
+
+    def __repr__(self):
+        return f"({self.left!r} or {self.right!r})"
+
+    def zone(self, index, blocks):
+        return np.maximum(self.left.zone(index, blocks), self.right.zone(index, blocks))
+
+    def mask(self, index, get):
+        return self.left.mask(index, get) | self.right.mask(index, get)
+
+
+class Not:
+    def __init__(self, inner):
+        self.inner = inner
+
+    def __repr__(self):
+        return f"not {self.inner!r}"
+
+    def zone(self, index, blocks):
+        return ALL - self.inner.zone(index, blocks)
+
+    def mask(self, index, get):
+        return ~self.inner.mask(index, get)
+
+
+class _Parser(FilterParser):
+    columns = COLUMN_NAMES
+
+    def compare(self, func, column, op, value):
+        return Compare(column, op, value)
+
+    def and_(self, left, right):
+        return And(left, right)
+
+    def or_(self, left, right):
+        return Or(left, right)
+
+    def not_(self, inner):
+        return Not(inner)
+
+
+def parse_query(text):
+    """String filter -> predicate (None untuk string kosong)"""
+    if text is None or not text.strip():
+        return None
+    return _Parser(text).parse()
+
+
+def _parse_time(value, reference):
+    """Return (epoch, time_of_day?)"""
+    if value is None or value == '':
+        return None, False
+    if isinstance(value, (int, float)):
+        return float(value), False
+    value = value.strip()
+    try:
+        return float(value), False
+    except ValueError:
+        pass
+    for fmt in ('%H:%M', '%H:%M:%S', '%H:%M:%S.%f'):
+        try:
+            tod = datetime.strptime(value, fmt).time()
+        except ValueError:
+            continue
+        day = datetime.fromtimestamp(reference).date() if reference is not None else datetime.now().date()
+        return datetime.combine(day, tod).timestamp(), True
+    try:
+        return datetime.fromisoformat(value).timestamp(), False
+    except ValueError:
+        raise ValueError(f"Format waktu tidak dikenal: {value!r} (HH:MM[:SS], ISO, atau epoch)")
+
+
+def _ranges(starts, ends):
+    """Gabungan arange(starts[i], ends[i]) tanpa loop Python"""
+    lens = ends - starts
+    total = int(lens.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - (np.cumsum(lens) - lens), lens)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+# --- Index ---
+
+class FlightIndex:
+    def __init__(self, columns, status_table, block_size=BLOCK_SIZE):
+        timestamps = columns['timestamp']
+        if len(timestamps) > 1 and np.any(timestamps[1:] < timestamps[:-1]):
+            order = np.argsort(timestamps, kind='stable')
+            columns = {name: col[order] for name, col in columns.items()}
+        self.columns = columns
+        self.status_table = list(status_table)
+        self._status_codes = {status: code for code, status in enumerate(self.status_table)}
+        self.block_size = block_size
+        self._build_zone_maps()
+
+    def __len__(self):
+        return len(self.columns['timestamp'])
+
+    # --- Konstruksi ---
+
+    @classmethod
+    def from_store(cls, store, block_size=BLOCK_SIZE):
+        """Index dari TelemetryStore (termasuk baris yang sudah di-spill)"""
+        parts = {name: [] for name in COLUMN_NAMES}
+        for chunk in store.iter_snapshot(store.snapshot()):
+            if not len(chunk['timestamp']):
+                continue
+            for name in COLUMN_NAMES:
+                parts[name].append(np.frombuffer(chunk[name], dtype=DTYPES[name]))
+        columns = {name: np.concatenate(arrs) if arrs else np.empty(0, DTYPES[name])
+                   for name, arrs in parts.items()}
+        return cls(columns, store.status_table, block_size)
+
+    @classmethod
+    def from_logs(cls, paths, block_size=BLOCK_SIZE):
+        """Index dari satu atau beberapa flight log .lfr (record rusak di ekor dilewati)"""
+        size = FRAME_STRUCT.size
+        fixed = bytearray()
+        statuses = []
+        for path in paths:
+            for kind, payload in iter_records(path):
+                if kind == RECORD_FRAME:
+                    fixed += payload[:size]
+                    statuses.append(payload[size:])
+        records = np.frombuffer(bytes(fixed), dtype=RECORD_DTYPE)
+        table = []
+        codes_by_status = {}
+        codes = np.empty(len(statuses), dtype=DTYPES['status'])
+        for i, raw in enumerate(statuses):
+            code = codes_by_status.get(raw)
+            if code is None:
+                code = codes_by_status[raw] = len(table)
+                table.append(raw.decode('utf-8', errors='ignore'))
+            codes[i] = code
+        columns = {name: records[name].astype(DTYPES[name]) for name in RECORD_DTYPE.names}
+        columns['status'] = codes
+        return cls(columns, table, block_size)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            columns = {name: data[name] for name in COLUMN_NAMES}
+        return cls(columns, meta['status_table'], meta['block_size'])
+
+    @classmethod
+    def open(cls, paths):
+        """Satu cache .npz, atau satu/lebih flight log .lfr"""
+        if isinstance(paths, str):
+            paths = [paths]
+        if len(paths) == 1 and paths[0].endswith('.npz'):
+            return cls.load(paths[0])
+        return cls.from_logs(paths)
+
+    def save(self, path):
+        meta = {'version': INDEX_VERSION, 'status_table': self.status_table,
+                'block_size': self.block_size}
+        np.savez(path, meta=np.array(json.dumps(meta)), **self.columns)
+        return path
+
+    def _build_zone_maps(self):
+        n = len(self)
+        bs = self.block_size
+        starts = np.arange(0, n, bs, dtype=np.int64)
+        self.block_starts = starts
+        self.block_ends = np.minimum(starts + bs, n)
+        self.zone_maps = {}
+        for name in NUMERIC_COLUMNS:
+            col = known_values(name, self.columns[name])
+            if not n:
+                empty = np.empty(0, dtype=col.dtype)
+                self.zone_maps[name] = (empty, empty, np.empty(0, dtype=bool))
+            elif col.dtype.kind == 'f':
+                # fmin/fmax mengabaikan NaN; blok yang semua NaN tetap NaN
+                self.zone_maps[name] = (np.fmin.reduceat(col, starts),
+                                        np.fmax.reduceat(col, starts),
+                                        np.logical_or.reduceat(np.isnan(col), starts))
+            else:
+                self.zone_maps[name] = (np.minimum.reduceat(col, starts),
+                                        np.maximum.reduceat(col, starts),
+                                        np.zeros(len(starts), dtype=bool))
+        present = np.zeros((len(starts), max(len(self.status_table), 1)), dtype=bool)
+        if n:
+            present[np.arange(n) // bs, self.columns['status']] = True
+        self.status_blocks = present
+
+    # --- Query ---
+
+    def status_code(self, status):
+        return self._status_codes.get(status)
+
+    @property
+    def t_first(self):
+        return float(self.columns['timestamp'][0]) if len(self) else None
+
+    @property
+    def t_last(self):
+        return float(self.columns['timestamp'][-1]) if len(self) else None
+
+    def time_bounds(self, t_start=None, t_end=None):
+        """Parse batas waktu; HH:MM memakai tanggal awal log, lewat tengah malam jika perlu"""
+        start, start_tod = _parse_time(t_start, self.t_first)
+        end, end_tod = _parse_time(t_end, self.t_first)
+        if start is not None and end is not None and start_tod and end_tod and end <= start:
+            end += timedelta(days=1).total_seconds()
+        return start, end
+
+    def row_range(self, t_start=None, t_end=None):
+        """(start, stop) baris dengan t_start <= timestamp < t_end"""
+        timestamps = self.columns['timestamp']
+        start, end = self.time_bounds(t_start, t_end)
+        r0 = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        r1 = len(self) if end is None else int(np.searchsorted(timestamps, end, side='left'))
+        return r0, max(r0, r1)
+
+    def query(self, where=None, t_start=None, t_end=None):
+        began = perf_counter()
+        predicate = parse_query(where) if isinstance(where, str) or where is None else where
+        r0, r1 = self.row_range(t_start, t_end)
+        bs = self.block_size
+        blocks = slice(r0 // bs, -(-r1 // bs))
+        starts = np.maximum(self.block_starts[blocks], r0)
+        ends = np.minimum(self.block_ends[blocks], r1)
+        if predicate is None:
+            zone = np.full(len(starts), ALL, dtype=np.int8)
+        else:
+            zone = predicate.zone(self, blocks)
+
+        selected = zone > NONE
+        starts, ends = starts[selected], ends[selected]
+        rows = _ranges(starts, ends)
+        check = np.repeat(zone[selected] == SOME, ends - starts)
+        rows_checked = int(check.sum())
+        if rows_checked:
+            idx = rows[check]
+            cache = {}
+
+            def get(name):
+                values = cache.get(name)
+                if values is None:
+                    values = cache[name] = self.columns[name][idx]
+                return values
+
+            keep = np.ones(len(rows), dtype=bool)
+            keep[check] = predicate.mask(self, get)
+            rows = rows[keep]
+
+        stats = {
+            'rows': len(rows),
+            'rows_total': len(self),
+            'rows_checked': rows_checked,
+            'blocks': len(zone),
+            'blocks_skipped': int((zone == NONE).sum()),
+            'blocks_full': int((zone == ALL).sum()),
+            'blocks_checked': int((zone == SOME).sum()),
+            'elapsed': perf_counter() - began,
+        }
+        return QueryResult(self, rows, stats)
+
+    def memory_usage(self):
+        total = sum(col.nbytes for col in self.columns.values())
+        total += sum(arr.nbytes for maps in self.zone_maps.values() for arr in maps)
+        return total + self.status_blocks.nbytes
+
+
+# --- Hasil + agregasi ---
+
+def parse_aggregate(spec):
+    """'mean(rssi)' -> ('mean', 'rssi'); 'count' -> ('count', None)"""
+    m = AGG_RE.match(spec)
+    if not m:
+        raise ValueError(f"Agregasi tidak valid: {spec!r} (contoh: mean(rssi), slope(voltage), count)")
+    func, column = m.group(1).lower(), m.group(2)
+    if func not in AGGREGATES:
+        raise ValueError(f"Fungsi agregasi tidak dikenal: {func!r} (pilihan: {', '.join(AGGREGATES)})")
+    if func != 'count' and column is None:
+        raise ValueError(f"{func} butuh kolom, mis. {func}(voltage)")
+    if column is not None and column not in NUMERIC_COLUMNS:
+        raise ValueError(f"Kolom numerik tidak dikenal: {column!r}")
+    return func, column
+
+
+def _slope(t, v):
+    if len(v) < 2:
+        return float('nan')
+    x = t - t.mean()
+    denom = (x * x).sum()
+    if denom == 0:
+        return float('nan')
+    return float((x * (v - v.mean())).sum() / denom * SLOPE_INTERVAL)
+
+
+AGGREGATES = {
+    'count': lambda t, v: float(len(v)),
+    'min': lambda t, v: float(v.min()) if len(v) else float('nan'),
+    'max': lambda t, v: float(v.max()) if len(v) else float('nan'),
+    'mean': lambda t, v: float(v.mean()) if len(v) else float('nan'),
+    'std': lambda t, v: float(v.std()) if len(v) else float('nan'),
+    'sum': lambda t, v: float(v.sum()),
+    'first': lambda t, v: float(v[0]) if len(v) else float('nan'),
+    'last': lambda t, v: float(v[-1]) if len(v) else float('nan'),
+    'slope': _slope,
+}
+
+
+class QueryResult:
+    """Baris hasil query (index terurut waktu) + agregasi vectorized"""
+
+    def __init__(self, index, rows, stats):
+        self.index = index
+        self.rows = rows
+        self.stats = stats
+
+    def __len__(self):
+        return len(self.rows)
+
+    def column(self, name):
+        return self.index.columns[name][self.rows]
+
+    def records(self, limit=None):
+        """Yield dict per baris (status sudah di-decode)"""
+        rows = self.rows if limit is None else self.rows[:limit]
+        columns = self.index.columns
+        table = self.index.status_table
+        picked = {name: columns[name][rows].tolist() for name in COLUMN_NAMES}
+        for i in range(len(rows)):
+            record = {name: picked[name][i] for name in COLUMN_NAMES}
+            record['status'] = table[record['status']]
+            yield record
+
+    def _series(self, column):
+        t = self.column('timestamp')
+        if column is None:
+            return t, t
+        v = known_values(column, self.column(column)).astype(np.float64, copy=False)
+        finite = ~np.isnan(v)
+        if not finite.all():
+            t, v = t[finite], v[finite]
+        return t, v
+
+    def aggregate(self, spec):
+        """Satu nilai untuk seluruh hasil; slope dalam satuan per menit"""
+        func, column = parse_aggregate(spec)
+        t, v = self._series(column)
+        return AGGREGATES[func](t, v)
+
+    def group_by(self, spec, seconds):
+        """Agregasi per interval waktu: (start_times, values, counts), interval kosong dilewati"""
+        _check_interval(seconds)
+        func, column = parse_aggregate(spec)
+        t, v = self._series(column)
+        if not len(t):
+            empty = np.empty(0)
+            return empty, empty, np.empty(0, dtype=np.int64)
+        origin = t[0] - t[0] % seconds
+        bins = ((t - origin) // seconds).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        counts = np.diff(np.r_[starts, len(t)])
+        group_start = origin + bins[starts] * seconds
+        if func == 'count':
+            values = counts.astype(np.float64)
+        elif func in ('min', 'max', 'sum'):
+            ufunc = {'min': np.minimum, 'max': np.maximum, 'sum': np.add}[func]
+            values = ufunc.reduceat(v, starts)
+        elif func == 'first':
+            values = v[starts]
+        elif func == 'last':
+            values = v[starts + counts - 1]
+        elif func in ('mean', 'std'):
+            values = np.add.reduceat(v, starts) / counts
+            if func == 'std':
+                dev = v - np.repeat(values, counts)
+                values = np.sqrt(np.add.reduceat(dev * dev, starts) / counts)
+        else:
+            # slope least squares per grup; x relatif ke awal grup supaya presisi terjaga
+            x = t - np.repeat(group_start, counts)
+            sx = np.add.reduceat(x, starts)
+            sy = np.add.reduceat(v, starts)
+            sxx = np.add.reduceat(x * x, starts)
+            sxy = np.add.reduceat(x * v, starts)
+            denom = counts * sxx - sx * sx
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values = np.where(denom > 0, (counts * sxy - sx * sy) / denom, np.nan) * SLOPE_INTERVAL
+        return group_start, values, counts
+
+
+def _check_interval(seconds):
+    if not seconds > 0:
+        raise ValueError(f"Interval harus > 0 detik, dapat {seconds!r}")
+
+
+def group_table(result, specs, seconds):
+    """Beberapa agregasi per interval -> [(start, [nilai per spec])].
+
+    Tiap agregasi membuang NaN kolomnya sendiri, jadi interval digabung
+    per waktu mulai; nilai yang tidak ada diisi NaN.
+    """
+    table = {}
+    for column, spec in enumerate(specs):
+        for start, value in zip(*result.group_by(spec, seconds)[:2]):
+            table.setdefault(float(start), {})[column] = float(value)
+    nan = float('nan')
+    return [(start, [table[start].get(column, nan) for column in range(len(specs))])
+            for start in sorted(table)]
+
+
+# --- CLI ---
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(' ', 'milliseconds')
+
+
+def format_value(value):
+    if isinstance(value, float):
+        return '' if value != value else '%.7g' % value
+    return str(value)
+
+
+def main(argv=None):
+    import argparse
+    import csv
+
+    ap = argparse.ArgumentParser(description="Query flight log (.lfr) atau cache index (.npz)")
+    ap.add_argument('files', nargs='+')
+    ap.add_argument('-w', '--where', help="filter, mis. 'rssi < -110 or status != OK'")
+    ap.add_argument('--from', dest='t_start', help='awal rentang (HH:MM[:SS], ISO, epoch)')
+    ap.add_argument('--to', dest='t_end', help='akhir rentang (eksklusif)')
+    ap.add_argument('--agg', action='append', default=[],
+                    help="agregasi, mis. 'mean(rssi)', 'slope(voltage)' (per menit), 'count'")
+    ap.add_argument('--every', type=float, help='hitung --agg per interval N detik')
+    ap.add_argument('--limit', type=int, default=20, help='baris hasil yang dicetak (0 = tidak ada)')
+    ap.add_argument('--csv', help='tulis semua baris hasil ke CSV')
+    ap.add_argument('--save-index', help='simpan index ke .npz untuk dibuka ulang lebih cepat')
+    args = ap.parse_args(argv)
+
+    try:
+        began = perf_counter()
+        index = FlightIndex.open(args.files)
+        load_time = perf_counter() - began
+        result = index.query(args.where, args.t_start, args.t_end)
+        for spec in args.agg:
+            parse_aggregate(spec)
+        if args.every is not None:
+            _check_interval(args.every)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    if args.save_index:
+        index.save(args.save_index)
+
+    stats = result.stats
+    print(f"{len(index)} frames loaded in {load_time:.3f}s; "
+          f"{stats['rows']} rows in {stats['elapsed'] * 1e3:.2f} ms "
+          f"(blocks: {stats['blocks']} in range, {stats['blocks_skipped']} skipped, "
+          f"{stats['blocks_full']} full, {stats['blocks_checked']} checked)", file=sys.stderr)
+
+    if args.limit:
+        print('\t'.join(COLUMN_NAMES))
+        for record in result.records(args.limit):
+            record['timestamp'] = format_time(record['timestamp'])
+            print('\t'.join(format_value(record[name]) for name in COLUMN_NAMES))
+        if len(result) > args.limit:
+            print(f"... {len(result) - args.limit} more rows")
+
+    if args.agg and args.every:
+        print('\t'.join(['start'] + args.agg))
+        for start, values in group_table(result, args.agg, args.every):
+            print('\t'.join([format_time(start)] + [format_value(value) for value in values]))
+    else:
+        for spec in args.agg:
+            suffix = ' /min' if spec.strip().lower().startswith('slope') else ''
+            print(f"{spec} = {format_value(result.aggregate(spec))}{suffix}")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMN_NAMES)
+            for record in result.records():
+                record['timestamp'] = format_time(record['timestamp'])
+                writer.writerow([format_value(record[name]) for name in COLUMN_NAMES])
+        print(f"{len(result)} rows written to {os.path.abspath(args.csv)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+import threading
+from datetime import datetime
+from tkinter import filedialog, ttk
+import tkinter as tk
+
+from gcs_query import FlightIndex, format_value, group_table
+from gcs_store import COLUMN_NAMES
+
+MAX_RESULT_ROWS = 1000   # baris yang dimasukkan ke Treeview
+POLL_MS = 100
+
+
+def _time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%H:%M:%S.%f')[:-3]
+
+
+class QueryPanel:
+    """Form query + tabel hasil untuk FlightIndex (lihat gcs_query).
+
+    Sumber default adalah Data Log yang sedang berjalan; index dibangun
+    ulang hanya jika jumlah baris store berubah. "Open Log..." memakai
+    flight log .lfr / cache .npz. Index dibangun di worker thread,
+    query-nya sendiri cukup cepat untuk dijalankan di Tk thread.
+    """
+
+    def __init__(self, parent, store):
+        self.parent = parent
+        self.store = store
+        self.paths = None            # None = Data Log live
+        self.index = None
+        self._index_key = None
+        self._loading = None
+
+        form = ttk.Frame(parent)
+        self.form = form
+        self.where_var = tk.StringVar(value="rssi < -110 or status != OK")
+        self.from_var = tk.StringVar()
+        self.to_var = tk.StringVar()
+        self.agg_var = tk.StringVar(value="count, mean(rssi), slope(voltage)")
+        self.every_var = tk.StringVar()
+
+        fields = (("Where", self.where_var, 50), ("From", self.from_var, 10), ("To", self.to_var, 10),
+                  ("Aggregates", self.agg_var, 32), ("Every (s)", self.every_var, 6))
+        for col, (label, var, width) in enumerate(fields):
+            ttk.Label(form, text=label).grid(row=0, column=col, sticky="w", padx=3)
+            entry = ttk.Entry(form, textvariable=var, width=width)
+            entry.grid(row=1, column=col, sticky="we", padx=3)
+            entry.bind("<Return>", lambda event: self.run())
+        form.columnconfigure(0, weight=1)
+
+        buttons = ttk.Frame(form)
+        buttons.grid(row=1, column=len(fields), padx=3)
+        ttk.Button(buttons, text="Run", command=self.run).pack(side="left")
+        ttk.Button(buttons, text="Open Log...", command=self.open_log).pack(side="left")
+        ttk.Button(buttons, text="Live Data", command=self.use_live).pack(side="left")
+
+        self.source_label = ttk.Label(parent, text="Source: Data Log (live)")
+        self.summary_label = ttk.Label(parent, text="", wraplength=900, justify="left")
+
+        self.tree = ttk.Treeview(parent, show="headings", height=20)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self._set_columns(COLUMN_NAMES)
+
+    def pack(self):
+        self.form.pack(side="top", fill="x", pady=5)
+        self.source_label.pack(side="top", anchor="w", padx=5)
+        self.summary_label.pack(side="top", anchor="w", padx=5, pady=3)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+    def _set_columns(self, columns):
+        self.tree.delete(*self.tree.get_children())
+        self.tree.configure(columns=columns)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=140 if col in ("timestamp", "start") else 90, anchor="e")
+
+    # --- Sumber data ---
+
+    def open_log(self):
+        paths = filedialog.askopenfilenames(
+            filetypes=[("Flight log / index", "*.lfr *.npz"), ("All files", "*.*")])
+        if paths:
+            self.paths = list(paths)
+            self.index = None
+            self._index_key = None
+            self.source_label.configure(text=f"Source: {', '.join(self.paths)}")
+            self.run()
+
+    def use_live(self):
+        self.paths = None
+        self.index = None
+        self._index_key = None
+        self.source_label.configure(text="Source: Data Log (live)")
+        self.run()
+
+    def _current_key(self):
+        if self.paths is not None:
+            return tuple(self.paths)
+        return (len(self.store), self.store.dropped_rows)
+
+    # --- Query ---
+
+    def run(self):
+        if self._loading is not None:
+            return
+        key = self._current_key()
+        if self.index is not None and key == self._index_key:
+            self._execute()
+            return
+
+        paths = self.paths
+        store = self.store
+        box = {}
+
+        def load():
+            try:
+                box['index'] = FlightIndex.open(paths) if paths else FlightIndex.from_store(store)
+            except Exception as e:
+                box['error'] = e
+
+        self._loading = (threading.Thread(target=load, daemon=True), box, key)
+        self._loading[0].start()
+        self.summary_label.configure(text="Building index...")
+        self.parent.after(POLL_MS, self._poll_load)
+
+    def _poll_load(self):
+        thread, box, key = self._loading
+        if thread.is_alive():
+            self.parent.after(POLL_MS, self._poll_load)
+            return
+        self._loading = None
+        if 'error' in box:
+            self.summary_label.configure(text=f"Error: {box['error']}")
+            return
+        self.index = box['index']
+        self._index_key = key
+        self._execute()
+
+    def _execute(self):
+        index = self.index
+        specs = [spec.strip() for spec in self.agg_var.get().split(',') if spec.strip()]
+        every = self.every_var.get().strip()
+        try:
+            result = index.query(self.where_var.get(), self.from_var.get().strip() or None,
+                                 self.to_var.get().strip() or None)
+            if specs and every:
+                self._show_groups(result, specs, float(every))
+                aggregates = ""
+            else:
+                self._show_rows(result)
+                aggregates = "  ".join(f"{spec} = {format_value(result.aggregate(spec))}"
+                                       for spec in specs)
+        except ValueError as e:
+            self.summary_label.configure(text=f"Error: {e}")
+            return
+
+        stats = result.stats
+        text = (f"{stats['rows']} of {len(index)} rows in {stats['elapsed'] * 1e3:.2f} ms "
+                f"({stats['blocks_skipped']}/{stats['blocks']} blocks skipped, "
+                f"{stats['blocks_checked']} checked)")
+        if len(result) > MAX_RESULT_ROWS and not every:
+            text += f", first {MAX_RESULT_ROWS} shown"
+        if aggregates:
+            text += "\n" + aggregates
+        self.summary_label.configure(text=text)
+        return result
+
+    def _show_rows(self, result):
+        self._set_columns(COLUMN_NAMES)
+        insert = self.tree.insert
+        for record in result.records(MAX_RESULT_ROWS):
+            record['timestamp'] = _time(record['timestamp'])
+            insert("", "end", values=[format_value(record[name]) for name in COLUMN_NAMES])
+
+    def _show_groups(self, result, specs, seconds):
+        self._set_columns(["start"] + specs)
+        for start, values in group_table(result, specs, seconds)[:MAX_RESULT_ROWS]:
+            self.tree.insert("", "end", values=[_time(start)] + [format_value(v) for v in values])
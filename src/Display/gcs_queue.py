@@ -0,0 +1,50 @@
+import threading
+from collections import deque
+
+
+class BoundedQueue:
+    """Queue thread-safe berukuran tetap untuk reader thread -> Tk thread.
+
+    put() tidak pernah block: jika penuh, item tertua dibuang dan dihitung
+    di `dropped`, jadi burst data serial tidak bisa membekukan GUI.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+        self.pushed = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, item):
+        with self._lock:
+            items = self._items
+            if len(items) == self.maxsize:
+                self.dropped += 1
+            items.append(item)
+            self.pushed += 1
+            if len(items) > self.high_water:
+                self.high_water = len(items)
+
+    def drain(self, max_items=None):
+        """Ambil hingga max_items item (FIFO) tanpa block"""
+        with self._lock:
+            items = self._items
+            n = len(items) if max_items is None else min(max_items, len(items))
+            return [items.popleft() for _ in range(n)]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        return {
+            'depth': len(self._items),
+            'pushed': self.pushed,
+            'dropped': self.dropped,
+            'high_water': self.high_water,
+        }
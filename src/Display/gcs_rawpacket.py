@@ -0,0 +1,158 @@
+"""Mode raw packet: GCS merakit sendiri paket LoRa AL/LT/LN/BV/ST.
+
+Dengan `RAW_PACKET_OUTPUT 1`, Receiver_5.ino meneruskan setiap paket LoRa
+begitu diterima sebagai satu baris `payload<TAB>rssi<TAB>snr` (mis.
+"AL150.50\\t-87\\t8.25") alih-alih blok UAV DATA per siklus.
+PacketAssembler:
+
+- mempublikasikan field setiap paket valid saat itu juga (on_update)
+  beserta timestamp per field, jadi altitude ter-update per paket
+  (~100 ms), bukan per siklus 5 paket;
+- merakit frame lengkap dengan state machine seperti `expectedNext` di
+  receiver (AL -> LT -> LN -> BV -> ST; reset jika urutan salah atau
+  jeda > CYCLE_TIMEOUT) dan mengeluarkannya lewat on_frame untuk log,
+  lengkap dengan cycle_time serta rata-rata RSSI/SNR siklus seperti
+  output teks receiver. Frame ini diberi field 'assembled' = True.
+
+Bedanya dengan receiver: paket AL di luar urutan langsung membuka siklus
+baru (receiver membuangnya dan menunggu AL berikutnya).
+"""
+import time
+
+from gcs_parser import PACKET_HANDLERS, PACKET_SEQUENCE, parse_packet
+
+CYCLE_TIMEOUT = 2.0  # detik, sama dengan timeout receiver
+PACKET_INDEX = {prefix: i for i, prefix in enumerate(PACKET_SEQUENCE)}
+
+
+def _float_or_none(value):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def is_packet_line(line):
+    """True jika baris adalah paket mentah valid: payload[<TAB>rssi[<TAB>snr]]"""
+    if isinstance(line, str):
+        line = line.encode('utf-8', errors='ignore')
+    payload, _, meta = line.strip().partition(b'\t')
+    if parse_packet(payload) is None:
+        return False
+    return not meta or all(_float_or_none(value) is not None for value in meta.split(b'\t'))
+
+
+class PacketAssembler:
+    def __init__(self, on_update=None, on_frame=None, timeout=CYCLE_TIMEOUT):
+        self.on_update = on_update
+        self.on_frame = on_frame
+        self.timeout = timeout
+        self.latest = {}
+        self.field_times = {}
+        self.packets = 0
+        self.invalid = 0
+        self.frames = 0
+        self.sequence_errors = 0
+        self.timeouts = 0
+        self.last_packet = None
+        self._reset()
+
+    def _reset(self):
+        self.expected = 0
+        self.cycle = {}
+        self.cycle_start = None
+        self._rssi_sum = 0.0
+        self._snr_sum = 0.0
+        self._quality_count = 0
+
+    def feed_line(self, line, received_at=None):
+        """Proses satu baris; return False jika bukan baris paket (untuk parser teks)"""
+        line = line.strip()
+        if line[:2] not in PACKET_HANDLERS:
+            return False
+        payload, _, meta = line.partition(b'\t')
+        packet = parse_packet(payload)
+        if packet is None:
+            self.invalid += 1
+            return True
+        now = time.time() if received_at is None else received_at
+        prefix, fields = packet
+        self.packets += 1
+
+        rssi = snr = None
+        if meta:
+            rssi_text, _, snr_text = meta.partition(b'\t')
+            rssi = _float_or_none(rssi_text)
+            snr = _float_or_none(snr_text) if snr_text else None
+
+        update = fields
+        if rssi is not None or snr is not None:
+            update = dict(fields)
+            if rssi is not None:
+                update['rssi'] = rssi
+            if snr is not None:
+                update['snr'] = snr
+        field_times = self.field_times
+        for key in update:
+            field_times[key] = now
+        self.latest.update(update)
+        if self.on_update:
+            self.on_update(now, update)
+
+        self._assemble(prefix, fields, now, rssi, snr)
+        return True
+
+    def _assemble(self, prefix, fields, now, rssi, snr):
+        if self.expected and now - self.last_packet > self.timeout:
+            self.timeouts += 1
+            self._reset()
+        self.last_packet = now
+
+        index = PACKET_INDEX[prefix]
+        if index != self.expected:
+            if self.expected:
+                self.sequence_errors += 1
+            self._reset()
+            if index != 0:
+                return  # tunggu AL berikutnya
+        if index == 0:
+            self.cycle_start = now
+        self.cycle.update(fields)
+        if rssi is not None:
+            self._rssi_sum += rssi
+            self._snr_sum += snr if snr is not None else 0.0
+            self._quality_count += 1
+        self.expected = index + 1
+        if self.expected < len(PACKET_SEQUENCE):
+            return
+
+        frame = self.cycle
+        frame['cycle_time'] = int(round((now - self.cycle_start) * 1000))
+        count = self._quality_count
+        if count:
+            frame['rssi'] = round(self._rssi_sum / count, 2)
+            frame['snr'] = round(self._snr_sum / count, 2)
+        frame['assembled'] = True
+        self.frames += 1
+        self._reset()
+        if self.on_frame:
+            self.on_frame(frame)
+
+    def ages(self, now=None):
+        """Umur (detik) nilai terakhir per field"""
+        if now is None:
+            now = time.time()
+        return {key: now - t for key, t in self.field_times.items()}
+
+    def reset(self):
+        self._reset()
+        self.last_packet = None
+
+    def stats(self):
+        return {
+            'packets': self.packets,
+            'invalid': self.invalid,
+            'frames': self.frames,
+            'sequence_errors': self.sequence_errors,
+            'timeouts': self.timeouts,
+        }
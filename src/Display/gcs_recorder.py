@@ -0,0 +1,282 @@
+"""Flight recorder append-only untuk frame telemetri (dan raw line).
+
+Format file (.lfr):
+    header : MAGIC | uint16 panjang | JSON header
+    record : uint8 tipe | uint16 panjang payload | payload | uint32 crc32
+
+Reader berhenti di record terakhir yang lengkap dan CRC-nya valid, jadi
+file yang terpotong karena crash/mati listrik tetap bisa dibaca.
+"""
+import os
+import sys
+import json
+import math
+import time
+import struct
+import threading
+import zlib
+from datetime import datetime
+
+from gcs_store import REMAINING_UNKNOWN, clamp_frame
+
+MAGIC = b'LFR1'
+VERSION = 1
+FILE_SUFFIX = '.lfr'
+
+RECORD_FRAME = 0x46  # 'F'
+RECORD_RAW = 0x52    # 'R'
+
+RECORD_HEADER = struct.Struct('<BH')
+RECORD_CRC = struct.Struct('<I')
+HEADER_LEN = struct.Struct('<H')
+# timestamp, altitude, latitude, longitude, voltage, remaining, rssi, snr, cycle_time
+FRAME_STRUCT = struct.Struct('<dfiifhffi')
+RAW_STRUCT = struct.Struct('<d')
+
+MAX_PAYLOAD = 0xFFFF
+DEFAULT_ROTATE_BYTES = 64 * 1024 * 1024
+DEFAULT_ROTATE_SECONDS = 3600.0
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_FSYNC_INTERVAL = 2.0
+
+
+def encode_frame(timestamp, data):
+    # Nilai yang tidak muat di FRAME_STRUCT (baris rusak) ditulis sebagai "tidak ada"
+    get = clamp_frame(data).get
+    nan = math.nan
+    status = get('status', '').encode('utf-8', errors='ignore')[:255]
+    return FRAME_STRUCT.pack(
+        timestamp, get('altitude', nan), get('latitude', 0), get('longitude', 0),
+        get('voltage', nan), get('remaining', REMAINING_UNKNOWN), get('rssi', nan), get('snr', nan),
+        get('cycle_time', 0)) + status
+
+
+def decode_frame(payload):
+    (timestamp, altitude, latitude, longitude, voltage, remaining,
+     rssi, snr, cycle_time) = FRAME_STRUCT.unpack_from(payload)
+    data = {
+        'altitude': altitude,
+        'latitude': latitude,
+        'longitude': longitude,
+        'voltage': voltage,
+        'rssi': rssi,
+        'snr': snr,
+        'cycle_time': cycle_time,
+    }
+    # Field yang tidak ada saat direkam tetap tidak ada setelah dibaca
+    if remaining != REMAINING_UNKNOWN:
+        data['remaining'] = remaining
+    status = payload[FRAME_STRUCT.size:].decode('utf-8', errors='ignore')
+    if status:
+        data['status'] = status
+    return timestamp, data
+
+
+def pack_record(kind, payload):
+    payload = payload[:MAX_PAYLOAD]
+    head = RECORD_HEADER.pack(kind, len(payload))
+    crc = zlib.crc32(payload, zlib.crc32(head))
+    return head + payload + RECORD_CRC.pack(crc)
+
+
+class FlightRecorder:
+    """Writer append-only dengan buffer, flush periodik dan rotasi file.
+
+    write_frame()/write_raw() hanya menambah bytes ke buffer di memori
+    (aman dipanggil dari thread mana saja); thread flusher menulis ke disk
+    setiap `flush_interval` detik dan fsync setiap `fsync_interval`.
+    """
+
+    def __init__(self, directory, prefix='flight', rotate_bytes=DEFAULT_ROTATE_BYTES,
+                 rotate_seconds=DEFAULT_ROTATE_SECONDS, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 fsync_interval=DEFAULT_FSYNC_INTERVAL, record_raw=False):
+        self.directory = directory
+        self.prefix = prefix
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.record_raw = record_raw
+
+        self.files = []
+        self.frames_written = 0
+        self.raw_written = 0
+        self.bytes_written = 0
+
+        self._pending = bytearray()
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_size = 0
+        self._file_opened = 0.0
+        self._last_fsync = 0.0
+        self._closed = threading.Event()
+
+        os.makedirs(directory, exist_ok=True)
+        self._open_file()
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def path(self):
+        return self.files[-1] if self.files else None
+
+    def _open_file(self):
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        path = os.path.join(self.directory, f"{self.prefix}_{stamp}_{len(self.files):03d}{FILE_SUFFIX}")
+        header = json.dumps({
+            'version': VERSION,
+            'created': time.time(),
+            'frame_format': FRAME_STRUCT.format,
+        }).encode()
+        self._file = open(path, 'ab')
+        self._file.write(MAGIC + HEADER_LEN.pack(len(header)) + header)
+        self._file_size = self._file.tell()
+        self._file_opened = time.monotonic()
+        self.files.append(path)
+
+    def write_frame(self, timestamp, data):
+        record = pack_record(RECORD_FRAME, encode_frame(timestamp, data))
+        with self._lock:
+            self._pending += record
+            self.frames_written += 1
+
+    def write_raw(self, timestamp, line):
+        if not self.record_raw:
+            return
+        if isinstance(line, str):
+            line = line.encode('utf-8', errors='ignore')
+        record = pack_record(RECORD_RAW, RAW_STRUCT.pack(timestamp) + line)
+        with self._lock:
+            self._pending += record
+            self.raw_written += 1
+
+    def flush(self, fsync=False):
+        with self._lock:
+            data = self._pending
+            self._pending = bytearray()
+        f = self._file
+        if f is None:
+            return
+        if data:
+            f.write(data)
+            self._file_size += len(data)
+            self.bytes_written += len(data)
+        f.flush()
+        now = time.monotonic()
+        if fsync or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(f.fileno())
+            self._last_fsync = now
+        if (self._file_size >= self.rotate_bytes
+                or (self.rotate_seconds and now - self._file_opened >= self.rotate_seconds)):
+            os.fsync(f.fileno())
+            f.close()
+            self._open_file()
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Recorder error: {e}")
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._thread.join()
+        self.flush(fsync=True)
+        self._file.close()
+        self._file = None
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'files': len(self.files),
+            'frames': self.frames_written,
+            'raw_lines': self.raw_written,
+            'bytes': self.bytes_written,
+            'pending': len(self._pending),
+        }
+
+
+def read_flight_log(path):
+    """Yield (tipe, timestamp, data) sampai record lengkap terakhir.
+
+    tipe 'frame' -> data dict, tipe 'raw' -> data str.
+    """
+    for kind, payload in iter_records(path):
+        if kind == RECORD_FRAME:
+            timestamp, data = decode_frame(payload)
+            yield 'frame', timestamp, data
+        elif kind == RECORD_RAW:
+            (timestamp,) = RAW_STRUCT.unpack_from(payload)
+            yield 'raw', timestamp, payload[RAW_STRUCT.size:].decode('utf-8', errors='ignore')
+
+
+def iter_records(path):
+    """Yield (kind, payload bytes) mentah; dipakai loader yang tidak butuh dict"""
+    with open(path, 'rb') as f:
+        buf = f.read()
+    if buf[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path}: bukan flight log ({MAGIC!r})")
+    pos = len(MAGIC)
+    (header_len,) = HEADER_LEN.unpack_from(buf, pos)
+    pos += HEADER_LEN.size + header_len
+    view = memoryview(buf)
+    end = len(buf)
+    while pos + RECORD_HEADER.size <= end:
+        kind, length = RECORD_HEADER.unpack_from(buf, pos)
+        body_end = pos + RECORD_HEADER.size + length
+        if body_end + RECORD_CRC.size > end:
+            break  # record terpotong
+        (crc,) = RECORD_CRC.unpack_from(buf, body_end)
+        if zlib.crc32(view[pos:body_end]) != crc:
+            break  # korup, berhenti di record valid terakhir
+        payload = bytes(view[pos + RECORD_HEADER.size:body_end])
+        pos = body_end + RECORD_CRC.size
+        yield kind, payload
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: bukan flight log ({MAGIC!r})")
+        (header_len,) = HEADER_LEN.unpack(f.read(HEADER_LEN.size))
+        return json.loads(f.read(header_len))
+
+
+def iter_frames(paths):
+    """Yield (timestamp, frame) dari beberapa file secara berurutan"""
+    for path in paths:
+        for kind, timestamp, data in read_flight_log(path):
+            if kind == 'frame':
+                yield timestamp, data
+
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Baca / recover flight log .lfr")
+    ap.add_argument('files', nargs='+')
+    ap.add_argument('--jsonl', action='store_true', help='dump record sebagai JSON lines')
+    args = ap.parse_args(argv)
+
+    for path in args.files:
+        frames = raw = 0
+        first = last = None
+        for kind, timestamp, data in read_flight_log(path):
+            if kind == 'frame':
+                frames += 1
+            else:
+                raw += 1
+            first = timestamp if first is None else first
+            last = timestamp
+            if args.jsonl:
+                print(json.dumps({'type': kind, 'timestamp': timestamp, 'data': data}))
+        span = f"{datetime.fromtimestamp(first)} - {datetime.fromtimestamp(last)}" if first else "-"
+        print(f"{path}: {frames} frames, {raw} raw lines, {span}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
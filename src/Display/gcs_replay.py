@@ -0,0 +1,379 @@
+"""Replay capture receiver atau flight log ke pipeline GCS.
+
+Sumber yang didukung:
+    - capture teks output Receiver_5.ino (blok "========== UAV DATA ==========")
+    - flight log .lfr dari gcs_recorder (raw line jika direkam, selain itu frame)
+
+Raw line diputar ulang lewat DataParser yang sama dengan jalur serial.
+Jarak antar frame diambil dari timestamp .lfr, atau untuk capture teks dari
+prefix jam "HH:MM:SS > " (tab Raw Data) bila ada, dirapikan dengan "Cycle
+Time" (lihat CaptureClock). speed 1 = real-time, N = N kali lebih cepat,
+0 = secepatnya.
+"""
+import bisect
+import re
+import sys
+import threading
+import time
+
+from gcs_parser import DataParser, FRAME_DELIMITER
+from gcs_recorder import MAGIC, read_flight_log
+
+DEFAULT_CYCLE_SECONDS = 0.5   # siklus nominal transmitter
+MAX_BACKLOG = 2000            # frame antre di consumer sebelum replay menunggu
+BACKLOG_WAIT = 0.005
+
+CYCLE_TIME_PREFIX = b'Cycle Time'
+SECONDS_PER_DAY = 86400
+
+# Prefix jam dari tab Raw Data ("12:03:04 > ") atau serial monitor ("12:03:04.123 -> ")
+TIME_PREFIX_RE = re.compile(rb'^[ \t]*(\d{1,2}):(\d\d):(\d\d)(\.\d+)?[ \t]*-?>[ \t]?', re.M)
+
+
+def prefix_time(match):
+    """Match TIME_PREFIX_RE -> (detik sejak tengah malam, resolusi detik)"""
+    fraction = match.group(4)
+    seconds = int(match.group(1)) * 3600 + int(match.group(2)) * 60 + int(match.group(3))
+    if fraction:
+        return seconds + float(fraction), 0.0
+    return float(seconds), 1.0
+
+
+class CaptureClock:
+    """Offset waktu frame capture teks, relatif ke awal capture.
+
+    Tanpa prefix jam: kumulatif Cycle Time per frame. Dengan prefix: waktu
+    prefix baris penutup frame, jadi gap/outage asli tetap terlihat; Cycle
+    Time hanya merapikan offset di dalam resolusi prefix (1 detik untuk
+    "HH:MM:SS"). `origin` = match prefix awal capture (default: prefix
+    pertama yang diberikan ke advance()).
+    """
+
+    def __init__(self, origin=None):
+        self.offset = 0.0
+        self._origin = None
+        self._last = None
+        self._days = 0
+        if origin is not None:
+            self._origin = self._last = prefix_time(origin)[0]
+
+    def advance(self, cycle, match=None):
+        """Offset frame berikutnya; cycle = Cycle Time frame itu (detik)"""
+        offset = self.offset + cycle
+        if match is not None:
+            tod, resolution = prefix_time(match)
+            if self._origin is None:
+                self._origin = self._last = tod
+            elif tod < self._last:
+                self._days += 1  # lewat tengah malam
+            self._last = tod
+            wall = tod + self._days * SECONDS_PER_DAY - self._origin
+            offset = min(max(offset, wall), wall + resolution)
+        self.offset = offset
+        return offset
+
+
+def _cycle_seconds(lines):
+    for line in lines:
+        if line.startswith(CYCLE_TIME_PREFIX):
+            try:
+                ms = int(line.partition(b':')[2].split()[0])
+            except (ValueError, IndexError):
+                break
+            if ms > 0:
+                return ms / 1000.0
+            break
+    return DEFAULT_CYCLE_SECONDS
+
+
+def _split_blocks(lines):
+    """Kelompokkan baris jadi blok per frame (ditutup baris delimiter)"""
+    block = []
+    has_fields = False
+    for item in lines:
+        line = item[1]
+        block.append(item)
+        if line.startswith(FRAME_DELIMITER):
+            if has_fields:
+                yield block
+                block = []
+                has_fields = False
+        else:
+            has_fields = True
+    if block:
+        yield block
+
+
+def _strip_prefixes(lines):
+    """Yield (match prefix | None, baris tanpa prefix) untuk baris tidak kosong"""
+    match_prefix = TIME_PREFIX_RE.match
+    for line in lines:
+        match = match_prefix(line)
+        if match is not None:
+            line = line[match.end():]
+        line = line.strip()
+        if line:
+            yield match, line
+
+
+def load_text_capture(path):
+    with open(path, 'rb') as f:
+        items = list(_strip_prefixes(f.read().splitlines()))
+    origin = next((match for match, _ in items if match is not None), None)
+    clock = CaptureClock(origin)
+    blocks = []
+    start = None
+    for block in _split_blocks(items):
+        raw = [line for _, line in block]
+        # Waktu blok = saat baris penutupnya (delimiter) diterima
+        offset = clock.advance(_cycle_seconds(raw), block[-1][0])
+        if start is None:
+            start = offset
+        blocks.append((offset - start, raw, None))
+    return blocks
+
+
+def load_flight_log(path):
+    records = list(read_flight_log(path))
+    raw = [(ts, data.encode('utf-8')) for kind, ts, data in records if kind == 'raw']
+    if raw:
+        start = raw[0][0]
+        # Offset blok = waktu baris terakhirnya (delimiter) diterima
+        return [(block[-1][0] - start, [line for _, line in block], None)
+                for block in _split_blocks(raw)]
+    frames = [(ts, data) for kind, ts, data in records if kind == 'frame']
+    if not frames:
+        return []
+    start = frames[0][0]
+    return [(ts - start, None, data) for ts, data in frames]
+
+
+def load_capture(path):
+    """Return list blok (offset_detik, raw_lines | None, frame | None)"""
+    with open(path, 'rb') as f:
+        head = f.read(len(MAGIC))
+    if head == MAGIC:
+        return load_flight_log(path)
+    return load_text_capture(path)
+
+
+class Replayer:
+    """Putar ulang blok capture ke on_frame/on_line dengan kontrol speed/seek/pause.
+
+    on_frame(timestamp, frame) dan on_line(raw_line) dipanggil dari thread
+    replay dengan timestamp wall-clock saat frame dikeluarkan. `backlog`
+    opsional (callable -> jumlah frame antre di consumer) membuat replay
+    menunggu consumer, jadi mode secepatnya mengukur throughput pipeline
+    tanpa membuang frame.
+    """
+
+    def __init__(self, source, on_frame, on_line=None, speed=1.0, backlog=None,
+                 max_backlog=MAX_BACKLOG):
+        self.source = source
+        self.blocks = load_capture(source) if isinstance(source, str) else list(source)
+        self.offsets = [block[0] for block in self.blocks]
+        self.on_frame = on_frame
+        self.on_line = on_line
+        self.backlog = backlog
+        self.max_backlog = max_backlog
+        self.parser = DataParser()
+
+        self.speed = speed
+        self.paused = False
+        self.index = 0
+        self.frames = 0
+        self.lines = 0
+        self.throttled = 0
+        self.finished = threading.Event()
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self._anchor_wall = 0.0
+        self._anchor_offset = 0.0
+        self._play_time = 0.0
+        self._play_started = None
+
+    @property
+    def duration(self):
+        return self.offsets[-1] if self.offsets else 0.0
+
+    @property
+    def position(self):
+        index = min(self.index, len(self.offsets) - 1)
+        return self.offsets[index] if index >= 0 else 0.0
+
+    @property
+    def progress(self):
+        return self.index / len(self.blocks) if self.blocks else 1.0
+
+    @property
+    def achieved_fps(self):
+        elapsed = self._play_time
+        if self._play_started is not None:
+            elapsed += time.monotonic() - self._play_started
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+    def _anchor(self):
+        # Dipanggil dengan _lock: jadwal dihitung ulang dari posisi sekarang
+        self._anchor_wall = time.monotonic()
+        self._anchor_offset = self.offsets[self.index] if self.index < len(self.offsets) else 0.0
+
+    def _set_playing(self, playing):
+        now = time.monotonic()
+        if playing and self._play_started is None:
+            self._play_started = now
+        elif not playing and self._play_started is not None:
+            self._play_time += now - self._play_started
+            self._play_started = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="replay", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def join(self, timeout=None):
+        return self.finished.wait(timeout)
+
+    def pause(self):
+        with self._lock:
+            self.paused = True
+            self._set_playing(False)
+        self._wake.set()
+
+    def resume(self):
+        with self._lock:
+            self.paused = False
+            self._anchor()
+            self._set_playing(True)
+        self._wake.set()
+
+    def set_speed(self, speed):
+        with self._lock:
+            self.speed = speed
+            self._anchor()
+        self._wake.set()
+
+    def seek(self, seconds):
+        """Lompat ke blok pertama dengan offset >= seconds"""
+        with self._lock:
+            self.index = bisect.bisect_left(self.offsets, seconds)
+            self.parser.engine.reset()
+            self._anchor()
+        self._wake.set()
+
+    def seek_fraction(self, fraction):
+        self.seek(self.duration * min(max(fraction, 0.0), 1.0))
+
+    def run(self):
+        """Loop replay (blocking); dipakai langsung atau lewat start()"""
+        self._running = True
+        self.finished.clear()
+        with self._lock:
+            self._anchor()
+            self._set_playing(not self.paused)
+        blocks = self.blocks
+        wake = self._wake
+        try:
+            while self._running:
+                with self._lock:
+                    paused, index, speed = self.paused, self.index, self.speed
+                if index >= len(blocks):
+                    break
+                if paused:
+                    wake.wait()
+                    wake.clear()
+                    continue
+                if speed:
+                    target = self._anchor_wall + (blocks[index][0] - self._anchor_offset) / speed
+                    delay = target - time.monotonic()
+                    if delay > 0:
+                        if wake.wait(delay):
+                            wake.clear()
+                        continue
+                if self.backlog is not None and self.backlog() > self.max_backlog:
+                    self.throttled += 1
+                    if wake.wait(BACKLOG_WAIT):
+                        wake.clear()
+                    continue
+                with self._lock:
+                    if self.index != index:
+                        continue  # seek saat menunggu
+                    self.index = index + 1
+                self._emit(blocks[index])
+        finally:
+            with self._lock:
+                self._set_playing(False)
+            self._running = False
+            self.finished.set()
+
+    def _emit(self, block):
+        _, lines, frame = block
+        now = time.time()
+        if lines is None:
+            self.frames += 1
+            self.on_frame(now, dict(frame))
+            return
+        parse_line = self.parser.parse_line
+        on_line = self.on_line
+        for line in lines:
+            self.lines += 1
+            if on_line is not None:
+                on_line(line)
+            parsed = parse_line(line)
+            if parsed:
+                self.frames += 1
+                self.on_frame(now, parsed)
+
+    def stats(self):
+        return {
+            'source': self.source if isinstance(self.source, str) else None,
+            'blocks': len(self.blocks),
+            'index': self.index,
+            'position': self.position,
+            'duration': self.duration,
+            'progress': self.progress,
+            'speed': self.speed,
+            'paused': self.paused,
+            'frames': self.frames,
+            'lines': self.lines,
+            'achieved_fps': self.achieved_fps,
+            'throttled': self.throttled,
+            'finished': self.finished.is_set(),
+        }
+
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Replay capture/flight log dan ukur throughput parser")
+    ap.add_argument('file')
+    ap.add_argument('--speed', type=float, default=0.0,
+                    help='1 = real-time, N = N kali lebih cepat, 0 = secepatnya (default)')
+    ap.add_argument('--repeat', type=int, default=1)
+    args = ap.parse_args(argv)
+
+    start = time.perf_counter()
+    blocks = load_capture(args.file)
+    load_time = time.perf_counter() - start
+    print(f"{args.file}: {len(blocks)} blocks, {blocks[-1][0] if blocks else 0:.1f}s "
+          f"(load {load_time:.3f}s)", file=sys.stderr)
+    for _ in range(args.repeat):
+        replayer = Replayer(blocks, on_frame=lambda ts, frame: None, speed=args.speed)
+        replayer.run()
+        stats = replayer.stats()
+        print(f"{stats['frames']} frames, {stats['lines']} lines, "
+              f"{stats['achieved_fps']:.0f} frames/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
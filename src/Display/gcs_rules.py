@@ -0,0 +1,525 @@
+"""Rule engine alarm telemetry: dievaluasi per frame dan atas flight log.
+
+Rule didefinisikan di file JSON (lihat alert_rules.json):
+
+    {"rules": [
+      {"name": "Low voltage", "when": "voltage < 10.8", "for": 3, "severity": "critical"},
+      {"name": "Fast climb", "when": "rate(altitude) > 5"},
+      {"name": "No frame", "when": "frame_age > 2"},
+      {"name": "Failsafe", "when": "status contains Failsafe", "severity": "critical"}
+    ]}
+
+Ekspresi memakai bahasa filter gcs_query (gcs_filter: `kolom op nilai`,
+and / or / not, kurung, `status contains teks`) ditambah:
+
+- `rate(kolom)`  perubahan per detik terhadap frame sebelumnya
+- `delta(kolom)` selisih terhadap frame sebelumnya
+- `frame_age`    detik sejak frame sebelumnya; saat live juga dicek tiap
+                 tick (RuleEngine.check) sehingga link putus terdeteksi
+
+`for` = jumlah frame berturut-turut yang harus memenuhi kondisi sebelum
+alarm aktif. Alarm padam begitu kondisi tidak terpenuhi.
+
+Semua rule dikompilasi menjadi satu fungsi Python (kode di-generate
+sekali saat load), jadi evaluasi per frame hanya satu pemanggilan fungsi
+plus counter O(1) per rule. Rule yang sama dievaluasi vectorized dengan
+NumPy atas FlightIndex (gcs_query) untuk review setelah terbang:
+
+    python gcs_rules.py flight_logs/*.lfr --rules alert_rules.json
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+
+from gcs_filter import AGE_FUNCTION, OPS, FilterParser
+from gcs_store import COLUMN_NAMES, REMAINING_UNKNOWN, TYPECODES
+
+SEVERITIES = ('info', 'warning', 'critical')
+DEFAULT_RULES_PATH = "alert_rules.json"
+NAN = float('nan')
+
+# Dipakai jika file rule tidak ada: sama dengan warna merah di panel telemetry
+DEFAULT_RULES = [
+    {'name': 'Battery low', 'when': 'remaining <= 20', 'severity': 'warning'},
+    {'name': 'Weak RSSI', 'when': 'rssi < -90', 'severity': 'warning'},
+    {'name': 'Status not OK', 'when': 'status != OK', 'severity': 'critical'},
+]
+
+NUMERIC_COLUMNS = tuple(name for name in COLUMN_NAMES if name not in ('timestamp', 'status'))
+# Nilai kolom yang tidak ada di frame, sama dengan yang tersimpan di
+# TelemetryStore/flight log (remaining: REMAINING_UNKNOWN -> NaN), supaya
+# evaluasi live dan review() memberi hasil yang sama
+MISSING = {name: NAN if TYPECODES[name] in 'fd' or name == 'remaining' else 0
+           for name in NUMERIC_COLUMNS}
+FUNCTIONS = ('rate', 'delta')
+
+
+class RuleError(ValueError):
+    pass
+
+
+# --- AST ---
+# source(): ekspresi Python untuk fungsi per frame (lihat RuleSet._compile)
+# array(ctx): evaluasi NumPy atas kolom flight log (lihat RuleSet.review)
+
+class Operand:
+    """Kolom, rate(kolom), delta(kolom) atau frame_age"""
+
+    def __init__(self, func, column):
+        self.func = func
+        self.column = column
+
+    @property
+    def var(self):
+        if self.func == AGE_FUNCTION:
+            return 'age'
+        return f"{self.func or 'c'}_{self.column}"
+
+    def __repr__(self):
+        if self.func == AGE_FUNCTION:
+            return AGE_FUNCTION
+        return f"{self.func}({self.column})" if self.func else self.column
+
+    def array(self, ctx):
+        np = ctx.np
+        if self.func == AGE_FUNCTION:
+            return ctx.gaps
+        values = ctx.numeric(self.column)
+        if not self.func:
+            return values
+        delta = np.concatenate(([np.nan], np.diff(values)))
+        if self.func == 'delta':
+            return delta
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(ctx.gaps > 0, delta / ctx.gaps, np.nan)
+
+
+class Compare:
+    def __init__(self, operand, op, value):
+        self.operand = operand
+        self.op = op
+        self.value = value
+
+    def __repr__(self):
+        return f"{self.operand!r} {self.op} {self.value!r}"
+
+    def operands(self):
+        return [self.operand]
+
+    def source(self):
+        return f"({self.operand.var} {self.op} {self.value!r})"
+
+    def array(self, ctx):
+        with ctx.np.errstate(invalid='ignore'):
+            return OPS[self.op](self.operand.array(ctx), self.value)
+
+
+class StatusCompare:
+    """status == / != / contains teks"""
+
+    def __init__(self, op, value):
+        self.op = op
+        self.value = value if op != 'contains' else value.lower()
+
+    def __repr__(self):
+        return f"status {self.op} {self.value!r}"
+
+    def operands(self):
+        return [Operand(None, 'status')]
+
+    def source(self):
+        if self.op == 'contains':
+            return f"({self.value!r} in s_status)"
+        # Frame tanpa status (atau status kosong) tidak memicu rule status
+        return f"(bool(c_status) and c_status {self.op} {self.value!r})"
+
+    def array(self, ctx):
+        np = ctx.np
+        if self.op == 'contains':
+            codes = [i for i, s in enumerate(ctx.status_table) if self.value in s.lower()]
+        else:
+            codes = [i for i, s in enumerate(ctx.status_table) if s == self.value]
+        match = np.isin(ctx.columns['status'], codes)
+        if self.op != '!=':
+            return match
+        empty = [i for i, s in enumerate(ctx.status_table) if not s]
+        return ~match & ~np.isin(ctx.columns['status'], empty)
+
+
+class BoolOp:
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def __repr__(self):
+        return f"({self.left!r} {self.op} {self.right!r})"
+
+    def operands(self):
+        return self.left.operands() + self.right.operands()
+
+    def source(self):
+        return f"({self.left.source()} {self.op} {self.right.source()})"
+
+    def array(self, ctx):
+        left, right = self.left.array(ctx), self.right.array(ctx)
+        return left & right if self.op == 'and' else left | right
+
+
+class Not:
+    def __init__(self, inner):
+        self.inner = inner
+
+    def __repr__(self):
+        return f"not {self.inner!r}"
+
+    def operands(self):
+        return self.inner.operands()
+
+    def source(self):
+        return f"(not {self.inner.source()})"
+
+    def array(self, ctx):
+        return ~self.inner.array(ctx)
+
+
+# --- Parser (grammar bersama gcs_query, lihat gcs_filter) ---
+
+class _RuleParser(FilterParser):
+    columns = NUMERIC_COLUMNS + ('status',)
+    functions = FUNCTIONS + (AGE_FUNCTION,)
+
+    def compare(self, func, column, op, value):
+        if column == 'status':
+            return StatusCompare(op, value)
+        return Compare(Operand(func, column), op, value)
+
+    def and_(self, left, right):
+        return BoolOp('and', left, right)
+
+    def or_(self, left, right):
+        return BoolOp('or', left, right)
+
+    def not_(self, inner):
+        return Not(inner)
+
+
+def parse_rule(text):
+    try:
+        return _RuleParser(text).parse()
+    except ValueError as e:
+        raise RuleError(str(e)) from None
+
+
+# --- Rule set ---
+
+class Rule:
+    __slots__ = ('name', 'when', 'expr', 'frames', 'severity', 'message', 'uses_age')
+
+    def __init__(self, name, when, frames=1, severity='warning', message=None):
+        if severity not in SEVERITIES:
+            raise RuleError(f"rule {name!r}: severity must be one of {', '.join(SEVERITIES)}")
+        if int(frames) < 1:
+            raise RuleError(f"rule {name!r}: 'for' must be >= 1")
+        self.name = name
+        self.when = when
+        try:
+            self.expr = parse_rule(when)
+        except RuleError as e:
+            raise RuleError(f"rule {name!r}: {e}") from None
+        self.frames = int(frames)
+        self.severity = severity
+        self.message = message or when
+        self.uses_age = any(op.func == AGE_FUNCTION for op in self.expr.operands())
+
+    @classmethod
+    def from_dict(cls, spec):
+        try:
+            return cls(spec['name'], spec['when'], spec.get('for', 1),
+                       spec.get('severity', 'warning'), spec.get('message'))
+        except KeyError as e:
+            raise RuleError(f"rule {spec!r} missing {e}") from None
+
+
+class _History:
+    """Kolom flight log untuk evaluasi vectorized"""
+
+    def __init__(self, np, columns, status_table):
+        self.np = np
+        self.columns = columns
+        self.status_table = status_table
+        timestamps = columns['timestamp']
+        self.gaps = np.concatenate(([np.nan], np.diff(timestamps)))
+        self._numeric = {}
+
+    def numeric(self, name):
+        values = self._numeric.get(name)
+        if values is None:
+            values = self.columns[name].astype(self.np.float64)
+            if name == 'remaining':
+                values[values == REMAINING_UNKNOWN] = self.np.nan
+            self._numeric[name] = values
+        return values
+
+
+class RuleSet:
+    """Rule yang sudah dikompilasi; dipakai oleh RuleEngine dan review()"""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise RuleError("rule names must be unique")
+        self.evaluate = self._compile(self.rules)
+        self.age_rules = [i for i, rule in enumerate(self.rules) if rule.uses_age]
+        self.evaluate_age = self._compile([self.rules[i] for i in self.age_rules])
+
+    def __len__(self):
+        return len(self.rules)
+
+    @classmethod
+    def from_config(cls, config):
+        """dict {"rules": [...]} atau list rule"""
+        specs = config.get('rules', []) if isinstance(config, dict) else config
+        return cls(Rule.from_dict(spec) for spec in specs)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_config(json.load(f))
+
+    @staticmethod
+    def _compile(rules):
+        """Generate satu fungsi f(frame, timestamp, last, age) -> tuple bool.
+
+        `last` = {kolom: (nilai, timestamp)} dari frame sebelumnya untuk
+        rate/delta. Kolom yang tidak ada di frame bernilai MISSING (NaN
+        untuk float dan remaining, sehingga perbandingannya False).
+        """
+        operands = {}
+        for rule in rules:
+            for operand in rule.expr.operands():
+                operands[operand.var] = operand
+        lines = ["def evaluate(frame, timestamp, last, age):", "    get = frame.get"]
+        columns = sorted({op.column for op in operands.values() if op.column})
+        for column in columns:
+            if column == 'status':
+                lines.append("    c_status = get('status')")
+                lines.append("    s_status = c_status.lower() if c_status else ''")
+            else:
+                lines.append(f"    c_{column} = get({column!r}, {MISSING[column]!r})")
+        for var, operand in sorted(operands.items()):
+            if operand.func in FUNCTIONS:
+                column = operand.column
+                lines.append(f"    p = last.get({column!r})")
+                diff = f"(c_{column} - p[0])"
+                if operand.func == 'rate':
+                    lines.append(f"    {var} = {diff} / (timestamp - p[1]) "
+                                 f"if p is not None and timestamp > p[1] else NAN")
+                else:
+                    lines.append(f"    {var} = {diff} if p is not None else NAN")
+        body = ", ".join(rule.expr.source() for rule in rules)
+        lines.append(f"    return ({body}{',' if len(rules) == 1 else ''})")
+        namespace = {'NAN': NAN, 'nan': NAN}
+        exec(compile("\n".join(lines), "<rules>", "exec"), namespace)
+        evaluate = namespace['evaluate']
+        evaluate.missing = {c: MISSING[c] for c in columns if c != 'status'}
+        return evaluate
+
+    def review(self, index, t_start=None, t_end=None):
+        """Evaluasi semua rule atas FlightIndex; return list episode alarm.
+
+        Episode: dict rule, severity, start, end (None jika masih aktif di
+        akhir log), frames (jumlah frame aktif).
+        """
+        import numpy as np  # hanya review yang butuh NumPy
+
+        r0, r1 = index.row_range(t_start, t_end)
+        columns = {name: col[r0:r1] for name, col in index.columns.items()}
+        timestamps = columns['timestamp']
+        ctx = _History(np, columns, index.status_table)
+        episodes = []
+        for rule in self.rules:
+            mask = np.asarray(rule.expr.array(ctx), dtype=bool)
+            active = _consecutive(np, mask) >= rule.frames
+            edges = np.diff(np.concatenate(([0], active.view(np.int8), [0])))
+            starts = np.flatnonzero(edges == 1)
+            ends = np.flatnonzero(edges == -1)
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                episodes.append({
+                    'rule': rule.name,
+                    'severity': rule.severity,
+                    'start': float(timestamps[start]),
+                    'end': float(timestamps[end]) if end < len(timestamps) else None,
+                    'frames': end - start,
+                })
+        episodes.sort(key=lambda e: e['start'])
+        return episodes
+
+
+def _consecutive(np, mask):
+    """Panjang run True berturut-turut yang berakhir di tiap baris"""
+    idx = np.arange(len(mask))
+    last_false = np.maximum.accumulate(np.where(mask, -1, idx))
+    return np.where(mask, idx - last_false, 0)
+
+
+def load_rules(path=DEFAULT_RULES_PATH):
+    """RuleSet dari file; DEFAULT_RULES jika file tidak ada"""
+    try:
+        return RuleSet.load(path)
+    except FileNotFoundError:
+        return RuleSet.from_config(DEFAULT_RULES)
+
+
+# --- Evaluasi live ---
+
+class Alert:
+    __slots__ = ('rule', 'since', 'acknowledged')
+
+    def __init__(self, rule, since):
+        self.rule = rule
+        self.since = since
+        self.acknowledged = False
+
+    def __repr__(self):
+        return f"{self.rule.severity.upper()} {self.rule.name}: {self.rule.message}"
+
+
+class RuleEngine:
+    """State incremental RuleSet untuk stream frame.
+
+    process() dipanggil per frame, check(now) per tick untuk rule yang
+    memakai frame_age. Keduanya return (raised, cleared): list Alert yang
+    baru aktif dan yang baru padam.
+    """
+
+    def __init__(self, ruleset):
+        self.ruleset = ruleset
+        self.evaluated = 0
+        self.clear()
+
+    def clear(self):
+        n = len(self.ruleset)
+        self._runs = [0] * n
+        self.active = [None] * n
+        self._last_values = {}
+        self._last_time = None
+        self._last_frame = None
+
+    def process(self, timestamp, frame):
+        ruleset = self.ruleset
+        age = NAN if self._last_time is None else timestamp - self._last_time
+        results = ruleset.evaluate(frame, timestamp, self._last_values, age)
+        self.evaluated += 1
+        # rate/delta selalu terhadap frame tepat sebelumnya (seperti np.diff
+        # di review), termasuk jika kolom itu tidak ada di frame tersebut
+        last_values = self._last_values
+        get = frame.get
+        for column, missing in ruleset.evaluate.missing.items():
+            last_values[column] = (get(column, missing), timestamp)
+        self._last_time = timestamp
+        self._last_frame = frame
+
+        raised = []
+        cleared = []
+        runs = self._runs
+        active = self.active
+        rules = ruleset.rules
+        for i, hit in enumerate(results):
+            if hit:
+                runs[i] += 1
+                if active[i] is None and runs[i] >= rules[i].frames:
+                    active[i] = Alert(rules[i], timestamp)
+                    raised.append(active[i])
+            else:
+                runs[i] = 0
+                if active[i] is not None:
+                    cleared.append(active[i])
+                    active[i] = None
+        return raised, cleared
+
+    def check(self, now):
+        """Evaluasi rule frame_age terhadap waktu sekarang (tanpa frame baru).
+
+        Hasilnya dihitung seperti frame yang tiba saat `now`, jadi `for`
+        tetap berlaku: rule baru aktif jika run frame sebelumnya ditambah
+        frame itu mencapai rule.frames.
+        """
+        ruleset = self.ruleset
+        if not ruleset.age_rules or self._last_frame is None:
+            return [], []
+        results = ruleset.evaluate_age(self._last_frame, self._last_time, self._last_values,
+                                       now - self._last_time)
+        raised = []
+        cleared = []
+        active = self.active
+        runs = self._runs
+        rules = ruleset.rules
+        for i, hit in zip(ruleset.age_rules, results):
+            if hit and active[i] is None and runs[i] + 1 >= rules[i].frames:
+                active[i] = Alert(rules[i], now)
+                raised.append(active[i])
+            elif not hit and active[i] is not None and runs[i] == 0:
+                cleared.append(active[i])
+                active[i] = None
+        return raised, cleared
+
+    def alerts(self):
+        """Alarm aktif, critical dulu"""
+        alerts = [alert for alert in self.active if alert is not None]
+        alerts.sort(key=lambda a: (-SEVERITIES.index(a.rule.severity), a.since))
+        return alerts
+
+    def acknowledge(self):
+        for alert in self.active:
+            if alert is not None:
+                alert.acknowledged = True
+
+    def unacknowledged(self, severity='critical'):
+        return any(alert is not None and not alert.acknowledged and alert.rule.severity == severity
+                   for alert in self.active)
+
+
+# --- CLI ---
+
+def format_episode(episode):
+    start = datetime.fromtimestamp(episode['start']).strftime('%H:%M:%S')
+    if episode['end'] is None:
+        span = "until end of log"
+    else:
+        span = f"for {episode['end'] - episode['start']:.1f}s"
+    return (f"{start} {episode['severity'].upper():8} {episode['rule']} "
+            f"{span} ({episode['frames']} frames)")
+
+
+def main(argv=None):
+    from gcs_query import FlightIndex
+
+    ap = argparse.ArgumentParser(description="Evaluasi rule alarm atas flight log")
+    ap.add_argument('paths', nargs='+', help='flight log .lfr atau index .npz')
+    ap.add_argument('--rules', default=DEFAULT_RULES_PATH, help='file rule JSON')
+    ap.add_argument('--from', dest='t_start', help='awal rentang waktu')
+    ap.add_argument('--to', dest='t_end', help='akhir rentang waktu')
+    args = ap.parse_args(argv)
+
+    try:
+        ruleset = load_rules(args.rules)
+    except (RuleError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    index = FlightIndex.open(args.paths)
+    episodes = ruleset.review(index, args.t_start, args.t_end)
+    for episode in episodes:
+        print(format_episode(episode))
+    counts = {}
+    for episode in episodes:
+        counts[episode['rule']] = counts.get(episode['rule'], 0) + 1
+    print(f"{len(index)} frames, {len(ruleset)} rules, {len(episodes)} alerts"
+          + "".join(f"\n  {name}: {count}" for name, count in counts.items()), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
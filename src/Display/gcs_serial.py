@@ -0,0 +1,124 @@
+import time
+
+READ_TIMEOUT = 0.5       # detik; hanya untuk cek flag stop, bukan polling
+READ_CHUNK = 4096
+MAX_LINE_LENGTH = 4096
+
+
+class LatencyHistogram:
+    """Histogram latency dengan bucket log2 dalam mikrodetik.
+
+    Bucket ke-i menampung nilai < 2**i us, jadi record() O(1) tanpa alokasi.
+    """
+
+    def __init__(self, buckets=24):
+        self.counts = [0] * buckets
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        us = int(seconds * 1e6)
+        index = min(us.bit_length(), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """Batas atas bucket (detik) yang memuat persentil p (0-100)"""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100.0
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return (1 << i) / 1e6
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def summary(self):
+        return (f"n={self.count} mean={self.mean() * 1e3:.3f}ms "
+                f"p50<{self.percentile(50) * 1e3:.3f}ms "
+                f"p99<{self.percentile(99) * 1e3:.3f}ms "
+                f"max={self.max * 1e3:.3f}ms")
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.mean(),
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'buckets_us': {1 << i: n for i, n in enumerate(self.counts) if n},
+        }
+
+
+class SerialReader:
+    """Reader serial blocking tanpa polling in_waiting + sleep.
+
+    read(1) block sampai ada byte (atau timeout), lalu sisa byte yang sudah
+    ada di buffer driver diambil sekaligus. Baris di-split sendiri di
+    bytearray yang dipakai ulang dan langsung diteruskan ke `on_line`.
+    """
+
+    def __init__(self, ser, on_line, chunk_size=READ_CHUNK):
+        self.ser = ser
+        self.on_line = on_line
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+        self.latency = LatencyHistogram()
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.running = False
+
+    def run(self):
+        """Loop utama reader thread; berhenti saat stop() atau port error"""
+        ser = self.ser
+        if ser.timeout is None:
+            ser.timeout = READ_TIMEOUT
+        self.running = True
+        while self.running:
+            data = ser.read(1)
+            if not data:
+                continue
+            waiting = ser.in_waiting
+            if waiting:
+                data += ser.read(min(waiting, self.chunk_size))
+            self.feed(data, time.perf_counter())
+
+    def feed(self, data, received_at=None):
+        """Split chunk jadi baris dan kirim ke on_line"""
+        if received_at is None:
+            received_at = time.perf_counter()
+        self.bytes_read += len(data)
+        buf = self.buffer
+        buf += data
+        start = 0
+        while True:
+            nl = buf.find(b'\n', start)
+            if nl < 0:
+                break
+            line = bytes(buf[start:nl]).strip()
+            start = nl + 1
+            if line:
+                self.lines_read += 1
+                self.on_line(line)
+                self.latency.record(time.perf_counter() - received_at)
+        if start:
+            del buf[:start]
+        if len(buf) > MAX_LINE_LENGTH:
+            buf.clear()
+
+    def stop(self):
+        self.running = False
@@ -0,0 +1,283 @@
+import os
+import json
+import math
+import time
+from array import array
+from bisect import bisect_left
+
+# (nama kolom, typecode array)
+COLUMNS = (
+    ('timestamp', 'd'),   # float64 epoch detik
+    ('altitude', 'f'),    # float32
+    ('latitude', 'i'),    # int32, derajat * 1e7
+    ('longitude', 'i'),   # int32, derajat * 1e7
+    ('voltage', 'f'),     # float32
+    ('remaining', 'h'),   # int16, persen (REMAINING_UNKNOWN jika tidak ada)
+    ('status', 'H'),      # kode ke tabel status
+    ('rssi', 'f'),        # float32
+    ('snr', 'f'),         # float32
+    ('cycle_time', 'i'),  # int32, ms
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+TYPECODES = dict(COLUMNS)
+REMAINING_UNKNOWN = -1  # 0% adalah nilai valid, jadi penanda "tidak ada" harus negatif
+
+FLOAT32_MAX = 3.4028234663852886e38
+# Rentang nilai yang muat di kolom (typed array di sini, struct di
+# gcs_recorder) -> (min, max, pengganti). Baris serial rusak seperti
+# "Battery: 12.45V (99999%)" tetap ter-parse, jadi nilai di luar rentang
+# disimpan sebagai "tidak ada" alih-alih membuat append/pack error.
+FIELD_LIMITS = {
+    'altitude': (-FLOAT32_MAX, FLOAT32_MAX, math.nan),
+    'latitude': (-2**31, 2**31 - 1, 0),
+    'longitude': (-2**31, 2**31 - 1, 0),
+    'voltage': (-FLOAT32_MAX, FLOAT32_MAX, math.nan),
+    'remaining': (-2**15, 2**15 - 1, REMAINING_UNKNOWN),
+    'rssi': (-FLOAT32_MAX, FLOAT32_MAX, math.nan),
+    'snr': (-FLOAT32_MAX, FLOAT32_MAX, math.nan),
+    'cycle_time': (-2**31, 2**31 - 1, 0),
+}
+
+DEFAULT_CHUNK_SIZE = 4096
+DEFAULT_MAX_ROWS = 1_000_000  # ~40 MB, > 5 hari pada siklus 500 ms
+
+
+def clamp_frame(data):
+    """Frame dengan nilai di luar FIELD_LIMITS diganti nilai "tidak ada".
+
+    Return dict yang sama jika semua nilai muat (kasus normal, tanpa copy).
+    """
+    out = data
+    for name, value in data.items():
+        limits = FIELD_LIMITS.get(name)
+        if limits is not None and (value < limits[0] or value > limits[1]):
+            if out is data:
+                out = dict(data)
+            out[name] = limits[2]
+    return out
+
+
+class TelemetryStore:
+    """Column store untuk frame telemetri dengan typed array.
+
+    Data disimpan dalam chunk berukuran tetap; semua chunk kecuali yang
+    terakhir selalu penuh, jadi lookup baris ke-i cukup i // chunk_size.
+    Jika `max_rows` terlampaui, chunk tertua dibuang (atau ditulis ke
+    `spill_dir` bila diset). Nilai float yang tidak ada di frame disimpan
+    sebagai NaN, `remaining` sebagai REMAINING_UNKNOWN, integer lain
+    sebagai 0 dan status sebagai ''; nilai di luar rentang kolom
+    diperlakukan sama (lihat clamp_frame).
+    """
+
+    def __init__(self, max_rows=DEFAULT_MAX_ROWS, chunk_size=DEFAULT_CHUNK_SIZE,
+                 spill_dir=None):
+        self.max_rows = max_rows
+        self.chunk_size = chunk_size
+        self.spill_dir = spill_dir
+        self.status_table = []
+        self._status_codes = {}
+        self._chunks = []
+        self._length = 0
+        self.dropped_rows = 0
+        self.spilled_rows = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def _new_chunk(self):
+        chunk = {name: array(code) for name, code in COLUMNS}
+        self._chunks.append(chunk)
+        return chunk
+
+    def intern_status(self, status):
+        code = self._status_codes.get(status)
+        if code is None:
+            code = len(self.status_table)
+            self._status_codes[status] = code
+            self.status_table.append(status)
+        return code
+
+    def status_name(self, code):
+        return self.status_table[code]
+
+    def append(self, data, timestamp=None):
+        """Tambah satu frame (dict dari DataParser), return index barisnya"""
+        chunks = self._chunks
+        if not chunks or len(chunks[-1]['timestamp']) >= self.chunk_size:
+            chunk = self._new_chunk()
+        else:
+            chunk = chunks[-1]
+
+        get = clamp_frame(data).get
+        nan = math.nan
+        chunk['timestamp'].append(time.time() if timestamp is None else timestamp)
+        chunk['altitude'].append(get('altitude', nan))
+        chunk['latitude'].append(get('latitude', 0))
+        chunk['longitude'].append(get('longitude', 0))
+        chunk['voltage'].append(get('voltage', nan))
+        chunk['remaining'].append(get('remaining', REMAINING_UNKNOWN))
+        chunk['status'].append(self.intern_status(get('status', '')))
+        chunk['rssi'].append(get('rssi', nan))
+        chunk['snr'].append(get('snr', nan))
+        chunk['cycle_time'].append(get('cycle_time', 0))
+        self._length += 1
+
+        if self.max_rows is not None and self._length - self.chunk_size >= self.max_rows:
+            self._drop_oldest_chunk()
+        return self._length - 1
+
+    def _drop_oldest_chunk(self):
+        chunk = self._chunks.pop(0)
+        rows = len(chunk['timestamp'])
+        self._length -= rows
+        self.dropped_rows += rows
+        if self.spill_dir:
+            self._spill(chunk)
+            self.spilled_rows += rows
+
+    def _spill(self, chunk):
+        for name, _ in COLUMNS:
+            with open(os.path.join(self.spill_dir, f"{name}.bin"), 'ab') as f:
+                chunk[name].tofile(f)
+        with open(os.path.join(self.spill_dir, 'status.json'), 'w') as f:
+            json.dump(self.status_table, f)
+
+    def clear(self):
+        self._chunks = []
+        self._length = 0
+        self.dropped_rows = 0
+        if self.spill_dir and self.spilled_rows:
+            for filename in [f"{name}.bin" for name in COLUMN_NAMES] + ['status.json']:
+                path = os.path.join(self.spill_dir, filename)
+                if os.path.exists(path):
+                    os.remove(path)
+            self.spilled_rows = 0
+
+    # --- Query ---
+
+    def _normalize(self, start, stop):
+        start, stop, _ = slice(start, stop).indices(self._length)
+        return start, max(start, stop)
+
+    def column(self, name, start=0, stop=None):
+        """Slice satu kolom sebagai array baru (mendukung index negatif)"""
+        start, stop = self._normalize(start, stop)
+        cs = self.chunk_size
+        out = array(TYPECODES[name])
+        i = start
+        while i < stop:
+            ci, off = divmod(i, cs)
+            end = min(cs, off + stop - i)
+            out.extend(self._chunks[ci][name][off:end])
+            i += end - off
+        return out
+
+    def tail(self, name, n):
+        return self.column(name, -n if n else self._length)
+
+    def row(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        chunk = self._chunks[index // self.chunk_size]
+        off = index % self.chunk_size
+        row = {name: chunk[name][off] for name in COLUMN_NAMES}
+        row['status'] = self.status_table[row['status']]
+        return row
+
+    def rows(self, start=0, stop=None):
+        start, stop = self._normalize(start, stop)
+        for i in range(start, stop):
+            yield self.row(i)
+
+    def index_range(self, t_start=None, t_end=None):
+        """Return (start, stop) baris dengan t_start <= timestamp < t_end.
+
+        Timestamp diasumsikan monoton (urutan kedatangan).
+        """
+        start = 0 if t_start is None else self._bisect_time(t_start)
+        stop = self._length if t_end is None else self._bisect_time(t_end)
+        return start, max(start, stop)
+
+    def _bisect_time(self, t):
+        chunks = self._chunks
+        if not chunks:
+            return 0
+        firsts = [c['timestamp'][0] for c in chunks]
+        ci = max(0, bisect_left(firsts, t) - 1)
+        ts = chunks[ci]['timestamp']
+        off = bisect_left(ts, t)
+        if off == len(ts) and ci + 1 < len(chunks):
+            return (ci + 1) * self.chunk_size
+        return ci * self.chunk_size + off
+
+    def time_range(self, t_start=None, t_end=None):
+        start, stop = self.index_range(t_start, t_end)
+        return self.rows(start, stop)
+
+    def iter_chunks(self, include_spilled=False):
+        """Yield dict kolom -> array per chunk, dari yang tertua"""
+        if include_spilled and self.spill_dir and self.spilled_rows:
+            yield from self._iter_spilled(self.spilled_rows)
+        for chunk in self._chunks:
+            yield chunk
+
+    def snapshot(self, include_spilled=True):
+        """Daftar chunk yang konsisten untuk dibaca dari thread lain.
+
+        Return (spilled_rows, chunks). Chunk terakhir (yang mungkin sedang
+        di-append) di-copy sepanjang kolom terpendek; chunk penuh tidak
+        pernah diubah lagi sehingga cukup direferensikan.
+        """
+        chunks = list(self._chunks)
+        if chunks:
+            last = chunks[-1]
+            n = min(len(arr) for arr in last.values())
+            chunks[-1] = {name: arr[:n] for name, arr in last.items()}
+        spilled = self.spilled_rows if include_spilled and self.spill_dir else 0
+        return spilled, chunks
+
+    def iter_snapshot(self, snapshot):
+        spilled, chunks = snapshot
+        if spilled:
+            yield from self._iter_spilled(spilled)
+        yield from chunks
+
+    def to_columns(self, include_spilled=True):
+        """Gabungkan semua chunk jadi dict kolom -> list, status sudah di-decode"""
+        columns = {name: [] for name in COLUMN_NAMES}
+        for chunk in self.iter_chunks(include_spilled):
+            for name in COLUMN_NAMES:
+                columns[name].extend(chunk[name])
+        table = self.status_table
+        columns['status'] = [table[code] for code in columns['status']]
+        return columns
+
+    def _iter_spilled(self, rows):
+        files = {name: open(os.path.join(self.spill_dir, f"{name}.bin"), 'rb')
+                 for name, _ in COLUMNS}
+        try:
+            remaining = rows
+            while remaining > 0:
+                n = min(self.chunk_size, remaining)
+                chunk = {}
+                for name, code in COLUMNS:
+                    arr = array(code)
+                    arr.fromfile(files[name], n)
+                    chunk[name] = arr
+                remaining -= n
+                yield chunk
+        finally:
+            for f in files.values():
+                f.close()
+
+    def memory_usage(self):
+        """Perkiraan bytes yang dipakai buffer kolom"""
+        return sum(arr.buffer_info()[1] * arr.itemsize
+                   for chunk in self._chunks for arr in chunk.values())
@@ -0,0 +1,246 @@
+"""Transport asyncio untuk ingest receiver.
+
+Setiap transport menghasilkan stream bytes mentah (output Receiver_5.ino)
+lewat `await read()`; b'' berarti stream selesai. Parsing tetap di
+DataParser, jadi semua transport bisa dipakai bergantian.
+
+Sumber ditulis sebagai string:
+    COM3, /dev/ttyUSB0, serial:///dev/ttyUSB0?baud=9600   serial (executor)
+    tcp://10.0.0.5:4000                                   TCP client
+    udp://0.0.0.0:14550                                   UDP listen
+    file:///path/capture.txt?delay=0.01                   replay file
+"""
+import abc
+import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from gcs_serial import READ_TIMEOUT, READ_CHUNK
+
+DEFAULT_BAUD = 115200
+UDP_QUEUE_SIZE = 1024        # datagram; yang terlama dibuang jika penuh
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+
+class Transport(abc.ABC):
+    """Basis transport: open(), read() dan close() dipanggil dari event loop
+
+    Subclass wajib mengisi read(); open() dan close() default tidak berbuat apa-apa.
+    """
+
+    scheme = None
+    reconnect = False
+
+    def __init__(self, spec):
+        self.spec = spec
+
+    async def open(self):
+        pass
+
+    @abc.abstractmethod
+    async def read(self):
+        """Chunk bytes berikutnya; b'' jika stream selesai"""
+
+    async def close(self):
+        pass
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.spec}>"
+
+
+class SerialTransport(Transport):
+    """pyserial blocking di thread executor sendiri (satu thread per port)"""
+
+    scheme = 'serial'
+
+    def __init__(self, port, baud=DEFAULT_BAUD, ser=None):
+        super().__init__(port)
+        self.port = port
+        self.baud = baud
+        self.ser = ser
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"serial-{port}")
+        self._closing = False
+
+    async def open(self):
+        if self.ser is None:
+            loop = asyncio.get_running_loop()
+            self.ser = await loop.run_in_executor(self._executor, self._open_blocking)
+        elif self.ser.timeout is None:
+            self.ser.timeout = READ_TIMEOUT
+
+    def _open_blocking(self):
+        import serial
+
+        return serial.Serial(port=self.port, baudrate=self.baud, timeout=READ_TIMEOUT)
+
+    def _read_blocking(self):
+        # Sama dengan SerialReader.run(): read(1) block, lalu ambil sisa buffer
+        ser = self.ser
+        while not self._closing:
+            data = ser.read(1)
+            if not data:
+                continue
+            waiting = ser.in_waiting
+            if waiting:
+                data += ser.read(min(waiting, READ_CHUNK))
+            return data
+        return b''
+
+    async def read(self):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._read_blocking)
+
+    async def close(self):
+        self._closing = True
+        ser = self.ser
+        if ser is not None and ser.is_open:
+            # Tunggu read() yang sedang berjalan (maks READ_TIMEOUT) baru close
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, ser.close)
+        self._executor.shutdown(wait=False)
+
+
+class TCPTransport(Transport):
+    """Client TCP ke forwarder di site antena, reconnect otomatis"""
+
+    scheme = 'tcp'
+    reconnect = True
+
+    def __init__(self, host, port):
+        super().__init__(f"tcp://{host}:{port}")
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    async def open(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def read(self):
+        return await self._reader.read(READ_CHUNK)
+
+    async def close(self):
+        writer = self._writer
+        self._reader = self._writer = None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+class _DatagramQueue(asyncio.DatagramProtocol):
+    def __init__(self, maxlen):
+        self.queue = collections.deque(maxlen=maxlen)
+        self.dropped = 0
+        self.ready = asyncio.Event()
+
+    def datagram_received(self, data, addr):
+        queue = self.queue
+        if len(queue) == queue.maxlen:
+            self.dropped += 1
+        # Satu datagram biasanya satu baris tanpa newline
+        queue.append(data if data.endswith(b'\n') else data + b'\n')
+        self.ready.set()
+
+
+class UDPTransport(Transport):
+    """Listen UDP; datagram diantrikan di deque terbatas"""
+
+    scheme = 'udp'
+
+    def __init__(self, host, port, queue_size=UDP_QUEUE_SIZE):
+        super().__init__(f"udp://{host}:{port}")
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self._transport = None
+        self._protocol = None
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        self._transport, self._protocol = await loop.create_datagram_endpoint(
+            lambda: _DatagramQueue(self.queue_size), local_addr=(self.host, self.port))
+
+    @property
+    def local_address(self):
+        return self._transport.get_extra_info('sockname') if self._transport else None
+
+    @property
+    def dropped(self):
+        return self._protocol.dropped if self._protocol else 0
+
+    async def read(self):
+        protocol = self._protocol
+        while not protocol.queue:
+            protocol.ready.clear()
+            await protocol.ready.wait()
+        queue = protocol.queue
+        data = b''.join(queue)
+        queue.clear()
+        return data
+
+    async def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+class FileTransport(Transport):
+    """Baca capture file per chunk; `delay` detik antar chunk (0 = secepatnya)"""
+
+    scheme = 'file'
+
+    def __init__(self, path, chunk_size=READ_CHUNK, delay=0.0):
+        super().__init__(path)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.delay = delay
+        self._file = None
+
+    # I/O file di default executor supaya disk lambat (share jaringan, USB)
+    # tidak memblok link lain di event loop yang sama
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        self._file = await loop.run_in_executor(None, open, self.path, 'rb')
+
+    async def read(self):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._file.read, self.chunk_size)
+
+    async def close(self):
+        f = self._file
+        self._file = None
+        if f is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, f.close)
+
+
+def open_transport(spec, baud=DEFAULT_BAUD):
+    """String sumber -> Transport (belum dibuka)"""
+    if isinstance(spec, Transport):
+        return spec
+    if '://' not in spec:
+        return SerialTransport(spec, baud)
+    url = urlsplit(spec)
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    if url.scheme == 'serial':
+        return SerialTransport(url.netloc + url.path, int(query.get('baud', baud)))
+    if url.scheme == 'tcp':
+        return TCPTransport(url.hostname, url.port)
+    if url.scheme == 'udp':
+        return UDPTransport(url.hostname or '0.0.0.0', url.port,
+                            int(query.get('queue', UDP_QUEUE_SIZE)))
+    if url.scheme == 'file':
+        return FileTransport(url.netloc + url.path, delay=float(query.get('delay', 0.0)))
+    raise ValueError(f"Transport tidak dikenal: {spec}")
+
+
+async def reconnect_delay(attempt):
+    await asyncio.sleep(min(RECONNECT_DELAY * (2 ** attempt), MAX_RECONNECT_DELAY))
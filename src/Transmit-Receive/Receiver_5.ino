@@ -10,6 +10,34 @@
 #define SIGNAL_BANDWIDTH 62.5E3
 #define CODING_RATE      4
 
+// 0 = output teks (default), 1 = frame biner ringkas 44 byte per siklus
+// (lihat src/Display/gcs_binary.py; GCS mendeteksi format otomatis)
+#define BINARY_OUTPUT    0
+
+// 1 = teruskan setiap paket LoRa apa adanya: "payload\trssi\tsnr" per baris
+// (GCS merakit siklusnya sendiri, lihat src/Display/gcs_rawpacket.py)
+#define RAW_PACKET_OUTPUT 0
+
+#define FRAME_SYNC       0xA55A
+#define STATUS_LEN       8
+
+struct __attribute__((packed)) TelemetryFrame {
+  uint16_t sync;
+  uint16_t seq;
+  float altitude;
+  int32_t latitude;
+  int32_t longitude;
+  float voltage;
+  int16_t remaining;
+  char status[STATUS_LEN];
+  uint32_t cycle_time;
+  float rssi;
+  float snr;
+  uint16_t crc;
+};
+
+uint16_t frameSeq = 0;
+
 float altitude = 0.0;
 int32_t latitude = 0;
 int32_t longitude = 0;
@@ -49,6 +77,12 @@ void loop() {
     while (LoRa.available()) {
       receivedData += (char)LoRa.read();
     }
+#if RAW_PACKET_OUTPUT
+    receivedData.trim();
+    Serial.print(receivedData); Serial.print('\t');
+    Serial.print(LoRa.packetRssi()); Serial.print('\t');
+    Serial.println(LoRa.packetSnr(), 2);
+#endif
     processData(receivedData);
     RSSI += float(LoRa.packetRssi());
     SNR += LoRa.packetSnr();
@@ -96,6 +130,11 @@ void processData(String data) {
     cycleEndTime = millis();
     unsigned long totalCycleTime = cycleEndTime - cycleStartTime;
 
+#if RAW_PACKET_OUTPUT
+    // Paket sudah diteruskan satu per satu di loop()
+#elif BINARY_OUTPUT
+    sendBinaryFrame(totalCycleTime);
+#else
     Serial.println("========== UAV DATA ==========");
     Serial.print("Altitude: "); Serial.print(altitude, 2); Serial.println(" m");
     Serial.print("Latitude: "); Serial.println(latitude);
@@ -107,6 +146,7 @@ void processData(String data) {
     Serial.print("Avg RSSI: "); Serial.print(RSSI / 5.0, 2); Serial.println(" dBm");
     Serial.print("Avg SNR: "); Serial.print(SNR / 5.0, 2); Serial.println(" dB");
     Serial.println("==============================");
+#endif
 
     RSSI = 0.0;
     SNR = 0.0;
@@ -118,3 +158,35 @@ void processData(String data) {
     SNR = 0.0;
   }
 }
+
+// CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), sama dengan binascii.crc_hqx
+uint16_t crc16(const uint8_t *data, size_t len) {
+  uint16_t crc = 0xFFFF;
+  while (len--) {
+    crc ^= (uint16_t)(*data++) << 8;
+    for (uint8_t i = 0; i < 8; i++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+void sendBinaryFrame(unsigned long totalCycleTime) {
+  TelemetryFrame frame;
+  frame.sync = FRAME_SYNC;
+  frame.seq = frameSeq++;
+  frame.altitude = altitude;
+  frame.latitude = latitude;
+  frame.longitude = longitude;
+  frame.voltage = battery_voltage;
+  frame.remaining = battery_remaining;
+  memset(frame.status, 0, STATUS_LEN);
+  strncpy(frame.status, status_text.c_str(), STATUS_LEN);
+  frame.cycle_time = totalCycleTime;
+  frame.rssi = RSSI / 5.0;
+  frame.snr = SNR / 5.0;
+  // CRC atas semua field kecuali sync dan crc
+  frame.crc = crc16((const uint8_t *)&frame.seq,
+                    sizeof(frame) - sizeof(frame.sync) - sizeof(frame.crc));
+  Serial.write((const uint8_t *)&frame, sizeof(frame));
+}
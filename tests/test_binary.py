@@ -0,0 +1,76 @@
+from gcs_binary import AutoDecoder, BinaryDecoder, DETECT_BYTES, FRAME_SIZE, SYNC, decode_array, encode_frame
+from gcs_ingest import FrameFusion
+
+FRAME_TEXT = (
+    b"========== UAV DATA ==========\n"
+    b"Altitude: 10.00 m\n"
+    b"Battery: 12.10V (80%)\n"
+    b"Status: OK\n"
+    b"==============================\n"
+)
+
+FRAME = {'altitude': 10.0, 'latitude': -71234567, 'longitude': 1105000000, 'voltage': 12.1,
+         'remaining': 80, 'status': 'OK', 'cycle_time': 480, 'rssi': -80.0, 'snr': 9.0}
+
+
+def _decoder():
+    lines = []
+    frames = []
+    decoder = AutoDecoder(lambda line, received_at=None: lines.append(line), frames.append)
+    return decoder, lines, frames
+
+
+def test_stray_sync_in_text_stream_stays_text():
+    decoder, lines, frames = _decoder()
+    decoder.feed(FRAME_TEXT * 200)
+    assert decoder.mode == 'text'
+    decoder.feed(b'x' * DETECT_BYTES + SYNC + b'\n')
+    decoder.feed(b'Status: OK\n' + b'y' * (2 * DETECT_BYTES) + b'\n')
+    decoder.feed(FRAME_TEXT)
+    assert decoder.mode == 'text'
+    assert not frames
+    assert lines[-1].strip() == b'=============================='
+
+
+def test_text_switches_to_binary_on_valid_frame():
+    decoder, lines, frames = _decoder()
+    decoder.feed(FRAME_TEXT * 10)
+    assert decoder.mode == 'text'
+    data = b''.join(encode_frame(seq, FRAME) for seq in range(5))
+    decoder.feed(data[:50])
+    decoder.feed(data[50:])
+    assert decoder.mode == 'binary'
+    assert [frame['seq'] for frame in frames] == list(range(5))
+
+
+def test_detect_binary():
+    decoder, lines, frames = _decoder()
+    decoder.feed(b'\x00\x17' + b''.join(encode_frame(seq, FRAME) for seq in range(3)))
+    assert decoder.mode == 'binary'
+    assert len(frames) == 3
+    assert frames[0]['status'] == 'OK'
+
+
+def test_decode_array_matches_stream_decoder():
+    data = bytearray(b''.join(encode_frame(i, {'altitude': i * 1.5, 'status': 'OK'}) for i in range(300)))
+    data[FRAME_SIZE * 7 + 10] ^= 0x01   # CRC salah
+    data[FRAME_SIZE * 9] = 0x00         # sync salah
+    frames, bad = decode_array(bytes(data))
+    assert bad == 2
+    stream = [frame for frame in BinaryDecoder().feed(bytes(data)) if frame['seq'] not in (7, 9)]
+    assert frames['seq'].tolist() == [frame['seq'] for frame in stream]
+    assert frames['seq'].tolist() == [i for i in range(300) if i not in (7, 9)]
+
+
+def test_fusion_groups_text_and_binary_copies():
+    fused = []
+    fusion = FrameFusion(lambda timestamp, frame: fused.append(frame), window=1.0)
+    text = dict(FRAME, status='Low Battery', rssi=-100.0)
+    binary = BinaryDecoder().feed(encode_frame(1, dict(text, rssi=-80.0)))[0]
+    assert binary['status'] == 'Low Batt'
+    fusion.add('COM3', 100.0, text)
+    fusion.add('COM4', 100.05, binary)
+    fusion.flush(force=True)
+    assert len(fused) == 1
+    assert fused[0]['link'] == 'COM4' and fused[0]['links'] == 2
+    assert fused[0]['status'] == 'Low Battery'
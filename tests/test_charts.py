@@ -0,0 +1,53 @@
+import matplotlib
+
+matplotlib.use('Agg')
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from gcs_charts import ChartPanel
+
+
+def make_panel(**kwargs):
+    figure = Figure()
+    canvas = FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    line, = ax.plot([], [])
+    panel = ChartPanel(canvas, **kwargs)
+    panel.add_axes(ax, {'altitude': line})
+    return panel, ax, line
+
+
+def test_window_points_limits_line_length():
+    panel, ax, line = make_panel(window_points=50)
+    for i in range(500):
+        panel.append({'altitude': float(i)}, timestamp=float(i))
+    panel.refresh()
+    t, v = line.get_data()
+    # 50 titik terakhir + satu titik sebelumnya supaya line menyentuh tepi kiri
+    assert len(t) == 51
+    assert list(v[-50:]) == [float(i) for i in range(450, 500)]
+
+
+def test_refresh_within_limits_blits_instead_of_full_draw():
+    panel, ax, line = make_panel(window_points=None, window_seconds=100)
+    panel.update({'altitude': 10.0}, timestamp=0.0)
+    panel.update({'altitude': 11.0}, timestamp=1.0)
+    full_draws = panel.full_draws
+    assert full_draws >= 1
+
+    # Nilai di dalam batas axis: cukup blit
+    panel.update({'altitude': 10.5}, timestamp=2.0)
+    assert panel.full_draws == full_draws
+    assert panel.blits >= 1
+
+    # Nilai keluar batas y: full redraw
+    panel.update({'altitude': 1000.0}, timestamp=3.0)
+    assert panel.full_draws == full_draws + 1
+    assert ax.get_ylim()[1] > 1000.0
+
+
+def test_frame_without_chart_fields_is_not_drawn():
+    panel, ax, line = make_panel()
+    assert not panel.append({'voltage': 12.0}, timestamp=0.0)
+    assert panel.queries == 0
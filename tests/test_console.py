@@ -0,0 +1,34 @@
+import pytest
+
+from gcs_console import FILTERS
+
+malformed = FILTERS['Malformed']
+
+
+@pytest.mark.parametrize('line', [
+    "========== UAV DATA ==========",
+    "Altitude: 150.50 m",
+    "Battery: 12.45V (85%)",
+    "AL150.50\t-87\t8.25",
+    "LT-71234567\t-90",
+    "BV12.45,85\t-87\t8.25",
+    "STOK",
+])
+def test_valid_lines_are_not_malformed(line):
+    assert not malformed(line)
+
+
+@pytest.mark.parametrize('line', [
+    "Altitude: abc m",
+    "BV12.45\t-87\t8.25",
+    "AL150.50\tx\t8.25",
+    "LoRa init failed",
+])
+def test_malformed_lines(line):
+    assert malformed(line)
+
+
+def test_status_filter_matches_text_and_packet():
+    status = FILTERS['Status']
+    assert status("Status: OK") and status("STOK\t-87\t8.25")
+    assert not status("AL150.50")
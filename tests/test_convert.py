@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+
+from gcs_convert import BatchConverter, load_columns
+from gcs_query import FlightIndex
+
+BLOCK = (
+    "========== UAV DATA ==========\n"
+    "Altitude: {alt:.2f} m\n"
+    "Status: OK\n"
+    "Cycle Time: 500 ms\n"
+    "==============================\n"
+)
+
+
+def _capture(count):
+    return ''.join(BLOCK.format(alt=i) for i in range(count))
+
+
+def _prefixed(times):
+    return ''.join(''.join(f"{t} > {line}\n" for line in BLOCK.format(alt=i).splitlines())
+                   for i, t in enumerate(times))
+
+
+def test_prefixed_capture_keeps_gaps(tmp_path):
+    path = tmp_path / 'raw.txt'
+    path.write_text(_prefixed(['10:00:00', '10:00:00', '10:00:01', '10:05:00', '10:05:01']))
+    timestamps = load_columns(str(path))[0]['timestamp']
+    gaps = np.diff(timestamps)
+    assert len(timestamps) == 5
+    assert gaps[0] == 0.5
+    assert 298.0 <= gaps[2] <= 300.0
+    assert np.all(gaps > 0)
+
+
+def test_bare_capture_uses_cycle_time(tmp_path):
+    path = tmp_path / 'bare.txt'
+    path.write_text(_capture(4))
+    timestamps = load_columns(str(path))[0]['timestamp']
+    assert np.allclose(np.diff(timestamps), 0.5)
+    # Frame terakhir = mtime file
+    assert abs(timestamps[-1] - os.path.getmtime(path)) < 1e-3
+
+
+def _convert(src, out):
+    return BatchConverter([str(src)], str(out), jobs=1).run()
+
+
+def test_resume_and_checksum(tmp_path):
+    src = tmp_path / 'captures'
+    out = tmp_path / 'out'
+    src.mkdir()
+    (src / 'a.txt').write_text(_capture(3))
+    (src / 'b.txt').write_text(_capture(5))
+
+    stats = _convert(src, out)
+    assert (stats['converted'], stats['frames']) == (2, 8)
+    assert len(FlightIndex.load(str(out / 'b.npz'))) == 5
+
+    # Tidak ada yang berubah: dilewati tanpa membaca ulang
+    stats = _convert(src, out)
+    assert (stats['converted'], stats['skipped']) == (0, 2)
+
+    # Hanya mtime berubah: checksum sama, tidak di-parse ulang
+    stat = os.stat(src / 'a.txt')
+    os.utime(src / 'a.txt', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    stats = _convert(src, out)
+    assert (stats['converted'], stats['unchanged'], stats['skipped']) == (0, 1, 1)
+
+    # Isi berubah: dikonversi ulang
+    (src / 'b.txt').write_text(_capture(7))
+    stats = _convert(src, out)
+    assert (stats['converted'], stats['frames']) == (1, 7)
+    assert len(FlightIndex.load(str(out / 'b.npz'))) == 7
+    assert not list(out.glob('*.partial*'))
+
+
+def test_only_new_captures_converted(tmp_path):
+    src = tmp_path / 'captures'
+    out = tmp_path / 'out'
+    src.mkdir()
+    (src / 'a.txt').write_text(_capture(3))
+    _convert(src, out)
+    (src / 'b.txt').write_text(_capture(2))
+    stats = _convert(src, out)
+    assert (stats['converted'], stats['skipped']) == (1, 1)
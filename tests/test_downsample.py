@@ -0,0 +1,43 @@
+import numpy as np
+
+from gcs_downsample import MinMaxPyramid, RingBuffer
+
+
+def test_ring_buffer_view_after_wrap():
+    ring = RingBuffer(4)
+    for i in range(6):
+        ring.append(float(i), float(i * 10))
+    t, v = ring.view()
+    assert t.tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert v.tolist() == [20.0, 30.0, 40.0, 50.0]
+    assert len(ring) == 4
+
+
+def test_query_keeps_spikes_within_max_points():
+    pyramid = MinMaxPyramid(raw_points=1024)
+    values = np.sin(np.arange(100000) / 500.0)
+    values[31337] = 50.0     # spike
+    values[77777] = -50.0    # drop
+    for i, value in enumerate(values):
+        pyramid.append(float(i), value)
+    t, v = pyramid.query(0.0, 99999.0, 1000)
+    assert 0 < len(t) <= 1000
+    assert v.max() == 50.0 and v.min() == -50.0
+    assert np.all(np.diff(t) >= 0)
+
+
+def test_query_recent_window_at_full_resolution():
+    pyramid = MinMaxPyramid(raw_points=1024)
+    for i in range(5000):
+        pyramid.append(float(i), float(i))
+    t, v = pyramid.query(4900.0, 4999.0, 1000)
+    # Resolusi penuh + satu titik sebelum window
+    assert t.tolist() == [float(i) for i in range(4899, 5000)]
+
+
+def test_nan_is_skipped():
+    pyramid = MinMaxPyramid(raw_points=16)
+    pyramid.append(0.0, 1.0)
+    pyramid.append(1.0, float('nan'))
+    assert len(pyramid) == 1
+    assert pyramid.t_last == 0.0
@@ -0,0 +1,58 @@
+import csv
+
+import pytest
+
+from gcs_export import ExportCancelled, ExportJob, detect_format
+from gcs_store import COLUMN_NAMES, TelemetryStore
+
+
+def make_store(rows):
+    store = TelemetryStore(max_rows=None)
+    for i in range(rows):
+        store.append({'altitude': 12.45 + i, 'voltage': 12.0, 'remaining': 80,
+                      'status': 'OK' if i % 2 else 'Low Battery', 'cycle_time': 500},
+                     timestamp=1700000000.0 + i)
+    return store
+
+
+def test_csv_export_writes_all_rows(tmp_path):
+    path = str(tmp_path / 'flight.csv')
+    job = ExportJob(make_store(5), path)
+    assert job.fmt == 'csv'
+    assert job.run() == path
+    assert job.progress == 1.0
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(COLUMN_NAMES)
+    assert len(rows) == 6
+    row = dict(zip(COLUMN_NAMES, rows[1]))
+    assert row['altitude'] == '12.45'
+    assert row['status'] == 'Low Battery'
+    assert row['rssi'] == ''
+    assert dict(zip(COLUMN_NAMES, rows[2]))['status'] == 'OK'
+
+
+def test_cancelled_export_removes_file(tmp_path):
+    path = tmp_path / 'flight.csv'
+    job = ExportJob(make_store(5), str(path))
+    job.cancel()
+    job.start()
+    assert job.join(5)
+    assert job.cancelled
+    assert isinstance(job.error, ExportCancelled)
+    assert not path.exists()
+
+
+def test_snapshot_ignores_rows_appended_after_start(tmp_path):
+    store = make_store(3)
+    job = ExportJob(store, str(tmp_path / 'flight.csv'))
+    store.append({'altitude': 1.0}, timestamp=1700000100.0)
+    job.run()
+    assert job.done == job.total == 3
+
+
+def test_detect_format():
+    assert detect_format('a.PQ') == 'parquet'
+    with pytest.raises(ValueError):
+        detect_format('a.txt')
@@ -0,0 +1,44 @@
+import io
+import json
+
+from gcs_headless import HeadlessIngest, format_stats
+from gcs_rules import RuleSet
+
+BLOCK = (
+    "========== UAV DATA ==========\n"
+    "Altitude: {alt:.2f} m\n"
+    "Battery: 12.45V (80%)\n"
+    "Status: OK\n"
+    "Cycle Time: 500 ms\n"
+    "==============================\n"
+)
+
+
+def test_run_file_writes_json_lines(tmp_path):
+    path = tmp_path / 'capture.txt'
+    # Blok terakhir tanpa newline penutup tetap di-flush
+    path.write_bytes(''.join(BLOCK.format(alt=i) for i in range(3)).rstrip('\n').encode())
+    output = io.BytesIO()
+    ingest = HeadlessIngest(output=output, max_rows=None)
+    ingest.run_file(str(path))
+
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [row['altitude'] for row in rows] == [0.0, 1.0, 2.0]
+    assert all(row['status'] == 'OK' and row['voltage'] == 12.45 for row in rows)
+    assert 'timestamp' in rows[0]
+
+    stats = ingest.stats()
+    assert stats['frames'] == 3
+    assert stats['stored_rows'] == 3
+    assert stats['lines'] == 18
+    assert 'frames 3' in format_stats(stats)
+
+
+def test_alert_on_rule(tmp_path):
+    path = tmp_path / 'capture.txt'
+    path.write_text(BLOCK.format(alt=500))
+    alerts = []
+    ingest = HeadlessIngest(on_alert=alerts.append, max_rows=None,
+                            rules=RuleSet.from_config([{'name': 'high', 'when': 'altitude > 400'}]))
+    ingest.run_file(str(path))
+    assert any(alert.startswith('alert') and 'high' in alert for alert in alerts)
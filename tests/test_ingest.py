@@ -0,0 +1,146 @@
+import asyncio
+import threading
+
+import pytest
+
+from gcs_ingest import FrameFusion, MultiReceiverIngest
+from gcs_transport import SerialTransport, Transport
+
+FRAME = (
+    "========== UAV DATA ==========\n"
+    "Altitude: {alt:.2f} m\n"
+    "Battery: 12.10V (80%)\n"
+    "Status: OK\n"
+    "==============================\n"
+)
+
+
+def capture(n):
+    return ''.join(FRAME.format(alt=i) for i in range(n)).encode()
+
+
+class FakeSerial:
+    """Pengganti serial.Serial: kirim data per byte lalu diam (read timeout)"""
+
+    def __init__(self, data, timeout=0.01):
+        self.data = bytearray(data)
+        self.timeout = timeout
+        self.is_open = True
+        self._idle = threading.Event()
+
+    @property
+    def in_waiting(self):
+        return len(self.data)
+
+    def read(self, size=1):
+        if not self.data:
+            self._idle.wait(self.timeout)
+            return b''
+        out = bytes(self.data[:size])
+        del self.data[:size]
+        return out
+
+    def close(self):
+        self.is_open = False
+
+
+async def _collect(ingest, count, timeout=5.0):
+    frames = []
+    ingest.on_frame = lambda timestamp, frame: frames.append(frame)
+    await ingest.open_links()
+    try:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while len(frames) < count and loop.time() < deadline:
+            await asyncio.sleep(0.01)
+    finally:
+        await ingest.close_links()
+    return frames
+
+
+def test_tcp_loopback():
+    async def main():
+        async def handle(reader, writer):
+            writer.write(capture(5))
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await _collect(MultiReceiverIngest([f"tcp://127.0.0.1:{port}"]), 5)
+
+    frames = asyncio.run(main())
+    assert [frame['altitude'] for frame in frames[:5]] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert frames[0]['link'].startswith('tcp://127.0.0.1:')
+
+
+def test_fake_serial():
+    transport = SerialTransport('FAKE0', ser=FakeSerial(capture(3)))
+    frames = asyncio.run(_collect(MultiReceiverIngest([transport]), 3))
+    assert [frame['altitude'] for frame in frames] == [0.0, 1.0, 2.0]
+
+
+def test_consumer_error_keeps_link_reading(tmp_path):
+    path = tmp_path / 'capture.txt'
+    path.write_bytes(capture(4))
+    frames = []
+
+    def on_frame(timestamp, frame):
+        if frame['altitude'] == 1.0:
+            raise RuntimeError("consumer rusak")
+        frames.append(frame['altitude'])
+
+    ingest = MultiReceiverIngest([f"file://{path}"], on_frame=on_frame)
+    asyncio.run(ingest.serve())
+    assert frames == [0.0, 2.0, 3.0]
+    assert ingest.links[0].error is None
+    assert ingest.links[0].consumer_errors == 1
+
+
+def test_final_line_without_newline(tmp_path):
+    path = tmp_path / 'capture.txt'
+    path.write_bytes(capture(2).rstrip(b'\n'))
+    frames = []
+    ingest = MultiReceiverIngest([f"file://{path}"], on_frame=lambda t, f: frames.append(f))
+    asyncio.run(ingest.serve())
+    assert len(frames) == 2
+
+
+def test_fusion_keeps_best_rssi_copy_per_cycle():
+    fused = []
+    fusion = FrameFusion(lambda timestamp, frame: fused.append((timestamp, frame)), window=0.15)
+    first = {'altitude': 10.0, 'voltage': 12.1, 'status': 'OK', 'rssi': -110.0, 'snr': 2.0}
+    second = {'altitude': 10.5, 'voltage': 12.1, 'status': 'OK', 'rssi': -90.0}
+    fusion.add('COM3', 100.0, first)
+    fusion.add('COM4', 100.05, dict(first, rssi=-95.0, snr=8.0))
+    fusion.add('tcp://gs2:4000', 100.1, dict(first, rssi=-120.0))
+    fusion.add('COM3', 100.5, second)
+
+    # Window siklus pertama belum habis
+    assert fusion.flush(now=100.1) == 0
+    assert fusion.flush(now=100.2) == 1
+    assert fusion.flush(now=100.7) == 1
+    assert [timestamp for timestamp, _ in fused] == [100.0, 100.5]
+    best = fused[0][1]
+    assert (best['link'], best['links'], best['rssi'], best['snr']) == ('COM4', 3, -95.0, 8.0)
+    assert fused[1][1]['links'] == 1
+    assert (fusion.frames_in, fusion.frames_out, fusion.duplicates) == (4, 2, 2)
+
+
+def test_fusion_window_zero_passes_every_frame():
+    fused = []
+    fusion = FrameFusion(lambda timestamp, frame: fused.append(frame), window=0)
+    frame = {'altitude': 10.0, 'rssi': -100.0}
+    fusion.add('COM3', 1.0, frame)
+    fusion.add('COM4', 1.0, frame)
+    assert [f['link'] for f in fused] == ['COM3', 'COM4']
+    assert 'link' not in frame
+
+
+def test_transport_requires_read():
+    class NoRead(Transport):
+        pass
+
+    with pytest.raises(TypeError):
+        NoRead('x')
@@ -0,0 +1,78 @@
+import pytest
+
+from gcs_linkquality import (LEVEL_CRITICAL, LEVEL_OK, LINK_LOST_SECONDS, RECOVER_SECONDS,
+                             LinkQuality, RollingStats)
+
+GOOD = {'rssi': -80.0, 'snr': 10.0, 'cycle_time': 500}
+
+
+def test_missed_cycles_inferred_from_gaps():
+    quality = LinkQuality()
+    for t in (0.0, 0.5, 1.0, 2.5, 5.0):
+        quality.add(t, GOOD)
+    # 1.0 -> 2.5: 2 siklus hilang; 2.5 -> 5.0: 4 hilang dan dihitung outage
+    assert quality.frames == 5
+    assert quality.missed == 6
+    assert quality.outages == 1
+    assert quality.loss_rate == pytest.approx(6 / 11)
+
+
+def test_loss_window_forgets_old_gaps():
+    quality = LinkQuality(loss_window=10.0)
+    quality.add(0.0, GOOD)
+    quality.add(2.0, GOOD)   # 3 hilang
+    for i in range(1, 30):
+        quality.add(2.0 + i * 0.5, GOOD)
+    assert quality.missed == 3
+    assert quality.loss_rate == 0.0
+
+
+def test_level_rises_at_once_and_recovers_after_hold():
+    # loss_window pendek: loss tidak pernah dinilai, hanya link hilang
+    quality = LinkQuality(loss_window=1.0)
+    t = 0.0
+    while t <= 10.0:
+        assert quality.add(t, GOOD) is None
+        t += 0.5
+    last = t - 0.5
+    assert quality.check(last + LINK_LOST_SECONDS + 1.0) == LEVEL_CRITICAL
+    assert quality.alerts == 1
+
+    resume = last + LINK_LOST_SECONDS + 1.5
+    changes = []
+    t = resume
+    while t <= resume + RECOVER_SECONDS + 1.0:
+        changes.append((t, quality.add(t, GOOD)))
+        t += 0.5
+    recovered = [t for t, level in changes if level is not None]
+    assert recovered == [resume + RECOVER_SECONDS]
+    assert quality.level == LEVEL_OK
+    assert quality.alerts == 1
+
+
+def test_rolling_percentile_mean_and_window():
+    stats = RollingStats(100, lo=0.0, hi=100.0, bucket=1.0)
+    for i in range(200):
+        stats.add(float(i), float(i % 100))
+    assert len(stats) == 100
+    assert stats.mean() == pytest.approx(49.5)
+    assert stats.std() == pytest.approx(28.866, abs=1e-3)
+    assert stats.percentile(50) == 49.5
+    assert stats.percentile(90) == 89.5
+    assert stats.percentile(100) == 99.5
+
+
+def test_rolling_slope():
+    stats = RollingStats(50, lo=-100.0, hi=100.0, bucket=0.5)
+    for i in range(120):
+        stats.add(1000.0 + i * 0.5, 3.0 - 0.25 * i)   # -0.5 per detik
+    assert stats.slope() == pytest.approx(-0.5)
+    assert stats.span() == pytest.approx(24.5)
+
+
+def test_rssi_trend_predicts_critical():
+    quality = LinkQuality()
+    for i in range(60):
+        quality.add(i * 0.5, dict(GOOD, rssi=-100.0 - 0.05 * i))   # -6 dB/menit
+    assert quality.rssi_trend == pytest.approx(-6.0)
+    assert quality.time_to_critical() is not None
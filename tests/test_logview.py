@@ -0,0 +1,96 @@
+import types
+
+import pytest
+
+import gcs_logview
+from gcs_logview import VirtualLogView
+from gcs_store import TelemetryStore
+
+
+class FakeTreeview:
+    """Pengganti ttk.Treeview tanpa display: hanya menyimpan item"""
+
+    def __init__(self, parent, **kwargs):
+        self.rows = {}
+        self.inserted = 0
+
+    def heading(self, col, **kwargs):
+        pass
+
+    def column(self, col, **kwargs):
+        pass
+
+    def bind(self, sequence, func):
+        pass
+
+    def insert(self, parent, index, values=()):
+        self.inserted += 1
+        iid = f"I{self.inserted}"
+        self.rows[iid] = values
+        return iid
+
+    def item(self, iid, values):
+        self.rows[iid] = values
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.rows[iid]
+
+
+class FakeScrollbar:
+    def __init__(self, parent, **kwargs):
+        self.position = None
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+
+@pytest.fixture
+def view(monkeypatch):
+    monkeypatch.setattr(gcs_logview, 'ttk', types.SimpleNamespace(
+        Treeview=FakeTreeview, Scrollbar=FakeScrollbar))
+    store = TelemetryStore(max_rows=None)
+    for i in range(100):
+        store.append({'altitude': float(i)}, timestamp=float(i))
+    return VirtualLogView(None, store, ('altitude',),
+                          lambda row: (row['altitude'],), visible_rows=10)
+
+
+def shown(view):
+    return [view.tree.rows[iid][0] for iid in view._items]
+
+
+def test_follow_shows_last_rows(view):
+    view.refresh()
+    assert shown(view) == [float(i) for i in range(90, 100)]
+    assert len(view.tree.rows) == 10
+    view.store.append({'altitude': 100.0}, timestamp=100.0)
+    view.refresh()
+    assert shown(view)[-1] == 100.0
+    # Item dipakai ulang, bukan ditambah
+    assert view.tree.inserted == 10
+
+
+def test_scroll_stops_following(view):
+    view.refresh()
+    view.scroll_rows(-30)
+    assert not view.follow
+    assert shown(view) == [float(i) for i in range(60, 70)]
+    view.store.append({'altitude': 100.0}, timestamp=100.0)
+    view.refresh()
+    assert shown(view)[0] == 60.0
+    assert view.scrollbar.position == pytest.approx((60 / 101, 70 / 101))
+
+    view._on_scroll('moveto', '1.0')
+    assert view.follow
+    assert shown(view)[-1] == 100.0
+
+
+def test_short_store_and_clear(view):
+    view.store.clear()
+    view.store.append({'altitude': 1.0}, timestamp=1.0)
+    view.refresh(force=True)
+    assert shown(view) == [1.0]
+    view.clear()
+    assert view.tree.rows == {}
+    assert view.scrollbar.position == (0.0, 1.0)
@@ -0,0 +1,67 @@
+import numpy as np
+
+from gcs_map import Track, project, unproject, world_size
+
+
+def test_project_roundtrip():
+    x, y = project(106.8, -6.2)
+    lon, lat = unproject(x, y)
+    assert abs(lon - 106.8) < 1e-9 and abs(lat + 6.2) < 1e-9
+    # Latitude di-clamp ke batas Web Mercator (tepi atas world)
+    assert abs(project(0.0, 90.0)[1]) < 1e-6
+
+
+def test_simplified_levels_keep_first_and_distant_points():
+    track = Track()
+    for i in range(1000):
+        track.append(106.0 + i * 1e-6, -6.0)
+    # Zoom 0: semua titik dalam 1.5 px dari titik pertama
+    assert track.level_size(0) == 1
+    assert track.level_size(19) > track.level_size(10)
+    assert track.level_size(19) <= len(track)
+
+
+def _straight_track(n):
+    # Titik berjarak 10 px di zoom 10 sepanjang sumbu x
+    track = Track()
+    step = 10.0 / world_size(10) * 360.0
+    for i in range(n):
+        track.append(i * step, 0.0)
+    return track
+
+
+def test_runs_clip_to_box_with_neighbours():
+    track = _straight_track(20)
+    xs = track.x[:20]
+    y = track.y[0]
+    # Kotak hanya memuat titik 5..9
+    runs = track.runs(10, xs[5] - 1e-9, y - 1e-6, xs[9] + 1e-9, y + 1e-6)
+    assert len(runs) == 1
+    x, _ = runs[0]
+    np.testing.assert_array_equal(x, xs[4:11])
+
+
+def test_runs_split_into_separate_pieces():
+    track = _straight_track(20)
+    xs = track.x[:20].copy()
+    # Lompat kembali ke kiri: titik 20..29 melewati kotak lagi
+    step = xs[1] - xs[0]
+    lon_step = 10.0 / world_size(10) * 360.0
+    for i in range(10):
+        track.append((9 - i) * lon_step, 0.0)
+    y = track.y[0]
+    runs = track.runs(10, xs[0] - 1e-9, y - 1e-6, xs[2] + step / 2, y + 1e-6)
+    assert len(runs) == 2
+    assert len(runs[0][0]) == 4   # titik 0..2 + tetangga 3
+    assert len(runs[1][0]) == 4   # tetangga 26 + titik 27..29
+
+
+def test_runs_always_include_last_point():
+    track = Track()
+    track.append(106.0, -6.0)
+    track.append(106.0 + 1e-7, -6.0)  # terlalu dekat untuk level zoom 10
+    assert track.level_size(10) == 1
+    x, y = track.last()
+    runs = track.runs(10, x - 1e-9, y - 1e-9, x + 1e-9, y + 1e-9)
+    assert runs[-1][0][-1] == x
+    assert track.runs(10, 0.0, 0.0, 0.1, 0.1) == []
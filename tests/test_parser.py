@@ -0,0 +1,25 @@
+from gcs_parser import DataParser
+
+FRAME = (
+    "========== UAV DATA ==========\n"
+    "Altitude: {alt:.2f} m\n"
+    "Battery: 12.10V (80%)\n"
+    "Status: OK\n"
+    "==============================\n"
+)
+
+
+def test_parse_chunk_returns_every_frame():
+    data = ''.join(FRAME.format(alt=i) for i in range(50)).encode()
+    parser = DataParser()
+    frames = []
+    for i in range(0, len(data), 4096):
+        frames += parser.parse_chunk(data[i:i + 4096])
+    assert [frame['altitude'] for frame in frames] == [float(i) for i in range(50)]
+
+
+def test_parse_serial_data_per_line():
+    parser = DataParser()
+    results = [parser.parse_serial_data(line) for line in FRAME.format(alt=3).splitlines(True)]
+    assert results[:-1] == [None] * (len(results) - 1)
+    assert results[-1] == {'altitude': 3.0, 'voltage': 12.1, 'remaining': 80, 'status': 'OK'}
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from gcs_perf import PerfRegistry, timed
+
+
+def test_timed_records_only_when_enabled():
+    registry = PerfRegistry(enabled=False)
+
+    @timed('work', registry=registry)
+    def work(x):
+        return x * 2
+
+    assert work(2) == 4
+    assert registry.probes['work'].count == 0
+    registry.enabled = True
+    assert work(3) == 6
+    assert registry.probes['work'].count == 1
+
+
+def test_timed_records_when_function_raises():
+    registry = PerfRegistry(enabled=True)
+
+    @timed('fail', registry=registry)
+    def fail():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        fail()
+    assert registry.probes['fail'].count == 1
+
+
+def test_snapshot_summary_and_dump(tmp_path):
+    registry = PerfRegistry(enabled=True)
+    for ms in (1, 2, 3, 4):
+        registry.record('parse', ms / 1000)
+    registry.gauge('depth', lambda: 7)
+    registry.gauge('broken', lambda: 1 / 0)
+
+    snapshot = registry.snapshot()
+    stats = snapshot['probes']['parse']
+    assert stats['count'] == 4
+    assert stats['max'] == stats['recent_max'] == 0.004
+    assert stats['mean'] == pytest.approx(0.0025)
+    assert snapshot['gauges']['depth'] == 7
+    assert snapshot['gauges']['broken'].startswith('error:')
+    assert registry.summary_lines()[0].startswith('parse: n=4 mean=2.500ms')
+
+    with open(registry.dump(str(tmp_path / 'perf.json'))) as f:
+        assert json.load(f)['probes']['parse']['histogram']['count'] == 4
+
+    registry.reset()
+    assert registry.snapshot()['probes']['parse']['count'] == 0
@@ -0,0 +1,137 @@
+import json
+import socket
+import time
+
+import pytest
+
+from gcs_publish import (GLOBAL_POSITION_INT, MAVLINK_GLOBAL_POSITION_INT, MavlinkEncoder,
+                         TelemetryPublisher, x25_crc)
+
+FRAME = {'altitude': 150.5, 'latitude': -71234567, 'longitude': 1105000000,
+         'voltage': 12.45, 'remaining': 85, 'status': 'OK'}
+
+
+def _wait(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timeout")
+        time.sleep(0.005)
+
+
+def _recv_exact(sock, n):
+    data = b''
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        assert chunk, "koneksi ditutup"
+        data += chunk
+    return data
+
+
+@pytest.fixture
+def publisher_factory():
+    publishers = []
+
+    def make(**kwargs):
+        publisher = TelemetryPublisher(**kwargs)
+        publisher.start()
+        publishers.append(publisher)
+        return publisher
+
+    yield make
+    for publisher in publishers:
+        publisher.stop()
+
+
+def test_udp_loopback(publisher_factory):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.settimeout(2)
+    publisher = publisher_factory(udp=f"127.0.0.1:{sock.getsockname()[1]}")
+    publisher.publish(1000.0, FRAME)
+    message = json.loads(sock.recv(65536))
+    sock.close()
+    assert message == dict(FRAME, timestamp=1000.0)
+
+
+def test_tcp_json_lines(publisher_factory):
+    publisher = publisher_factory(tcp='127.0.0.1:0')
+    sock = socket.create_connection(publisher.addresses['tcp'], timeout=2)
+    _wait(lambda: publisher.stats()['tcp_clients'] == 1)
+    publisher.publish(1000.0, FRAME)
+    publisher.publish(1000.5, dict(FRAME, altitude=151.0))
+    lines = b''
+    while lines.count(b'\n') < 2:
+        lines += sock.recv(65536)
+    sock.close()
+    first, second = (json.loads(line) for line in lines.splitlines())
+    assert first == dict(FRAME, timestamp=1000.0)
+    assert second['altitude'] == 151.0
+
+
+def test_websocket_handshake_and_frame(publisher_factory):
+    publisher = publisher_factory(ws='127.0.0.1:0')
+    sock = socket.create_connection(publisher.addresses['ws'], timeout=2)
+    # Contoh handshake dari RFC 6455 section 1.3
+    sock.sendall(b'GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n'
+                 b'Connection: Upgrade\r\nSec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n'
+                 b'Sec-WebSocket-Version: 13\r\n\r\n')
+    response = b''
+    while b'\r\n\r\n' not in response:
+        response += sock.recv(4096)
+    assert response.startswith(b'HTTP/1.1 101 ')
+    assert b'Sec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=\r\n' in response
+    _wait(lambda: publisher.stats()['ws_clients'] == 1)
+
+    publisher.publish(1000.0, FRAME)
+    opcode, length = _recv_exact(sock, 2)
+    assert opcode == 0x81
+    if length == 126:
+        length = int.from_bytes(_recv_exact(sock, 2), 'big')
+    assert json.loads(_recv_exact(sock, length)) == dict(FRAME, timestamp=1000.0)
+    sock.close()
+
+
+def test_slow_client_dropped(publisher_factory):
+    publisher = publisher_factory(tcp='127.0.0.1:0', max_client_buffer=64 * 1024)
+    slow = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    slow.connect(publisher.addresses['tcp'])
+    _wait(lambda: publisher.stats()['tcp_clients'] == 1)
+
+    big = dict(FRAME, status='x' * 8192)
+    deadline = time.monotonic() + 10
+    while publisher.stats()['clients_dropped'] == 0:
+        assert time.monotonic() < deadline, "client lambat tidak diputus"
+        for _ in range(50):
+            publisher.publish(1000.0, big)
+        time.sleep(0.01)
+    _wait(lambda: publisher.stats()['tcp_clients'] == 0)
+    slow.close()
+
+
+def test_x25_crc_check_value():
+    # CRC-16/MCRF4XX check value
+    assert x25_crc(b'123456789') == 0x6F91
+
+
+def test_mavlink_messages_byte_exact():
+    # Referensi dari pymavlink (dialect common, MAVLink v1)
+    encoder = MavlinkEncoder()
+    message = encoder.message(MAVLINK_GLOBAL_POSITION_INT, GLOBAL_POSITION_INT.pack(
+        1234, -71234567, 1105000000, 150500, 150500, 0, 0, 0, 0xFFFF))
+    assert message.hex() == ('fe1c00010121d2040000f90bc1fb40f6dc41e44b0200e44b0200'
+                             '000000000000ffff3b2a')
+    messages = encoder.encode({'voltage': 12.45, 'remaining': 85})
+    assert [m.hex() for m in messages] == [
+        'fe1f010101010000000000000000000000000000a230ffff00000000000000000000000055a3d0']
+
+
+def test_mavlink_position_and_statustext():
+    encoder = MavlinkEncoder()
+    messages = encoder.encode(FRAME)
+    assert [m[5] for m in messages] == [33, 1, 253]
+    position = GLOBAL_POSITION_INT.unpack(messages[0][6:-2])
+    assert position[1:5] == (-71234567, 1105000000, 150500, 150500)
+    # STATUSTEXT hanya saat status berubah
+    assert [m[5] for m in encoder.encode(FRAME)] == [33, 1]
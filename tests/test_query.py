@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from gcs_query import FlightIndex
+from gcs_store import TelemetryStore
+
+
+def _index(count=100):
+    store = TelemetryStore()
+    for i in range(count):
+        store.append({'rssi': -80.0 - i % 40, 'status': 'OK' if i % 10 else 'Failsafe RTL'},
+                     1000.0 + i)
+    return FlightIndex.from_store(store, block_size=16)
+
+
+@pytest.mark.parametrize('seconds', [0, -5, float('nan')])
+def test_group_by_rejects_non_positive_interval(seconds):
+    result = _index().query()
+    with pytest.raises(ValueError):
+        result.group_by('mean(rssi)', seconds)
+
+
+def test_group_by():
+    starts, values, counts = _index().query().group_by('count', 30)
+    assert counts.tolist() == [20, 30, 30, 20]
+    assert np.array_equal(starts, [990.0, 1020.0, 1050.0, 1080.0])
+
+
+def test_status_contains():
+    index = _index()
+    assert len(index.query('status contains failsafe')) == 10
+    assert len(index.query('not status contains fail and rssi < -100')) == 36
+
+
+def test_unknown_remaining_is_not_a_reading():
+    store = TelemetryStore()
+    store.append({'voltage': 12.0}, 1000.0)
+    store.append({'voltage': 11.9, 'remaining': 50}, 1000.5)
+    result = FlightIndex.from_store(store).query()
+    assert len(result.index.query('remaining <= 20')) == 0
+    assert len(result.index.query('remaining < 60')) == 1
+    assert result.aggregate('min(remaining)') == 50.0
+    assert result.aggregate('mean(remaining)') == 50.0
+    assert result.aggregate('count(remaining)') == 1.0
+
+
+def test_unknown_remaining_matches_rule_review():
+    from gcs_rules import RuleSet
+
+    store = TelemetryStore()
+    for i in range(200):
+        frame = {'voltage': 12.0} if i % 3 else {'remaining': i % 40}
+        store.append(frame, 1000.0 + i)
+    index = FlightIndex.from_store(store, block_size=16)
+    episodes = RuleSet.from_config([{'name': 'Battery low', 'when': 'remaining <= 20'}]).review(index)
+    assert sum(e['frames'] for e in episodes) == len(index.query('remaining <= 20'))
@@ -0,0 +1,21 @@
+from gcs_queue import BoundedQueue
+
+
+def test_put_when_full_drops_oldest():
+    q = BoundedQueue(3)
+    for i in range(5):
+        q.put(i)
+    assert len(q) == 3
+    assert q.drain() == [2, 3, 4]
+    assert q.stats() == {'depth': 0, 'pushed': 5, 'dropped': 2, 'high_water': 3}
+
+
+def test_drain_is_fifo_and_respects_max_items():
+    q = BoundedQueue(10)
+    for i in range(4):
+        q.put(i)
+    assert q.drain(3) == [0, 1, 2]
+    q.put(4)
+    assert q.drain(10) == [3, 4]
+    assert q.drain() == []
+    assert q.stats()['dropped'] == 0
@@ -0,0 +1,65 @@
+from gcs_rawpacket import PacketAssembler
+
+CYCLE = [
+    b"AL150.50\t-87\t8.25",
+    b"LT-71234567\t-91\t7.75",
+    b"LN1101234567\t-89\t8.00",
+    b"BV12.45,85\t-87\t8.00",
+    b"ST OK\t-86",
+]
+
+
+def feed_cycle(assembler, start, packets=CYCLE, step=0.1):
+    for i, line in enumerate(packets):
+        assert assembler.feed_line(line, received_at=start + i * step)
+
+
+def test_full_cycle_assembles_frame():
+    frames = []
+    updates = []
+    assembler = PacketAssembler(on_update=lambda now, fields: updates.append(fields),
+                                on_frame=frames.append)
+    feed_cycle(assembler, 100.0)
+    assert len(frames) == 1
+    frame = frames[0]
+    assert frame['altitude'] == 150.5
+    assert frame['latitude'] == -71234567
+    assert frame['voltage'] == 12.45 and frame['remaining'] == 85
+    assert frame['status'] == 'OK'
+    assert frame['cycle_time'] == 400
+    assert frame['rssi'] == round((-87 - 91 - 89 - 87 - 86) / 5, 2)
+    assert frame['assembled']
+    # Update per paket, lengkap dengan kualitas link paket itu
+    assert updates[0] == {'altitude': 150.5, 'rssi': -87.0, 'snr': 8.25}
+    assert assembler.ages(now=101.0)['altitude'] == 1.0
+
+
+def test_sequence_error_restarts_at_next_al():
+    frames = []
+    assembler = PacketAssembler(on_frame=frames.append)
+    feed_cycle(assembler, 100.0, CYCLE[:2] + CYCLE[3:])  # LN hilang
+    assert frames == []
+    assert assembler.stats()['sequence_errors'] == 1
+    feed_cycle(assembler, 101.0)
+    assert len(frames) == 1
+    assert frames[0]['cycle_time'] == 400
+
+
+def test_gap_longer_than_timeout_resets_cycle():
+    frames = []
+    assembler = PacketAssembler(on_frame=frames.append, timeout=2.0)
+    feed_cycle(assembler, 100.0, CYCLE[:3])
+    feed_cycle(assembler, 105.0, CYCLE[3:])
+    assert frames == []
+    assert assembler.stats()['timeouts'] == 1
+    # AL baru setelah timeout membuka siklus baru
+    feed_cycle(assembler, 110.0)
+    assert len(frames) == 1
+
+
+def test_non_packet_and_invalid_lines():
+    assembler = PacketAssembler()
+    assert not assembler.feed_line(b"Altitude: 150.50 m")
+    assert assembler.feed_line(b"ALxyz\t-87")
+    assert assembler.stats()['invalid'] == 1
+    assert assembler.latest == {}
@@ -0,0 +1,66 @@
+import asyncio
+
+from gcs_ingest import MultiReceiverIngest
+from gcs_recorder import FlightRecorder, RECORD_CRC, encode_frame, decode_frame, read_flight_log
+from gcs_store import REMAINING_UNKNOWN
+
+FRAME = (
+    "========== UAV DATA ==========\n"
+    "Altitude: {alt:.2f} m\n"
+    "Battery: 12.10V ({pct}%)\n"
+    "Status: OK\n"
+    "==============================\n"
+)
+
+
+def _record(tmp_path, frames):
+    recorder = FlightRecorder(str(tmp_path), flush_interval=60)
+    for i, frame in enumerate(frames):
+        recorder.write_frame(float(i), frame)
+    recorder.close()
+    return recorder.path
+
+
+def test_encode_out_of_range_fields():
+    data = {'remaining': 99999, 'latitude': 2**40, 'cycle_time': 2**40, 'altitude': 10.0}
+    _, decoded = decode_frame(encode_frame(1.0, data))
+    assert 'remaining' not in decoded
+    assert decoded['latitude'] == 0
+    assert decoded['cycle_time'] == 0
+    assert decoded['altitude'] == 10.0
+
+
+def test_malformed_line_does_not_stop_ingest(tmp_path):
+    capture = tmp_path / 'capture.txt'
+    capture.write_text(FRAME.format(alt=1, pct=80) + FRAME.format(alt=2, pct=99999)
+                       + FRAME.format(alt=3, pct=70))
+    recorder = FlightRecorder(str(tmp_path / 'logs'), flush_interval=60)
+    ingest = MultiReceiverIngest([f"file://{capture}"], on_frame=recorder.write_frame)
+    asyncio.run(ingest.serve())
+    recorder.close()
+
+    frames = [data for kind, _, data in read_flight_log(recorder.path)]
+    assert [frame['altitude'] for frame in frames] == [1.0, 2.0, 3.0]
+    assert [frame.get('remaining', REMAINING_UNKNOWN) for frame in frames] == [80, REMAINING_UNKNOWN, 70]
+    assert ingest.links[0].error is None
+
+
+def test_truncated_tail_stops_at_last_complete_record(tmp_path):
+    path = _record(tmp_path, [{'altitude': float(i), 'status': 'OK'} for i in range(5)])
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-RECORD_CRC.size - 3])
+    frames = [data for _, _, data in read_flight_log(path)]
+    assert [frame['altitude'] for frame in frames] == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_corrupt_record_fails_crc(tmp_path):
+    path = _record(tmp_path, [{'altitude': float(i), 'status': 'OK'} for i in range(5)])
+    with open(path, 'rb') as f:
+        data = bytearray(f.read())
+    data[-RECORD_CRC.size - 1] ^= 0xFF  # byte status record terakhir
+    with open(path, 'wb') as f:
+        f.write(data)
+    timestamps = [timestamp for _, timestamp, _ in read_flight_log(path)]
+    assert timestamps == [0.0, 1.0, 2.0, 3.0]
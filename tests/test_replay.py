@@ -0,0 +1,67 @@
+import time
+
+from gcs_replay import Replayer, load_text_capture
+
+BLOCK = (
+    "========== UAV DATA ==========\n"
+    "Altitude: {alt:.2f} m\n"
+    "Status: OK\n"
+    "Cycle Time: 500 ms\n"
+    "==============================\n"
+)
+
+
+def _prefixed(clock, text):
+    return ''.join(f"{clock} > {line}\n" for line in text.splitlines())
+
+
+def test_bare_capture_uses_cycle_time(tmp_path):
+    path = tmp_path / 'capture.txt'
+    path.write_text(''.join(BLOCK.format(alt=i) for i in range(4)))
+    blocks = load_text_capture(str(path))
+    assert [offset for offset, _, _ in blocks] == [0.0, 0.5, 1.0, 1.5]
+
+
+def test_raw_data_tab_capture_with_gap(tmp_path):
+    # Format simpan tab Raw Data; 10 detik outage setelah frame kedua
+    times = ['23:59:50', '23:59:50', '00:00:00', '00:00:01']
+    path = tmp_path / 'raw.txt'
+    path.write_text(''.join(_prefixed(t, BLOCK.format(alt=i)) for i, t in enumerate(times)))
+    blocks = load_text_capture(str(path))
+    assert len(blocks) == 4
+    offsets = [offset for offset, _, _ in blocks]
+    assert offsets[1] - offsets[0] == 0.5
+    assert 9.0 <= offsets[2] - offsets[1] <= 11.0
+    assert 0.5 <= offsets[3] - offsets[2] <= 1.5
+
+    frames = []
+    Replayer(str(path), on_frame=lambda ts, frame: frames.append(frame), speed=0).run()
+    assert [frame['altitude'] for frame in frames] == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_millisecond_prefix_sets_offsets(tmp_path):
+    times = ['12:00:00.000', '12:00:00.250', '12:00:03.750']
+    path = tmp_path / 'monitor.txt'
+    path.write_text(''.join(''.join(f"{t} -> {line}\n" for line in BLOCK.format(alt=i).splitlines())
+                            for i, t in enumerate(times)))
+    assert [offset for offset, _, _ in load_text_capture(str(path))] == [0.0, 0.25, 3.75]
+
+
+def test_replay_timing_follows_speed():
+    blocks = [(i * 0.5, None, {'altitude': float(i)}) for i in range(5)]
+    stamps = []
+    began = time.monotonic()
+    Replayer(blocks, on_frame=lambda ts, frame: stamps.append(time.monotonic() - began), speed=10).run()
+    # 2 detik capture pada 10x = ~0.2 detik, frame berjarak ~0.05 detik
+    assert len(stamps) == 5
+    assert 0.18 <= stamps[-1] < 1.0
+    assert all(b - a >= 0.04 for a, b in zip(stamps, stamps[1:]))
+
+
+def test_seek_skips_blocks():
+    blocks = [(i * 0.5, None, {'altitude': float(i)}) for i in range(10)]
+    frames = []
+    replayer = Replayer(blocks, on_frame=lambda ts, frame: frames.append(frame['altitude']), speed=0)
+    replayer.seek(3.0)
+    replayer.run()
+    assert frames == [6.0, 7.0, 8.0, 9.0]
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from gcs_filter import FilterParser
+from gcs_query import FlightIndex
+from gcs_rules import RuleEngine, RuleError, RuleSet, parse_rule
+from gcs_store import TelemetryStore
+
+RULES = [
+    {'name': 'Battery low', 'when': 'remaining <= 20'},
+    {'name': 'Low voltage', 'when': 'voltage < 10.8', 'for': 3},
+    {'name': 'Fast climb', 'when': 'rate(altitude) > 5'},
+    {'name': 'Jump', 'when': 'delta(latitude) != 0'},
+    {'name': 'Gap', 'when': 'frame_age > 2'},
+    {'name': 'Status not OK', 'when': 'status != OK'},
+    {'name': 'Not OK', 'when': 'not status == OK and rssi < -90'},
+    {'name': 'Failsafe', 'when': 'status contains failsafe'},
+]
+
+FIELDS = ('altitude', 'latitude', 'voltage', 'remaining', 'status', 'rssi')
+
+
+def _frames(count, seed=1):
+    rng = random.Random(seed)
+    t = 1_700_000_000.0
+    frames = []
+    for _ in range(count):
+        t += rng.choice((0.5, 0.5, 0.5, 3.0))
+        frame = {
+            'altitude': rng.uniform(0, 40),
+            'latitude': rng.choice((-71234567, -71234568)),
+            'voltage': rng.uniform(10.0, 12.6),
+            'remaining': rng.randint(0, 100),
+            'status': rng.choice(('OK', 'OK', 'Low Battery', 'FAILSAFE')),
+            'rssi': rng.uniform(-120, -60),
+        }
+        # Frame parsial (mode raw packet): sebagian field tidak ada
+        if rng.random() < 0.4:
+            for name in rng.sample(FIELDS, rng.randint(1, len(FIELDS))):
+                del frame[name]
+        frames.append((t, frame))
+    return frames
+
+
+def _live_episodes(ruleset, frames):
+    engine = RuleEngine(ruleset)
+    episodes = []
+    open_ = {}
+    for t, frame in frames:
+        raised, cleared = engine.process(t, frame)
+        for alert in cleared:
+            episodes.append((alert.rule.name, open_.pop(alert.rule.name), t))
+        for alert in raised:
+            open_[alert.rule.name] = alert.since
+    episodes += [(name, start, None) for name, start in open_.items()]
+    return sorted(episodes, key=lambda e: (e[1], e[0]))
+
+
+def _review_episodes(ruleset, frames):
+    store = TelemetryStore()
+    for t, frame in frames:
+        store.append(frame, t)
+    episodes = ruleset.review(FlightIndex.from_store(store))
+    return sorted(((e['rule'], e['start'], e['end']) for e in episodes),
+                  key=lambda e: (e[1], e[0]))
+
+
+def test_live_matches_review():
+    ruleset = RuleSet.from_config(RULES)
+    frames = _frames(2000)
+    live = _live_episodes(ruleset, frames)
+    assert live
+    assert live == _review_episodes(ruleset, frames)
+
+
+def test_partial_frames_do_not_fire():
+    ruleset = RuleSet.from_config(RULES[:2] + RULES[5:6])
+    frames = [(1000.0 + i, {'altitude': 5.0}) for i in range(5)]
+    assert _live_episodes(ruleset, frames) == []
+    assert _review_episodes(ruleset, frames) == []
+
+
+def test_rate():
+    engine = RuleEngine(RuleSet.from_config([{'name': 'climb', 'when': 'rate(altitude) > 5'}]))
+    assert engine.process(0.0, {'altitude': 0.0}) == ([], [])
+    raised, _ = engine.process(1.0, {'altitude': 10.0})
+    assert [alert.rule.name for alert in raised] == ['climb']
+
+
+def test_parse_errors():
+    with pytest.raises(RuleError):
+        parse_rule('rate(status) > 1')
+    with pytest.raises(RuleError):
+        parse_rule('voltage <')
+    with pytest.raises(RuleError):
+        parse_rule('status < OK')
+
+
+def test_check_honours_for_count():
+    ruleset = RuleSet.from_config([{'name': 'Gap', 'when': 'frame_age > 2', 'for': 3}])
+    engine = RuleEngine(ruleset)
+    engine.process(0.0, {'altitude': 1.0})
+    engine.process(3.0, {'altitude': 1.0})   # run 1
+    assert engine.check(10.0) == ([], [])     # frame berikutnya baru run 2
+    engine.process(10.0, {'altitude': 1.0})  # run 2
+    raised, _ = engine.check(20.0)            # run 3
+    assert [alert.rule.name for alert in raised] == ['Gap']
+
+
+def test_check_raises_single_frame_age_rule():
+    engine = RuleEngine(RuleSet.from_config([{'name': 'Gap', 'when': 'frame_age > 2'}]))
+    engine.process(0.0, {'altitude': 1.0})
+    assert engine.check(1.0) == ([], [])
+    raised, _ = engine.check(3.0)
+    assert [alert.rule.name for alert in raised] == ['Gap']
+
+
+def test_filter_parser_requires_node_methods():
+    class CompareOnly(FilterParser):
+        columns = ('altitude',)
+
+        def compare(self, func, column, op, value):
+            return (column, op, value)
+
+    with pytest.raises(TypeError):
+        CompareOnly('altitude > 1')
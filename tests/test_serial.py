@@ -0,0 +1,24 @@
+from gcs_serial import MAX_LINE_LENGTH, SerialReader
+
+
+def test_feed_splits_lines_across_chunks():
+    lines = []
+    reader = SerialReader(None, lines.append)
+    reader.feed(b"Altitude: 12")
+    reader.feed(b"0.5 m\r\nBattery: 12.45V (80%)\n\nStatus")
+    assert lines == [b"Altitude: 120.5 m", b"Battery: 12.45V (80%)"]
+    assert bytes(reader.buffer) == b"Status"
+    reader.feed(b": OK\n")
+    assert lines[-1] == b"Status: OK"
+    assert reader.lines_read == 3
+    assert reader.bytes_read == len(b"Altitude: 120.5 m\r\nBattery: 12.45V (80%)\n\nStatus: OK\n")
+    assert reader.latency.count == 3
+
+
+def test_overlong_line_without_newline_is_discarded():
+    lines = []
+    reader = SerialReader(None, lines.append)
+    reader.feed(b"x" * (MAX_LINE_LENGTH + 1))
+    assert len(reader.buffer) == 0
+    reader.feed(b"Status: OK\n")
+    assert lines == [b"Status: OK"]
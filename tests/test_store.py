@@ -0,0 +1,42 @@
+import math
+
+from gcs_parser import DataParser
+from gcs_store import REMAINING_UNKNOWN, TelemetryStore, clamp_frame
+
+
+def test_append_out_of_range_fields_stored_as_missing():
+    store = TelemetryStore(max_rows=None)
+    frame = {'remaining': 99999, 'latitude': 2**40, 'cycle_time': -2**40,
+             'altitude': 1e300, 'voltage': 12.0, 'status': 'OK'}
+    store.append(frame, timestamp=1.0)
+    row = store.row(0)
+    assert row['remaining'] == REMAINING_UNKNOWN
+    assert row['latitude'] == 0
+    assert row['cycle_time'] == 0
+    assert math.isnan(row['altitude'])
+    assert row['voltage'] == 12.0
+    assert row['status'] == 'OK'
+    # Dict asli tidak diubah
+    assert frame['remaining'] == 99999
+
+
+def test_clamp_frame_returns_same_dict_when_valid():
+    frame = {'remaining': 80, 'latitude': -62000000, 'altitude': math.nan}
+    assert clamp_frame(frame) is frame
+
+
+def test_malformed_battery_line_reaches_store():
+    parser = DataParser()
+    frame = parser.parse_chunk(b"Battery: 12.45V (99999%)\nStatus: OK\n==========\n")[0]
+    store = TelemetryStore(max_rows=None)
+    store.append(frame, timestamp=1.0)
+    assert store.row(0)['remaining'] == REMAINING_UNKNOWN
+
+
+def test_max_rows_drops_oldest_chunk():
+    store = TelemetryStore(max_rows=8, chunk_size=4)
+    for i in range(14):
+        store.append({'altitude': float(i)}, timestamp=float(i))
+    assert store.dropped_rows == 4
+    assert list(store.column('altitude')) == [float(i) for i in range(4, 14)]
+    assert store.index_range(6.0, 9.0) == (2, 5)